@@ -2,4 +2,5 @@ from django.conf.urls import include, url
 
 urlpatterns = [
     url(r'^auth/', include('accounts.api.urls', namespace="auth")),
+    url(r'^users/', include('accounts.api.user_urls', namespace="users")),
 ]
@@ -0,0 +1,27 @@
+"""
+ASGI config for myproject project.
+
+It exposes the ASGI callable as a module-level variable named
+``application``, e.g. for ``daphne config.asgi:application``. A single
+process multiplexes many concurrent (keep-alive) connections, the routes
+served asynchronously are listed in config/routing.py.
+
+For more information on this file, see
+https://channels.readthedocs.io/en/2.1.7/deploying.html
+"""
+
+import os
+
+import django
+from channels.routing import get_default_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
+
+django.setup()
+
+application = get_default_application()
+
+# See config/wsgi.py.
+from config.warmup import warm_up  # noqa: E402
+
+warm_up()
@@ -0,0 +1,167 @@
+"""
+Database routing between the primary (the `default` alias) and the read
+replicas listed in DATABASE_REPLICAS.
+
+Reads go to a random replica unless they have to see the primary's latest
+state, that is when
+
+- the current thread has written to the primary (for the rest of the
+  request, or for good outside of requests, e.g. in management commands),
+- an explicit transaction is open on the primary (a `transaction.atomic()`
+  of the code itself, not the one wrapped around the view by
+  ATOMIC_REQUESTS), or
+- the client wrote within the last DATABASE_REPLICA_PIN_SECONDS, so
+  replication lag can't hide e.g. a name change or a freshly registered
+  account on the following requests.
+
+Writes always go to the primary.
+"""
+import hashlib
+import random
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from accounts.api.throttling import get_client_address
+
+PIN_KEY_PREFIX = "routers:pin:"
+
+_state = threading.local()
+
+
+def get_pin_keys(request):
+    """
+    The cache keys identifying the client of `request`: its Authorization
+    header, session cookie and address. The address is the one IPThrottle
+    uses, so a spoofed X-Forwarded-For can't pin other clients. It covers
+    the request right after registration, which is anonymous but answered
+    with the token the client authenticates with from then on.
+    """
+    idents = []
+    authorization = request.META.get("HTTP_AUTHORIZATION")
+    if authorization:
+        idents.append("auth:" + authorization)
+    session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if session_key:
+        idents.append("session:" + session_key)
+    address = get_client_address(request)
+    if address:
+        idents.append("addr:" + address)
+    return [
+        PIN_KEY_PREFIX + hashlib.sha1(ident.encode()).hexdigest()
+        for ident in idents
+    ]
+
+
+def start_request(request):
+    _state.wrote = False
+    _state.pinned = None
+    _state.pin_keys = get_pin_keys(request)
+    _state.request_atomic = False
+
+
+def finish_request():
+    """
+    Pins the client to the primary if the request wrote and resets the
+    per-request state.
+    """
+    if _state.wrote and settings.DATABASE_REPLICAS and _state.pin_keys:
+        cache.set_many(
+            {key: 1 for key in _state.pin_keys},
+            settings.DATABASE_REPLICA_PIN_SECONDS,
+        )
+    _state.wrote = False
+    _state.pinned = None
+    _state.pin_keys = []
+    _state.request_atomic = False
+
+
+def is_pinned():
+    """
+    Whether the client of the current request wrote recently. Looked up
+    once per request and only when it's about to read.
+    """
+    pinned = getattr(_state, "pinned", None)
+    if pinned is None:
+        keys = getattr(_state, "pin_keys", None)
+        pinned = bool(keys) and bool(cache.get_many(keys))
+        _state.pinned = pinned
+    return pinned
+
+
+def in_transaction():
+    """
+    Whether the code opened a transaction on the primary. The outermost
+    atomic block is the view's own one when ATOMIC_REQUESTS applies, so
+    only the nested ones (savepoints) count then.
+    """
+    connection = connections[DEFAULT_DB_ALIAS]
+    if not connection.in_atomic_block:
+        return False
+    if getattr(_state, "request_atomic", False):
+        return bool(connection.savepoint_ids)
+    return True
+
+
+def use_primary():
+    return (
+        getattr(_state, "wrote", False)
+        or in_transaction()
+        or is_pinned()
+    )
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas:
+            return None
+        if use_primary():
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        _state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS}
+        databases.update(settings.DATABASE_REPLICAS)
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaPinningMiddleware:
+    """
+    Tracks the writes of a request for PrimaryReplicaRouter and pins its
+    client to the primary afterwards.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start_request(request)
+        try:
+            return self.get_response(request)
+        finally:
+            finish_request()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Mirrors BaseHandler.make_view_atomic().
+        connection = connections[DEFAULT_DB_ALIAS]
+        _state.request_atomic = (
+            connection.settings_dict["ATOMIC_REQUESTS"]
+            and DEFAULT_DB_ALIAS not in getattr(
+                view_func, "_non_atomic_requests", set()
+            )
+        )
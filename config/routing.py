@@ -0,0 +1,33 @@
+"""
+ASGI routing. The token authenticated reads of the user details and the
+batch lookup as well as the health check are answered by async consumers,
+all other requests go to the Django views (through the middleware) like
+under WSGI.
+"""
+from channels.http import AsgiHandler
+from channels.routing import ProtocolTypeRouter, URLRouter
+from django.conf.urls import url
+
+from accounts.api.consumers import UserDetailsConsumer, UserLookupConsumer
+from core.consumers import HealthConsumer
+from core.routing import AsyncRouter
+
+application = ProtocolTypeRouter({
+    "http": URLRouter([
+        url(
+            r'^health/$',
+            AsyncRouter(HealthConsumer)
+        ),
+        url(
+            r'^api/auth/user/$',
+            AsyncRouter(UserDetailsConsumer, authorization="Token")
+        ),
+        url(
+            r'^api/users/lookup/$',
+            AsyncRouter(
+                UserLookupConsumer, methods=("POST",), authorization="Token"
+            )
+        ),
+        url(r'', AsgiHandler),
+    ]),
+})
@@ -41,6 +41,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'channels',
     'model_utils',
     'authtools',
     'admin_honeypot',
@@ -59,6 +60,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
+    'config.routers.ReplicaPinningMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -66,8 +69,12 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'accounts.middleware.PasswordHashingMiddleware',
 ]
 
+# Expose the numbers collected by RequestMetricsMiddleware as X-* headers.
+REQUEST_METRICS_HEADERS = False
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -87,9 +94,18 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.routing.application'
 
 ATOMIC_REQUESTS = True
 
+# Reads go to the replica aliases listed in DATABASE_REPLICAS (if any),
+# writes to `default`. Clients are pinned to `default` for
+# DATABASE_REPLICA_PIN_SECONDS after they wrote, to read their own writes
+# despite replication lag.
+DATABASE_ROUTERS = ['config.routers.PrimaryReplicaRouter']
+DATABASE_REPLICAS = []
+DATABASE_REPLICA_PIN_SECONDS = 5
+
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 SESSION_CACHE_ALIAS = "default"
 
@@ -113,12 +129,22 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# The first hasher is used for new hashes, the others are only kept to
+# verify (and then transparently upgrade) existing PBKDF2 hashes.
+PASSWORD_HASHERS = [
+    'accounts.hashers.TunableArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
 AUTHENTICATION_BACKENDS = (
     # Needed to login by username in Django admin, regardless of `allauth`
-    'django.contrib.auth.backends.ModelBackend',
+    # (Django's ModelBackend, rejecting soft-deleted users)
+    'accounts.backends.ModelBackend',
 
     # `allauth` specific authentication methods, such as login by e-mail
-    'allauth.account.auth_backends.AuthenticationBackend',
+    'accounts.backends.AuthenticationBackend',
 )
 
 LOGIN_URL = "/"
@@ -153,13 +179,35 @@ X_FRAME_OPTIONS = 'DENY'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'accounts.api.authentication.ExpiringTokenAuthentication',
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
-    )
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'EXCEPTION_HANDLER': 'accounts.api.exceptions.exception_handler',
+    # Used by accounts.api.throttling, "<view scope>_<ip|email>".
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '30/min',
+        'login_email': '10/min',
+        'register_ip': '20/hour',
+        'register_email': '5/hour',
+        'password_reset_ip': '20/hour',
+        'password_reset_email': '5/hour',
+    },
+    # Proxies in front of the app that append to X-Forwarded-For. The IP
+    # throttles key on the address the outermost one saw.
+    'NUM_PROXIES': 0,
 }
 
 
@@ -213,7 +261,61 @@ SITE_ID = 2  # Remember to configure site in the admin!
 REST_SESSION_LOGIN = False
 OLD_PASSWORD_FIELD_ENABLED = True
 
+REST_AUTH_TOKEN_CREATOR = "accounts.api.utils.create_token"
+
 REST_AUTH_SERIALIZERS = {
-    "TOKEN_SERIALIZER": "accounts.api.serializers.TokenSerializer",
-    "USER_DETAILS_SERIALIZER": "accounts.api.serializers.UserDetailSerializer",
+    "TOKEN_SERIALIZER": "accounts.api.serializers.FastTokenSerializer",
+    "USER_DETAILS_SERIALIZER": "accounts.api.serializers.FastUserDetailSerializer",
+    "PASSWORD_RESET_SERIALIZER": "accounts.api.serializers.PasswordResetSerializer",
 }
+
+
+# accounts configuration
+
+# Seconds a resolved API token (and its user) stays in the cache.
+ACCOUNTS_TOKEN_CACHE_TIMEOUT = 60 * 60
+
+# API tokens expire when they weren't used for ACCOUNTS_TOKEN_EXPIRY
+# seconds. Their last use is written at most once per interval.
+ACCOUNTS_TOKEN_EXPIRY = 60 * 60 * 24 * 30
+ACCOUNTS_TOKEN_LAST_USED_INTERVAL = 60 * 5
+
+# Argon2 costs of accounts.hashers.TunableArgon2PasswordHasher. Changing
+# them rehashes passwords on the next login.
+ACCOUNTS_ARGON2_TIME_COST = 2
+ACCOUNTS_ARGON2_MEMORY_COST = 512  # KiB
+ACCOUNTS_ARGON2_PARALLELISM = 2
+
+# Password hashing runs on a bounded thread pool, which limits how many
+# hashes run at once; the request thread still waits for its hash, so it
+# isn't freed up meanwhile. Set the workers to 0 to hash on the request
+# thread without a limit instead.
+ACCOUNTS_PASSWORD_HASHING_WORKERS = os.cpu_count() or 1
+ACCOUNTS_PASSWORD_HASHING_QUEUE_SIZE = 32
+# Seconds to wait for a free slot before answering 503.
+ACCOUNTS_PASSWORD_HASHING_TIMEOUT = 5
+
+# Seconds the user admin caches its date_hierarchy year/month/day buckets.
+ACCOUNTS_ADMIN_DATE_HIERARCHY_CACHE_TIMEOUT = 60 * 10
+
+# Seconds the users changes API holds back changes beyond the start of the
+# oldest open transaction, for clock skew between app and database servers.
+ACCOUNTS_USER_CHANGES_SETTLE_TIME = 5
+
+# Upper bound and cache lifetime (seconds) of the batch user lookup API.
+ACCOUNTS_USER_LOOKUP_MAX_UUIDS = 100
+ACCOUNTS_USER_LOOKUP_CACHE_TIMEOUT = 60 * 60
+
+# Two-tier cache of the users of authenticated sessions (accounts.usercache):
+# entries in the in-process LRU, its lifetime (seconds) and the one in Redis.
+ACCOUNTS_USER_CACHE_SIZE = 1024
+ACCOUNTS_USER_CACHE_LOCAL_TIMEOUT = 30
+ACCOUNTS_USER_CACHE_TIMEOUT = 60 * 15
+
+# Graph API of the Facebook login (accounts.api.facebook): its base URL,
+# the (connect, read) timeouts in seconds, the connections kept alive per
+# process and how long (seconds) fetched profiles are cached.
+ACCOUNTS_FACEBOOK_GRAPH_URL = 'https://graph.facebook.com'
+ACCOUNTS_FACEBOOK_TIMEOUT = (2, 5)
+ACCOUNTS_FACEBOOK_POOL_SIZE = 10
+ACCOUNTS_FACEBOOK_PROFILE_CACHE_TIMEOUT = 60
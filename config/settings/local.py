@@ -4,6 +4,15 @@ from .base import *
 DEBUG = True
 
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+# Used by `send_queued_mail --backend django.core.mail.backends.filebased.EmailBackend`
+EMAIL_FILE_PATH = str(BASE_DIR.parent / 'sent_emails')
+
+REQUEST_METRICS_HEADERS = True
+
+# E.g. the stub server of accounts.graphstub.
+ACCOUNTS_FACEBOOK_GRAPH_URL = os.environ.get(
+    'FACEBOOK_GRAPH_URL', ACCOUNTS_FACEBOOK_GRAPH_URL
+)
 
 DATABASES = {
     'default': {
@@ -16,11 +25,26 @@ DATABASES = {
     }
 }
 
+# Optional read replica: a second Postgres (POSTGRES_REPLICA_HOST/_PORT)
+# streaming from the first, or a replicated database on the same server
+# (POSTGRES_REPLICA_NAME). Tests only use `default`, which the replica
+# alias mirrors.
+if 'POSTGRES_REPLICA_HOST' in os.environ or 'POSTGRES_REPLICA_NAME' in os.environ:
+    default = DATABASES['default']
+    DATABASES['replica'] = dict(
+        default,
+        NAME=os.environ.get('POSTGRES_REPLICA_NAME', default['NAME']),
+        HOST=os.environ.get('POSTGRES_REPLICA_HOST', default['HOST']),
+        PORT=os.environ.get('POSTGRES_REPLICA_PORT', default['PORT']),
+        TEST={'MIRROR': 'default'},
+    )
+    DATABASE_REPLICAS = ['replica']
+
 STATIC_URL = '/static/'
 
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
+        "BACKEND": "core.cache.InstrumentedRedisCache",
         "LOCATION": "redis://127.0.0.1:6379/1",
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
@@ -10,18 +10,33 @@ INSTALLED_APPS += ['storages', ]
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql_psycopg2',
+        # Pooled psycopg2 connections, see core/db/backends/postgresql_pooled.
+        # Use 'django.db.backends.postgresql_psycopg2' with e.g.
+        # CONN_MAX_AGE = 60 for plain persistent connections instead.
+        'ENGINE': 'core.db.backends.postgresql_pooled',
         'NAME': get_env_variable('RDS_DB_NAME'),
         'USER': get_env_variable('RSD_USERNAME'),
         'PASSWORD': get_env_variable('RDS_PASSWORD'),
         'HOST': get_env_variable('RDS_HOSTNAME'),
         'PORT': get_env_variable('RDS_PORT'),
+        # Closing the connection at the end of a request returns it to the
+        # pool.
+        'CONN_MAX_AGE': 0,
+        'POOL': {
+            'MAX_SIZE': 10,
+            'MAX_LIFETIME': 30 * 60,
+            'TIMEOUT': 10,
+            'HEALTH_CHECK_INTERVAL': 30,
+        },
     }
 }
 
+# The load balancer.
+REST_FRAMEWORK['NUM_PROXIES'] = 1
+
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
+        "BACKEND": "core.cache.InstrumentedRedisCache",
         "LOCATION": get_env_variable('REDIS_LOCATION'),
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
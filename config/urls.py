@@ -3,7 +3,14 @@ from django.contrib import admin
 
 from allauth.socialaccount import views as allauth_social_views
 
+from core import views as core_views
+
 urlpatterns = [
+    url(
+        r'^health/$',
+        core_views.health,
+        name='health'
+    ),
     url(
         r'^admin/',
         include('admin_honeypot.urls', namespace='admin_honeypot')
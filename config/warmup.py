@@ -0,0 +1,134 @@
+"""
+Warm-up of a freshly started worker, called from config/wsgi.py and
+config/asgi.py once the application is loaded, so the first request
+doesn't pay for importing the views, compiling the URL patterns, loading
+templates and connecting to Postgres and Redis.
+
+Every step is timed; `manage.py profile_startup` reports the timings. A
+failing step is logged and doesn't keep the worker from starting.
+"""
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from time import perf_counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.template import TemplateDoesNotExist, engines
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+# Templates rendered by requests, besides those in the project's template
+# directory.
+TEMPLATES = [
+    'account/email/email_confirmation_signup_subject.txt',
+    'account/email/email_confirmation_signup_message.txt',
+    'account/email/email_confirmation_subject.txt',
+    'account/email/email_confirmation_message.txt',
+    'rest_framework/api.html',
+]
+
+
+def populate(resolver):
+    resolver.reverse_dict
+    for pattern in resolver.url_patterns:
+        pattern.regex
+        if hasattr(pattern, 'url_patterns'):
+            populate(pattern)
+
+
+def load_urls():
+    """
+    Imports all views and compiles the regexes of all URL patterns,
+    including those in namespaces, which reversing would only compile on
+    first use.
+    """
+    populate(get_resolver())
+
+
+def load_api_settings():
+    """
+    Imports the classes rest_framework and allauth only resolve on first
+    use: renderers, parsers, authentication, throttling and the social
+    providers.
+    """
+    from allauth.socialaccount import providers
+    from rest_framework.settings import api_settings
+
+    for name in ('DEFAULT_RENDERER_CLASSES', 'DEFAULT_PARSER_CLASSES',
+                 'DEFAULT_AUTHENTICATION_CLASSES',
+                 'DEFAULT_PERMISSION_CLASSES', 'DEFAULT_THROTTLE_CLASSES',
+                 'DEFAULT_CONTENT_NEGOTIATION_CLASS',
+                 'DEFAULT_METADATA_CLASS', 'DEFAULT_VERSIONING_CLASS'):
+        getattr(api_settings, name)
+    providers.registry.load()
+
+
+def load_templates():
+    """
+    Compiles the project's templates and TEMPLATES into the cached loader,
+    which Django enables when DEBUG is off.
+    """
+    names = list(TEMPLATES)
+    for directory in settings.TEMPLATES[0]['DIRS']:
+        directory = Path(directory)
+        names.extend(
+            str(path.relative_to(directory))
+            for path in directory.glob('**/*.html')
+        )
+    engine = engines['django']
+    for name in names:
+        try:
+            engine.get_template(name)
+        except TemplateDoesNotExist:
+            logger.warning("Template %s to warm up doesn't exist.", name)
+
+
+def connect_databases():
+    """
+    Connects to every database. Closing the connection afterwards returns
+    it to the pool of the pooled backend, which keeps it for the first
+    requests, and doesn't leave it behind for a forked worker otherwise.
+    """
+    for connection in connections.all():
+        connection.ensure_connection()
+        connection.close()
+
+
+def connect_caches():
+    for alias in settings.CACHES:
+        caches[alias].get('config:warmup')
+
+
+STEPS = [
+    ('urls', load_urls),
+    ('api_settings', load_api_settings),
+    ('templates', load_templates),
+    ('databases', connect_databases),
+    ('caches', connect_caches),
+]
+
+
+def warm_up():
+    """
+    Runs all steps and returns their durations in seconds (None for failed
+    steps).
+    """
+    timings = OrderedDict()
+    for name, step in STEPS:
+        start = perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.exception("Warm-up step %s failed.", name)
+            timings[name] = None
+        else:
+            timings[name] = perf_counter() - start
+    logger.info("Warmed up: %s", ", ".join(
+        "{} {}".format(name, "failed" if duration is None else
+                       "{:.1f}ms".format(duration * 1000))
+        for name, duration in timings.items()
+    ))
+    return timings
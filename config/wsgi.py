@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.prod")
 
 application = get_wsgi_application()
+
+# Import views, compile URL patterns and templates and connect to the
+# database and cache before the worker accepts traffic.
+from config.warmup import warm_up  # noqa: E402
+
+warm_up()
@@ -4,9 +4,19 @@ from allauth.utils import build_absolute_uri
 from django.http import HttpResponseRedirect
 from django.urls import reverse
 
+from .models import QueuedEmail
+
 
 class CustomAccountAdapter(DefaultAccountAdapter):
 
+    def send_mail(self, template_prefix, email, context):
+        """
+        Queues the e-mail in the outbox, it is delivered by
+        `manage.py send_queued_mail` once the request's transaction commits.
+        """
+        msg = self.render_mail(template_prefix, email, context)
+        QueuedEmail.objects.enqueue(msg)
+
     def get_email_confirmation_url(self, request, emailconfirmation):
         """Constructs the email confirmation (activation) url."""
         url = reverse(
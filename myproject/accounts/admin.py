@@ -1,18 +1,53 @@
 from authtools.admin import (BASE_FIELDS, SIMPLE_PERMISSION_FIELDS,
                              NamedUserAdmin)
+from django.conf import settings
 from django.contrib import admin
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db.models import Q
+from django.utils.translation import ugettext_lazy as _
 
-from .models import User
+from core.paginator import EstimatedCountPaginator
+
+from .models import ArchivedUser, QueuedEmail, User
 
 
 def verified(obj):
-    email = obj.emailaddress_set.filter(primary=True)
-    if email.exists():
-        return email[0].verified
-    return False
+    return obj.email_verified
 
 
 verified.boolean = True
+verified.admin_order_field = "email_verified"
+
+
+class VerifiedListFilter(admin.SimpleListFilter):
+    title = _("verified")
+    parameter_name = "verified"
+
+    def lookups(self, request, model_admin):
+        return (
+            ("1", _("Yes")),
+            ("0", _("No")),
+        )
+
+    def queryset(self, request, queryset):
+        if self.value() == "1":
+            return queryset.filter(email_verified=True)
+        if self.value() == "0":
+            return queryset.filter(email_verified=False)
+        return queryset
+
+
+# pg_trgm can't use its index for terms with fewer than three characters.
+TRIGRAM_MIN_LENGTH = 3
+
+
+def is_email(term):
+    try:
+        validate_email(term)
+    except ValidationError:
+        return False
+    return True
 
 
 @admin.register(User)
@@ -30,7 +65,7 @@ class SoftDeletableNamedUserAdmin(NamedUserAdmin):
         'is_removed',
     )
     search_fields = ["email", "name"]
-    readonly_fields = ("date_joined", "modified")
+    readonly_fields = ("date_joined", "modified", "removed")
     fieldsets = (
         BASE_FIELDS,
         SIMPLE_PERMISSION_FIELDS,
@@ -46,8 +81,55 @@ class SoftDeletableNamedUserAdmin(NamedUserAdmin):
         }),
         ("Dates", {
             "fields": (
-                ("date_joined", "modified"),
+                ("date_joined", "modified", "removed"),
             ),
         })
     )
-    list_filter = ('is_active', 'is_removed',)
+    list_filter = ('is_active', 'is_removed', VerifiedListFilter)
+    paginator = EstimatedCountPaginator
+    # Skip the unfiltered COUNT(*) behind "(n total)".
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        """
+        Annotate the primary e-mail's verification state, so the verified
+        column doesn't need a query per row, and cache the date_hierarchy
+        buckets.
+        """
+        return super().get_queryset(request).with_email_verified().cache_dates(
+            settings.ACCOUNTS_ADMIN_DATE_HIERARCHY_CACHE_TIMEOUT
+        )
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Route searches to the indexes from migrations 0003 and 0011: a full
+        e-mail address is an exact (btree) lookup and short terms are prefix
+        matches, everything else falls through to icontains, which the
+        trigram indexes serve.
+        """
+        term = search_term.strip()
+        if is_email(term):
+            return queryset.filter(email__iexact=term), False
+        if term and " " not in term and len(term) < TRIGRAM_MIN_LENGTH:
+            return queryset.filter(
+                Q(email__istartswith=term) | Q(name__istartswith=term)
+            ), False
+        return super().get_search_results(request, queryset, search_term)
+
+
+@admin.register(QueuedEmail)
+class QueuedEmailAdmin(admin.ModelAdmin):
+    date_hierarchy = "created"
+    list_display = ("subject", "to", "attempts", "sent", "next_attempt")
+    list_filter = ("sent",)
+    readonly_fields = ("created", "modified")
+
+
+@admin.register(ArchivedUser)
+class ArchivedUserAdmin(admin.ModelAdmin):
+    date_hierarchy = "archived"
+    list_display = ("email", "uuid", "removed", "archived")
+    search_fields = ["email"]
+    readonly_fields = (
+        "user_id", "uuid", "email", "removed", "archived", "data",
+    )
@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import ugettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from .. import tokens
+
+
+def get_token_cache_key(key):
+    return "accounts:token:{}".format(key)
+
+
+def invalidate_cached_tokens(*keys):
+    """Drops the cached entries for the given token keys."""
+    if keys:
+        cache.delete_many([get_token_cache_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for TokenAuthentication which resolves token keys
+    through the cache and only queries the database on a cache miss.
+    Cached entries are invalidated by the receivers in accounts.signals.
+    """
+
+    related = ('user',)
+
+    def get_token(self, key):
+        cache_key = get_token_cache_key(key)
+        token = cache.get(cache_key)
+        if token is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related(*self.related).get(
+                    key=key
+                )
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            self.cache_token(token)
+        return token
+
+    def cache_token(self, token):
+        cache.set(
+            get_token_cache_key(token.key), token,
+            settings.ACCOUNTS_TOKEN_CACHE_TIMEOUT
+        )
+
+    def authenticate_credentials(self, key):
+        token = self.get_token(key)
+
+        if not token.user.is_active or token.user.is_removed:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.')
+            )
+
+        return (token.user, token)
+
+
+class ExpiringTokenAuthentication(CachedTokenAuthentication):
+    """
+    CachedTokenAuthentication rejecting tokens which weren't used for
+    ACCOUNTS_TOKEN_EXPIRY seconds. Every use extends the token's life, but
+    last_used is only written once per ACCOUNTS_TOKEN_LAST_USED_INTERVAL.
+    """
+
+    related = ('user', 'activity')
+
+    def authenticate_credentials(self, key):
+        user, token = super().authenticate_credentials(key)
+        if tokens.is_expired(token):
+            raise exceptions.AuthenticationFailed(_('Token has expired.'))
+        if tokens.touch(token):
+            self.cache_token(token)
+        return (user, token)
@@ -0,0 +1,99 @@
+"""
+Async variants of the read-heavy accounts endpoints for the ASGI
+deployment, see config.routing. They only answer token authenticated
+requests, everything else is served by the views.
+"""
+import orjson
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from django.utils.translation import ugettext_lazy as _
+from rest_framework import exceptions
+
+from core.consumers import APIConsumer
+
+from .authentication import ExpiringTokenAuthentication
+from .lookup import lookup_users
+from .serializers import FastUserDetailSerializer, UserLookupSerializer
+from .views import get_user_validators
+
+
+class TokenAuthConsumer(APIConsumer):
+
+    authentication = ExpiringTokenAuthentication()
+
+    async def authenticate(self):
+        """
+        Resolves the "Authorization: Token <key>" header like the views do,
+        mostly from the token cache.
+        """
+        parts = (self.get_header("Authorization") or "").split()
+        if not parts or parts[0] != "Token":
+            raise exceptions.NotAuthenticated()
+        if len(parts) != 2:
+            raise exceptions.AuthenticationFailed(
+                _('Invalid token header.')
+            )
+        user, token = await self.database_sync_to_async(
+            self.authentication.authenticate_credentials
+        )(parts[1])
+        return user
+
+
+class UserDetailsConsumer(TokenAuthConsumer):
+    """
+    GET/HEAD of accounts.api.views.UserDetailsView, including its
+    conditional requests.
+    """
+
+    url_name = "api:auth:user_details"
+
+    def is_not_modified(self, etag, last_modified):
+        if_none_match = self.get_header("If-None-Match")
+        if if_none_match is not None:
+            etags = parse_etags(if_none_match)
+            return "*" in etags or etag in etags
+        if_modified_since = parse_http_date_safe(
+            self.get_header("If-Modified-Since") or ""
+        )
+        return (
+            if_modified_since is not None
+            and last_modified <= if_modified_since
+        )
+
+    async def respond(self, body):
+        user = await self.authenticate()
+        etag, last_modified = get_user_validators(user)
+        headers = [
+            ("ETag", etag),
+            ("Last-Modified", http_date(last_modified)),
+            ("Vary", "Authorization"),
+            ("Cache-Control", "private, no-cache"),
+        ]
+        if self.is_not_modified(etag, last_modified):
+            await self.send_json(304, None, headers)
+        else:
+            await self.send_json(
+                200, FastUserDetailSerializer(user).data, headers
+            )
+
+
+class UserLookupConsumer(TokenAuthConsumer):
+    """POST of accounts.api.views.UserLookupView."""
+
+    url_name = "api:users:lookup"
+
+    async def respond(self, body):
+        user = await self.authenticate()
+        if not (user.is_active and user.is_staff):
+            raise exceptions.PermissionDenied()
+        try:
+            data = orjson.loads(body)
+        except ValueError as exc:
+            raise exceptions.ParseError(
+                'JSON parse error - {}'.format(exc)
+            )
+        serializer = UserLookupSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        results = await self.database_sync_to_async(lookup_users)(
+            serializer.validated_data["uuids"]
+        )
+        await self.send_json(200, {"results": results})
@@ -0,0 +1,21 @@
+from django.utils.translation import ugettext_lazy as _
+from rest_framework import exceptions, status
+from rest_framework.views import exception_handler as default_handler
+
+from ..hashers import PasswordHashingUnavailable
+
+
+class ServiceUnavailable(exceptions.APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('Service temporarily unavailable, try again later.')
+    default_code = 'service_unavailable'
+
+
+def exception_handler(exc, context):
+    """
+    rest_framework's exception handler, which also answers
+    PasswordHashingUnavailable with 503.
+    """
+    if isinstance(exc, PasswordHashingUnavailable):
+        exc = ServiceUnavailable(str(exc), 'password_hashing_unavailable')
+    return default_handler(exc, context)
@@ -0,0 +1,134 @@
+"""
+Facebook Graph API access of the social login views: requests go through
+a pooled keep-alive session with strict timeouts, and profiles are cached
+briefly, so retried logins don't hit the Graph API again.
+
+ACCOUNTS_FACEBOOK_GRAPH_URL points the adapter to another Graph API, e.g.
+the stub server in accounts.graphstub.
+"""
+import hashlib
+import logging
+import os
+import threading
+
+import requests
+from allauth.socialaccount import providers
+from allauth.socialaccount.providers.facebook import views as facebook_views
+from allauth.socialaccount.providers.facebook.provider import (
+    GRAPH_API_VERSION, FacebookProvider
+)
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import ugettext_lazy as _
+from requests.adapters import HTTPAdapter
+from rest_framework import exceptions
+
+logger = logging.getLogger(__name__)
+
+_session = None
+_session_pid = None
+_lock = threading.Lock()
+
+
+def get_graph_url():
+    return "{}/{}".format(
+        settings.ACCOUNTS_FACEBOOK_GRAPH_URL.rstrip("/"), GRAPH_API_VERSION
+    )
+
+
+def get_session():
+    """
+    The session of this process. Its connection pool keeps up to
+    ACCOUNTS_FACEBOOK_POOL_SIZE connections to the Graph API alive, so
+    only the first request pays for the TLS handshake.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _lock:
+            if _session is None or _session_pid != pid:
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=settings.ACCOUNTS_FACEBOOK_POOL_SIZE,
+                    max_retries=0,
+                )
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session, _session_pid = session, pid
+    return _session
+
+
+def close_session():
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get_profile_cache_key(access_token, fields):
+    digest = hashlib.sha256(
+        "{}:{}".format(access_token, fields).encode()
+    ).hexdigest()
+    return "accounts:facebook:me:{}".format(digest)
+
+
+def fetch_profile(app, token, fields):
+    """
+    The /me response for `token`, cached for
+    ACCOUNTS_FACEBOOK_PROFILE_CACHE_TIMEOUT seconds under a hash of the
+    token.
+    """
+    fields = ",".join(fields)
+    cache_key = get_profile_cache_key(token.token, fields)
+    profile = cache.get(cache_key)
+    if profile is None:
+        response = get_session().get(
+            get_graph_url() + "/me",
+            params={
+                "fields": fields,
+                "access_token": token.token,
+                "appsecret_proof": facebook_views.compute_appsecret_proof(
+                    app, token
+                ),
+            },
+            timeout=settings.ACCOUNTS_FACEBOOK_TIMEOUT,
+        )
+        response.raise_for_status()
+        profile = response.json()
+        cache.set(
+            cache_key, profile,
+            settings.ACCOUNTS_FACEBOOK_PROFILE_CACHE_TIMEOUT
+        )
+    return profile
+
+
+class FacebookUnavailable(exceptions.APIException):
+    status_code = 503
+    default_detail = _('Facebook is currently unavailable, try again later.')
+    default_code = 'facebook_unavailable'
+
+
+class FacebookOAuth2Adapter(facebook_views.FacebookOAuth2Adapter):
+
+    @property
+    def access_token_url(self):
+        return get_graph_url() + "/oauth/access_token"
+
+    def complete_login(self, request, app, access_token, **kwargs):
+        provider = providers.registry.by_id(FacebookProvider.id, request)
+        try:
+            profile = fetch_profile(app, access_token, provider.get_fields())
+        except requests.HTTPError as e:
+            if e.response.status_code >= 500:
+                logger.warning("Facebook profile request failed.",
+                               exc_info=True)
+                raise FacebookUnavailable()
+            raise exceptions.ValidationError(
+                _('Invalid Facebook access token.')
+            )
+        except requests.RequestException:
+            logger.warning("Facebook profile request failed.", exc_info=True)
+            raise FacebookUnavailable()
+        return provider.sociallogin_from_response(request, profile)
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from .serializers import FastUserDetailSerializer
+
+User = get_user_model()
+
+
+def get_user_lookup_cache_key(uuid):
+    return "accounts:user:uuid:{}".format(uuid)
+
+
+def invalidate_user_lookups(*uuids):
+    """Drops the cached lookup results for the given user uuids."""
+    if uuids:
+        cache.delete_many([get_user_lookup_cache_key(uuid) for uuid in uuids])
+
+
+def lookup_users(uuids):
+    """
+    Resolves user uuids to their UserDetailSerializer representation, in the
+    given order. Cached users are served by one `get_many`, the rest is
+    loaded with a single `uuid IN (...)` query and cached afterwards.
+    Unknown and removed users are left out.
+    """
+    uuids = list(dict.fromkeys(str(uuid) for uuid in uuids))
+    keys = {get_user_lookup_cache_key(uuid): uuid for uuid in uuids}
+    found = {
+        keys[key]: data for key, data in cache.get_many(list(keys)).items()
+    }
+
+    missing = [uuid for uuid in uuids if uuid not in found]
+    if missing:
+        users = User.objects.not_removed().filter(uuid__in=missing)
+        loaded = {
+            str(user.uuid): dict(FastUserDetailSerializer(user).data)
+            for user in users
+        }
+        cache.set_many(
+            {get_user_lookup_cache_key(uuid): data
+             for uuid, data in loaded.items()},
+            settings.ACCOUNTS_USER_LOOKUP_CACHE_TIMEOUT
+        )
+        found.update(loaded)
+
+    return [found[uuid] for uuid in uuids if uuid in found]
@@ -0,0 +1,72 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import ugettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+class ModifiedKeysetPagination(BasePagination):
+    """
+    Keyset pagination over (modified, id). The opaque cursor encodes the
+    last row a client has seen, so every page is an index range scan no
+    matter how far into the table it is, and rows changing between two
+    requests move to the end instead of shifting pages around.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "limit"
+    page_size = 500
+    max_page_size = 1000
+    invalid_cursor_message = _("Invalid cursor")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.cursor = request.query_params.get(self.cursor_query_param)
+
+        position = self.decode_cursor(self.cursor)
+        if position is not None:
+            modified, pk = position
+            queryset = queryset.filter(modified__gte=modified).exclude(
+                modified=modified, pk__lte=pk
+            )
+        page = list(queryset.order_by("modified", "pk")[:self.page_size])
+        if page:
+            self.cursor = self.encode_cursor(page[-1])
+        self.has_more = len(page) == self.page_size
+        return page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def encode_cursor(self, obj):
+        value = "{}|{}".format(obj.modified.isoformat(), obj.pk)
+        return urlsafe_b64encode(value.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None
+        try:
+            value = urlsafe_b64decode(cursor.encode()).decode()
+            modified, pk = value.split("|")
+            modified = parse_datetime(modified)
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if modified is None:
+            raise NotFound(self.invalid_cursor_message)
+        return modified, pk
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ("cursor", self.cursor),
+            ("has_more", self.has_more),
+            ("results", data),
+        ]))
@@ -1,6 +1,14 @@
+from collections import OrderedDict
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from rest_auth.serializers import \
+    PasswordResetSerializer as BasePasswordResetSerializer
 from rest_framework import serializers
 from rest_framework.authtoken.models import Token
+from rest_framework.fields import get_attribute
+
+from ..forms import QueuedPasswordResetForm
 
 User = get_user_model()
 
@@ -19,3 +27,78 @@ class TokenSerializer(serializers.ModelSerializer):
     class Meta:
         model = Token
         fields = ('key', 'user')
+
+
+class PrecomputedFieldsMixin(object):
+    """
+    Read path for serializers whose output only depends on the instance.
+
+    DRF builds (and for ModelSerializers introspects) the fields of every
+    serializer instance. This mixin builds them once per class and keeps a
+    plan of (name, source attributes, field), so `to_representation` is a
+    plain loop. Fields depending on the serializer context (e.g. hyperlinks)
+    must not be used. Writes still go through the regular fields.
+    """
+
+    @classmethod
+    def get_field_plan(cls):
+        plan = cls.__dict__.get('_field_plan')
+        if plan is None:
+            plan = tuple(
+                (field.field_name, field.source_attrs, field)
+                for field in cls()._readable_fields
+            )
+            cls._field_plan = plan
+        return plan
+
+    def to_representation(self, instance):
+        ret = OrderedDict()
+        for field_name, source_attrs, field in self.get_field_plan():
+            attribute = get_attribute(instance, source_attrs)
+            if attribute is None:
+                ret[field_name] = None
+            else:
+                ret[field_name] = field.to_representation(attribute)
+        return ret
+
+
+class FastUserDetailSerializer(PrecomputedFieldsMixin, UserDetailSerializer):
+    pass
+
+
+class FastTokenSerializer(PrecomputedFieldsMixin, TokenSerializer):
+    user = FastUserDetailSerializer()
+
+    class Meta(TokenSerializer.Meta):
+        pass
+
+
+class UserChangeSerializer(serializers.ModelSerializer):
+    """
+    A changed user as seen by the changes API. Removed users are returned as
+    tombstones which only carry their uuid.
+    """
+
+    removed = serializers.BooleanField(source='is_removed')
+
+    class Meta:
+        model = User
+        fields = ('uuid', 'name', 'modified', 'removed')
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if instance.is_removed:
+            del data['name']
+        return data
+
+
+class UserLookupSerializer(serializers.Serializer):
+    uuids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=settings.ACCOUNTS_USER_LOOKUP_MAX_UUIDS,
+    )
+
+
+class PasswordResetSerializer(BasePasswordResetSerializer):
+    password_reset_form_class = QueuedPasswordResetForm
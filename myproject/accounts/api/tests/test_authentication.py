@@ -0,0 +1,191 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from ...models import TokenActivity
+from ...tokens import get_token_touch_key
+from ..authentication import (
+    CachedTokenAuthentication, ExpiringTokenAuthentication,
+    get_token_cache_key
+)
+from ..utils import create_token
+
+User = get_user_model()
+
+
+class CachedTokenAuthenticationTestCase(APITestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(
+            email="testuser@test.com",
+            name="Test User",
+            password="test1234test"
+        )
+        token, created = Token.objects.get_or_create(user=user)
+        self.user = user
+        self.token = token
+        self.authentication = CachedTokenAuthentication()
+        cache.delete(get_token_cache_key(token.key))
+
+    def test_cache_miss_populates_cache(self):
+        """Test if the first lookup stores the token in the cache."""
+        user, token = self.authentication.authenticate_credentials(
+            self.token.key
+        )
+        self.assertEqual(user, self.user)
+        self.assertEqual(token, self.token)
+        self.assertIsNotNone(cache.get(get_token_cache_key(self.token.key)))
+
+    def test_cache_hit_does_not_query_database(self):
+        """Test if a cached token is resolved without any query."""
+        self.authentication.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            user, token = self.authentication.authenticate_credentials(
+                self.token.key
+            )
+        self.assertEqual(user, self.user)
+
+    def test_invalid_token_fail(self):
+        """Test if an unknown key is rejected."""
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authentication.authenticate_credentials("invalidkey")
+
+    def test_token_delete_invalidates_cache(self):
+        """Test if deleting the token (logout) drops the cache entry."""
+        self.authentication.authenticate_credentials(self.token.key)
+        self.token.delete()
+        self.assertIsNone(cache.get(get_token_cache_key(self.token.key)))
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.token.key)
+
+    def test_user_save_invalidates_cache(self):
+        """Test if a password change drops the cached token."""
+        self.authentication.authenticate_credentials(self.token.key)
+        self.user.set_password("thisisanewpassword")
+        self.user.save()
+        self.assertIsNone(cache.get(get_token_cache_key(self.token.key)))
+
+    def test_soft_deleted_user_fail(self):
+        """Test if a soft-deleted user can't authenticate anymore."""
+        self.authentication.authenticate_credentials(self.token.key)
+        self.user.delete()
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.token.key)
+
+
+class CachedTokenInvalidationTestCase(TransactionTestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="testuser@test.com",
+            name="Test User",
+            password="test1234test"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.cache_key = get_token_cache_key(self.token.key)
+        CachedTokenAuthentication().authenticate_credentials(self.token.key)
+
+    def test_invalidated_again_after_commit(self):
+        """
+        Test if a token cached again before the user's change committed
+        (by a request still seeing the old row) is dropped on commit.
+        """
+        self.assertIsNotNone(cache.get(self.cache_key))
+        with transaction.atomic():
+            self.user.is_active = False
+            self.user.save()
+            self.assertIsNone(cache.get(self.cache_key))
+            cache.set(self.cache_key, "stale")
+        self.assertIsNone(cache.get(self.cache_key))
+
+    def test_rollback_keeps_cache_until_expiry(self):
+        """Test if nothing is invalidated again after a rollback."""
+        try:
+            with transaction.atomic():
+                self.user.save()
+                cache.set(self.cache_key, "cached")
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertEqual(cache.get(self.cache_key), "cached")
+
+
+@override_settings(
+    ACCOUNTS_TOKEN_EXPIRY=60 * 60 * 24, ACCOUNTS_TOKEN_LAST_USED_INTERVAL=60
+)
+class ExpiringTokenAuthenticationTestCase(APITestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(
+            email="testuser@test.com",
+            name="Test User",
+            password="test1234test"
+        )
+        self.user = user
+        self.token = Token.objects.create(user=user)
+        self.authentication = ExpiringTokenAuthentication()
+        cache.delete_many([
+            get_token_cache_key(self.token.key),
+            get_token_touch_key(self.token.key),
+        ])
+
+    def set_created(self, **kwargs):
+        Token.objects.filter(pk=self.token.pk).update(
+            created=timezone.now() - timedelta(**kwargs)
+        )
+
+    def test_new_token_not_touched(self):
+        """Test if a fresh token is used without writing last_used."""
+        self.authentication.authenticate_credentials(self.token.key)
+        self.assertFalse(TokenActivity.objects.exists())
+
+    def test_expired_token_fail(self):
+        """Test if a token unused for longer than the expiry is rejected."""
+        self.set_created(days=2)
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.token.key)
+
+    def test_recent_use_extends_expiry(self):
+        """Test if a recently used old token is still accepted."""
+        self.set_created(days=2)
+        TokenActivity.objects.create(
+            token=self.token, last_used=timezone.now() - timedelta(hours=1)
+        )
+        user, token = self.authentication.authenticate_credentials(
+            self.token.key
+        )
+        self.assertEqual(user, self.user)
+
+    def test_last_used_writes_coalesced(self):
+        """Test if last_used is written once per interval."""
+        self.set_created(minutes=5)
+        self.authentication.authenticate_credentials(self.token.key)
+        last_used = TokenActivity.objects.get(token=self.token).last_used
+        self.assertAlmostEqual(
+            last_used, timezone.now(), delta=timedelta(seconds=5)
+        )
+        with self.assertNumQueries(0):
+            self.authentication.authenticate_credentials(self.token.key)
+
+        # Another process, still holding the old cache entry.
+        cache.delete(get_token_cache_key(self.token.key))
+        TokenActivity.objects.filter(token=self.token).update(
+            last_used=timezone.now() - timedelta(minutes=5)
+        )
+        with self.assertNumQueries(1):
+            self.authentication.authenticate_credentials(self.token.key)
+
+    def test_create_token_replaces_expired_token(self):
+        """Test if logging in with an expired token issues a new one."""
+        self.assertEqual(create_token(Token, self.user, None), self.token)
+        self.set_created(days=2)
+        token = create_token(Token, self.user, None)
+        self.assertNotEqual(token, self.token)
+        self.assertFalse(Token.objects.filter(pk=self.token.pk).exists())
@@ -0,0 +1,128 @@
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from rest_framework.authtoken.models import Token
+
+from config import routers
+from core.testing import asgi_request
+
+from ..consumers import UserDetailsConsumer, UserLookupConsumer
+
+User = get_user_model()
+
+
+class AccountsConsumersTestCase(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="testuser@test.com",
+            name="Test User",
+            password="test1234test"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.admin = User.objects.create_superuser(
+            email="admin@test.com",
+            password="test1234test"
+        )
+        self.admin_token = Token.objects.create(user=self.admin)
+
+    def get_header(self, response, name):
+        return dict(response["headers"])[name.encode()].decode()
+
+    def get_details(self, token=None, headers=()):
+        headers = list(headers)
+        if token is not None:
+            headers.append(("Authorization", "Token " + token.key))
+        return asgi_request(
+            UserDetailsConsumer, "GET", "/api/auth/user/", headers=headers
+        )
+
+    def lookup(self, token, uuids):
+        return asgi_request(
+            UserLookupConsumer, "POST", "/api/users/lookup/",
+            body=json.dumps({"uuids": uuids}).encode(),
+            headers=[("Authorization", "Token " + token.key)]
+        )
+
+    def test_user_details(self):
+        """Test if the consumer answers like UserDetailsView."""
+        response = self.get_details(self.token)
+        self.assertEqual(response["status"], 200)
+        data = json.loads(response["body"].decode())
+        self.assertEqual(
+            data, {"name": "Test User", "uuid": str(self.user.uuid)}
+        )
+        self.assertEqual(
+            self.get_header(response, "Cache-Control"), "private, no-cache"
+        )
+
+    def test_user_details_not_modified(self):
+        """Test if a matching If-None-Match is answered with 304."""
+        etag = self.get_header(self.get_details(self.token), "ETag")
+        response = self.get_details(
+            self.token, headers=[("If-None-Match", etag)]
+        )
+        self.assertEqual(response["status"], 304)
+        self.assertEqual(response["body"], b"")
+
+    def test_user_details_unauthenticated(self):
+        """Test if an invalid token is rejected with 401."""
+        response = self.get_details(Token(key="invalid"))
+        self.assertEqual(response["status"], 401)
+        self.assertEqual(self.get_header(response, "WWW-Authenticate"), "Token")
+
+    def test_lookup(self):
+        """Test if staff members can look up users by uuid."""
+        response = self.lookup(self.admin_token, [str(self.user.uuid)])
+        self.assertEqual(response["status"], 200)
+        results = json.loads(response["body"].decode())["results"]
+        self.assertEqual([user["uuid"] for user in results],
+                         [str(self.user.uuid)])
+
+    def test_lookup_permission_denied(self):
+        """Test if other users can't use the lookup."""
+        response = self.lookup(self.token, [str(self.user.uuid)])
+        self.assertEqual(response["status"], 403)
+
+    def test_lookup_invalid(self):
+        """Test if invalid uuids are answered with the serializer errors."""
+        response = self.lookup(self.admin_token, ["invalid"])
+        self.assertEqual(response["status"], 400)
+        self.assertIn("uuids", json.loads(response["body"].decode()))
+
+    @override_settings(REQUEST_METRICS_HEADERS=True)
+    def test_middleware_headers(self):
+        """Test if the headers of the skipped middleware are added."""
+        response = self.get_details(self.token)
+        self.assertEqual(self.get_header(response, "X-Frame-Options"), "DENY")
+        self.assertIn(b"x-query-count", dict(
+            (key.lower(), value) for key, value in response["headers"]
+        ))
+
+    # The primary stands in for the replica, this test only looks at the
+    # router's decision.
+    @override_settings(DATABASE_REPLICAS=["default"])
+    def test_pinned_client_reads_from_primary(self):
+        """Test if a client that wrote recently reads from the primary."""
+        use_primary = []
+
+        def lookup_users(uuids):
+            use_primary.append(routers.use_primary())
+            return []
+
+        with mock.patch(
+            "accounts.api.consumers.lookup_users", side_effect=lookup_users
+        ):
+            self.lookup(self.admin_token, [str(self.user.uuid)])
+            # A write of the same client through the views.
+            routers.start_request(RequestFactory().get(
+                "/", HTTP_AUTHORIZATION="Token " + self.admin_token.key
+            ))
+            routers._state.wrote = True
+            routers.finish_request()
+            self.lookup(self.admin_token, [str(self.user.uuid)])
+        self.assertEqual(use_primary, [False, True])
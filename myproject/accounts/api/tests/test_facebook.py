@@ -0,0 +1,88 @@
+from allauth.socialaccount.models import SocialApp, SocialToken
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework import exceptions
+
+from ...graphstub import GraphStub
+from .. import facebook
+
+
+class FacebookGraphTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        facebook.close_session()
+        self.stub = GraphStub().start()
+        self.addCleanup(self.stub.stop)
+        self.addCleanup(facebook.close_session)
+        overrides = override_settings(ACCOUNTS_FACEBOOK_GRAPH_URL=self.stub.url)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.app = SocialApp.objects.create(
+            provider="facebook",
+            name="Facebook",
+            client_id="client",
+            secret="secret",
+        )
+        self.app.sites.add(Site.objects.get_current())
+        self.fields = ["id", "email", "name"]
+
+    def complete_login(self, access_token):
+        request = RequestFactory().post("/api/auth/facebook/")
+        adapter = facebook.FacebookOAuth2Adapter(request)
+        return adapter.complete_login(
+            request, self.app, SocialToken(app=self.app, token=access_token)
+        )
+
+    def test_fetch_profile(self):
+        """Test if the profile is fetched from the configured Graph API."""
+        profile = facebook.fetch_profile(
+            self.app, SocialToken(token="a"), self.fields
+        )
+        self.assertTrue(profile["id"])
+        self.assertEqual(profile["email"], "fb{}@test.com".format(profile["id"]))
+        self.assertEqual(self.stub.requests, 1)
+
+    def test_fetch_profile_cached(self):
+        """Test if a profile fetched before is served from the cache."""
+        first = facebook.fetch_profile(
+            self.app, SocialToken(token="a"), self.fields
+        )
+        second = facebook.fetch_profile(
+            self.app, SocialToken(token="a"), self.fields
+        )
+        self.assertEqual(first, second)
+        self.assertEqual(self.stub.requests, 1)
+
+    def test_connection_reused(self):
+        """Test if requests for different tokens share one connection."""
+        for token in ("a", "b", "c"):
+            facebook.fetch_profile(
+                self.app, SocialToken(token=token), self.fields
+            )
+        self.assertEqual(self.stub.requests, 3)
+        self.assertEqual(self.stub.connections, 1)
+
+    def test_complete_login(self):
+        """Test if the adapter builds the social login from the profile."""
+        login = self.complete_login("a")
+        self.assertEqual(login.account.provider, "facebook")
+        self.assertEqual(login.user.email, login.account.extra_data["email"])
+
+    def test_complete_login_invalid_token(self):
+        """Test if a rejected access token is a validation error."""
+        with self.assertRaises(exceptions.ValidationError):
+            self.complete_login("invalid")
+
+    def test_complete_login_unavailable(self):
+        """Test if a Graph API error is answered with 503."""
+        with self.assertRaises(facebook.FacebookUnavailable):
+            self.complete_login("error")
+
+    @override_settings(ACCOUNTS_FACEBOOK_TIMEOUT=(1, 0.05))
+    def test_complete_login_timeout(self):
+        """Test if a slow Graph API is given up on after the timeout."""
+        self.stub.server.latency = 0.5
+        with self.assertRaises(facebook.FacebookUnavailable):
+            self.complete_login("a")
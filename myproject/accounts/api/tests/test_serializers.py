@@ -2,7 +2,9 @@ from django.contrib.auth import get_user_model
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
 
-from ..serializers import TokenSerializer, UserDetailSerializer
+from ..serializers import (FastTokenSerializer, FastUserDetailSerializer,
+                           TokenSerializer, UserDetailSerializer)
+from ..utils import create_token
 
 User = get_user_model()
 
@@ -42,3 +44,38 @@ class AccountsAPISerializerTestCase(APITestCase):
         data = self.tokenserializer.data
         self.assertEqual(data['key'], self.token.key)
         self.assertEqual(data['user'], self.userserializer.data)
+
+    def test_fast_userserializer_identical_output(self):
+        """Test if the precomputed serializer matches the regular one."""
+        self.assertEqual(
+            FastUserDetailSerializer(instance=self.user).data,
+            self.userserializer.data
+        )
+        users = [self.user, User(name="", email="other@test.com")]
+        self.assertEqual(
+            FastUserDetailSerializer(users, many=True).data,
+            UserDetailSerializer(users, many=True).data
+        )
+
+    def test_fast_tokenserializer_identical_output(self):
+        data = FastTokenSerializer(instance=self.token).data
+        self.assertEqual(data, self.tokenserializer.data)
+        self.assertEqual(list(data.keys()), ['key', 'user'])
+        self.assertEqual(list(data['user'].keys()), ['name', 'uuid'])
+
+    def test_fast_userserializer_updates(self):
+        serializer = FastUserDetailSerializer(
+            instance=self.user, data={"name": "New Name"}
+        )
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.name, "New Name")
+        self.assertEqual(serializer.data['name'], "New Name")
+
+    def test_create_token_serializes_without_queries(self):
+        """Test if the created token carries the user it was created for."""
+        token = create_token(Token, self.user, None)
+        self.assertEqual(token, self.token)
+        with self.assertNumQueries(0):
+            FastTokenSerializer(instance=token).data
@@ -1,6 +1,13 @@
+import json
+import uuid
+from datetime import timedelta
+from unittest import mock
+
 from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
 from django.core import mail
+from django.core.cache import cache
+from django.utils import timezone
 from rest_framework import serializers, status
 from rest_framework.authtoken.models import Token
 from rest_framework.reverse import reverse as api_reverse
@@ -9,6 +16,11 @@ from rest_framework.test import APITestCase
 from allauth.account.models import EmailAddress
 from allauth.socialaccount.models import SocialAccount, SocialApp
 from config.settings.base import get_env_variable
+from core.testing import QueryBudgetMixin
+
+from ...outbox import deliver_queued_mail
+from ..lookup import get_user_lookup_cache_key
+from ..throttling import reset_throttles
 
 User = get_user_model()
 
@@ -16,6 +28,7 @@ User = get_user_model()
 class AccountsAPIViewsTestCase(APITestCase):
 
     def setUp(self):
+        reset_throttles()
         user = User.objects.create_user(
             email="testuser@test.com",
             name="Test User",
@@ -119,6 +132,8 @@ class AccountsAPIViewsTestCase(APITestCase):
         data = {"email": "testuser@test.com"}
         response = self.client.post(self.password_reset_url, data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(mail.outbox), 0)
+        deliver_queued_mail()
         self.assertEqual(len(mail.outbox), 1)
         self.assertContains(response, "Password reset e-mail has been sent.")
 
@@ -126,6 +141,7 @@ class AccountsAPIViewsTestCase(APITestCase):
         """Test if no password reset email gets send for invalid email."""
         data = {"email": "nonexistentemail@test.com"}
         response = self.client.post(self.password_reset_url, data)
+        deliver_queued_mail()
         self.assertEqual(len(mail.outbox), 0)
 
     def test_api_auth_register_success(self):
@@ -153,6 +169,8 @@ class AccountsAPIViewsTestCase(APITestCase):
         response = self.client.post(self.register_url, data)
         content = {"detail": "Verification e-mail sent."}
         self.assertEqual(response.data, content)
+        self.assertEqual(len(mail.outbox), 0)
+        deliver_queued_mail()
         self.assertEqual(len(mail.outbox), 1)
 
     def test_api_auth_register_email_verification_success(self):
@@ -163,6 +181,7 @@ class AccountsAPIViewsTestCase(APITestCase):
             "password2": "test1234test"
         }
         response = self.client.post(self.register_url, data)
+        deliver_queued_mail()
         self.client.get(mail.outbox[0].body[-117:-41])
         emailaddress = EmailAddress.objects.get(email=data["email"])
         self.assertTrue(emailaddress.verified)
@@ -334,6 +353,77 @@ class AccountsAPIViewsTestCase(APITestCase):
             "Authentication credentials were not provided."
         )
 
+    def test_api_auth_user_details_not_modified(self):
+        """Test if a matching If-None-Match is answered without queries."""
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.token.key)
+        response = self.client.get(self.user_details_url)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+        self.assertIn("Authorization", response["Vary"])
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                self.user_details_url, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_api_auth_user_details_if_modified_since(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.token.key)
+        response = self.client.get(self.user_details_url)
+        response = self.client.get(
+            self.user_details_url,
+            HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_api_auth_user_details_etag_changes_on_update(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.token.key)
+        etag = self.client.get(self.user_details_url)["ETag"]
+        response = self.client.patch(
+            self.user_details_url, {"name": "Test Brownie User"},
+            HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        response = self.client.get(
+            self.user_details_url, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_api_auth_user_details_if_match_fail(self):
+        """Test if an update based on a stale ETag is rejected."""
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.token.key)
+        etag = self.client.get(self.user_details_url)["ETag"]
+        self.client.patch(self.user_details_url, {"name": "First Update"})
+        response = self.client.put(
+            self.user_details_url, {"name": "Lost Update"},
+            HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_412_PRECONDITION_FAILED
+        )
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.name, "First Update")
+
+    def test_api_auth_user_details_if_match_checks_database(self):
+        """Test if If-Match is checked against the row, not the cache."""
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.token.key)
+        etag = self.client.get(self.user_details_url)["ETag"]
+        # Like a concurrent update the cached user doesn't know about yet.
+        User.objects.filter(pk=self.user.pk).update(
+            name="First Update",
+            modified=timezone.now() + timedelta(seconds=1)
+        )
+        response = self.client.put(
+            self.user_details_url, {"name": "Lost Update"},
+            HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_412_PRECONDITION_FAILED
+        )
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.name, "First Update")
+
     def test_api_auth_logout_success(self):
         """Test if a user can logout, meaning his token gets destroyed."""
         tokens = Token.objects.all()
@@ -352,6 +442,90 @@ class AccountsAPIViewsTestCase(APITestCase):
         self.assertEqual(Token.objects.count(), tokencount)
 
 
+class AccountsAPIQueryBudgetTestCase(QueryBudgetMixin, APITestCase):
+    """Guards the endpoints against N+1 regressions."""
+
+    query_budgets = {
+        "api:auth:login": 8,
+        "api:auth:register": 20,
+        "api:auth:password_reset": 6,
+        "api:auth:password_change": 6,
+        "api:auth:user_details": 5,
+        "api:auth:logout": 5,
+    }
+
+    def setUp(self):
+        reset_throttles()
+        user = User.objects.create_user(
+            email="testuser@test.com",
+            name="Test User",
+            password="test1234test"
+        )
+        token, created = Token.objects.get_or_create(user=user)
+        EmailAddress.objects.get_or_create(
+            user=user,
+            email=user.email,
+            verified=True,
+            primary=True
+        )
+        self.user = user
+        self.token = token
+
+    def test_api_auth_login_query_budget(self):
+        data = {"email": "testuser@test.com", "password": "test1234test"}
+        with self.assertQueryBudget("api:auth:login"):
+            response = self.client.post(api_reverse("api:auth:login"), data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_api_auth_register_query_budget(self):
+        data = {
+            "email": "newtestuser@test.com",
+            "password1": "test1234test",
+            "password2": "test1234test"
+        }
+        with self.assertQueryBudget("api:auth:register"):
+            response = self.client.post(api_reverse("api:auth:register"), data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_api_auth_password_reset_query_budget(self):
+        data = {"email": "testuser@test.com"}
+        with self.assertQueryBudget("api:auth:password_reset"):
+            response = self.client.post(
+                api_reverse("api:auth:password_reset"), data
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_api_auth_password_change_query_budget(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.token.key)
+        data = {
+            "old_password": "test1234test",
+            "new_password1": "thisisanewpassword",
+            "new_password2": "thisisanewpassword",
+        }
+        with self.assertQueryBudget("api:auth:password_change"):
+            response = self.client.post(
+                api_reverse("api:auth:password_change"), data
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_api_auth_user_details_query_budget(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.token.key)
+        with self.assertQueryBudget("api:auth:user_details"):
+            response = self.client.get(api_reverse("api:auth:user_details"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with self.assertQueryBudget("api:auth:user_details"):
+            response = self.client.put(
+                api_reverse("api:auth:user_details"), {"name": "New Name"}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_api_auth_logout_query_budget(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.token.key)
+        with self.assertQueryBudget("api:auth:logout"):
+            response = self.client.post(api_reverse("api:auth:logout"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
 class AccountsSocialAPIViewsTestCase(APITestCase):
 
     def setUp(self):
@@ -405,3 +579,245 @@ class AccountsSocialAPIViewsTestCase(APITestCase):
             response = self.client.post(self.fb_connect_url, data)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertEqual(SocialAccount.objects.first().user, user)
+
+
+class UserExportAPIViewTestCase(APITestCase):
+
+    def setUp(self):
+        staff = User.objects.create_user(
+            email="staff@test.com",
+            name="Staff User",
+            password="test1234test"
+        )
+        staff.is_staff = True
+        staff.save()
+        user = User.objects.create_user(
+            email="testuser@test.com",
+            name="Test User",
+            password="test1234test"
+        )
+        EmailAddress.objects.create(
+            user=user,
+            email=user.email,
+            verified=True,
+            primary=True
+        )
+        self.staff = staff
+        self.user = user
+        self.csv_url = api_reverse("api:users:export", args=["csv"])
+        self.jsonl_url = api_reverse("api:users:export", args=["jsonl"])
+
+    def test_api_users_export_csv_success(self):
+        """Test if staff can stream all users as CSV."""
+        self.client.force_authenticate(self.staff)
+        response = self.client.get(self.csv_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            lines[0], "uuid,name,email,date_joined,modified,email_verified"
+        )
+        self.assertEqual(len(lines), 3)
+        self.assertIn(
+            "{},Test User,testuser@test.com".format(self.user.uuid),
+            "\n".join(lines)
+        )
+
+    def test_api_users_export_jsonl_success(self):
+        """Test if the JSONL export contains the verification state."""
+        self.client.force_authenticate(self.staff)
+        response = self.client.get(self.jsonl_url)
+        rows = [
+            json.loads(line) for line in
+            b"".join(response.streaming_content).decode().splitlines()
+        ]
+        verified = {row["email"]: row["email_verified"] for row in rows}
+        self.assertEqual(
+            verified, {"staff@test.com": False, "testuser@test.com": True}
+        )
+
+    def test_api_users_export_not_staff_fail(self):
+        """Test if regular users can't export users."""
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.csv_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class UserChangesAPIViewTestCase(APITestCase):
+
+    def setUp(self):
+        staff = User.objects.create_user(
+            email="staff@test.com",
+            password="test1234test"
+        )
+        staff.is_staff = True
+        staff.save()
+        start = timezone.now() - timedelta(hours=1)
+        users = []
+        for i in range(5):
+            user = User.objects.create_user(
+                email="user{}@test.com".format(i),
+                name="User {}".format(i)
+            )
+            users.append(user)
+        # Two users share a timestamp to exercise the id tie-breaker.
+        for i, user in enumerate(users):
+            User.objects.filter(pk=user.pk).update(
+                modified=start + timedelta(minutes=min(i, 3))
+            )
+        User.objects.filter(pk=staff.pk).update(modified=start)
+        self.staff = staff
+        self.users = users
+        self.url = api_reverse("api:users:changes")
+
+    def test_api_users_changes_keyset_pages(self):
+        """Test if paging with the cursor returns every change once."""
+        self.client.force_authenticate(self.staff)
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen += [row["uuid"] for row in response.data["results"]]
+            cursor = response.data["cursor"]
+            if not response.data["has_more"]:
+                break
+        expected = [str(self.staff.uuid)] + [str(u.uuid) for u in self.users]
+        self.assertEqual(sorted(seen), sorted(expected))
+        self.assertEqual(len(seen), len(expected))
+
+        response = self.client.get(self.url, {"cursor": cursor})
+        self.assertEqual(response.data["results"], [])
+        self.assertEqual(response.data["cursor"], cursor)
+
+    def test_api_users_changes_tombstone(self):
+        """Test if removed users are returned without their profile."""
+        self.client.force_authenticate(self.staff)
+        cursor = self.client.get(self.url).data["cursor"]
+        removed = self.users[0]
+        removed.delete()
+        User.objects.filter(pk=removed.pk).update(
+            modified=timezone.now() - timedelta(minutes=1)
+        )
+        response = self.client.get(self.url, {"cursor": cursor})
+        self.assertEqual(
+            response.data["results"][0],
+            {
+                "uuid": str(removed.uuid),
+                "modified": response.data["results"][0]["modified"],
+                "removed": True,
+            }
+        )
+
+    def test_api_users_changes_recent_changes_held_back(self):
+        self.client.force_authenticate(self.staff)
+        User.objects.create_user(email="new@test.com")
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data["results"]), 6)
+
+    def test_api_users_changes_open_transaction_holds_back(self):
+        """
+        Test if changes after the start of the oldest open transaction are
+        held back, they might have been written by it before its commit.
+        """
+        self.client.force_authenticate(self.staff)
+        with mock.patch(
+            "accounts.api.views.get_oldest_transaction_start",
+            return_value=timezone.now() - timedelta(minutes=58)
+        ):
+            response = self.client.get(self.url)
+        # The staff member and the first two users, modified 59+ minutes ago.
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_api_users_changes_invalid_cursor_fail(self):
+        self.client.force_authenticate(self.staff)
+        response = self.client.get(self.url, {"cursor": "invalid"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_api_users_changes_not_staff_fail(self):
+        """Test if regular users can't list changes."""
+        self.client.force_authenticate(self.users[0])
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class UserLookupAPIViewTestCase(APITestCase):
+
+    def setUp(self):
+        staff = User.objects.create_user(
+            email="staff@test.com",
+            password="test1234test"
+        )
+        staff.is_staff = True
+        staff.save()
+        self.staff = staff
+        self.users = [
+            User.objects.create_user(
+                email="user{}@test.com".format(i),
+                name="User {}".format(i)
+            )
+            for i in range(3)
+        ]
+        self.url = api_reverse("api:users:lookup")
+        cache.delete_many([
+            get_user_lookup_cache_key(user.uuid) for user in self.users
+        ])
+
+    def lookup(self, uuids):
+        return self.client.post(
+            self.url, {"uuids": [str(value) for value in uuids]}, format="json"
+        )
+
+    def test_api_users_lookup_success(self):
+        """Test if users are returned in the requested order."""
+        self.client.force_authenticate(self.staff)
+        uuids = [self.users[2].uuid, self.users[0].uuid, uuid.uuid4()]
+        with self.assertNumQueries(1):
+            response = self.lookup(uuids)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [
+            {"name": "User 2", "uuid": str(self.users[2].uuid)},
+            {"name": "User 0", "uuid": str(self.users[0].uuid)},
+        ])
+
+    def test_api_users_lookup_cached(self):
+        """Test if users found before are served from the cache."""
+        self.client.force_authenticate(self.staff)
+        uuids = [user.uuid for user in self.users]
+        self.lookup(uuids)
+        with self.assertNumQueries(0):
+            response = self.lookup(uuids)
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_api_users_lookup_invalidated(self):
+        """Test if updated and removed users aren't served stale."""
+        self.client.force_authenticate(self.staff)
+        uuids = [user.uuid for user in self.users[:2]]
+        self.lookup(uuids)
+        self.users[0].name = "Renamed User"
+        self.users[0].save()
+        self.users[1].delete()
+        response = self.lookup(uuids)
+        self.assertEqual(response.data["results"], [
+            {"name": "Renamed User", "uuid": str(self.users[0].uuid)},
+        ])
+
+    def test_api_users_lookup_too_many_fail(self):
+        self.client.force_authenticate(self.staff)
+        uuids = [uuid.uuid4() for i in range(101)]
+        response = self.lookup(uuids)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_api_users_lookup_invalid_uuid_fail(self):
+        self.client.force_authenticate(self.staff)
+        response = self.lookup(["not-a-uuid"])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_api_users_lookup_not_staff_fail(self):
+        """Test if regular users can't look up users."""
+        self.client.force_authenticate(self.users[0])
+        response = self.lookup([self.users[1].uuid])
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
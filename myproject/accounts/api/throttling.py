@@ -0,0 +1,197 @@
+"""
+Sliding window throttles for the anonymous authentication endpoints.
+
+Every window is a sorted set of request timestamps in Redis, updated by a
+single Lua script, so concurrent workers can't race past the limit and a
+check costs one round trip. Views opt in with a `throttle_scope`, the rate
+of each throttle is looked up as "<throttle_scope>_<ident_type>" in
+DEFAULT_THROTTLE_RATES; scopes without a rate aren't throttled.
+"""
+import hashlib
+import logging
+import time
+import uuid
+
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+from core import metrics
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "accounts:throttle:"
+REJECTED_KEY = KEY_PREFIX + "rejected"
+
+# KEYS: window, rejected counters
+# ARGV: now (ms), window (ms), limit, member, scope
+# Returns {allowed, milliseconds until the oldest request leaves the window}
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    redis.call('HINCRBY', KEYS[2], ARGV[5], 1)
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    if oldest[2] then
+        return {0, tonumber(oldest[2]) + window - now}
+    end
+    return {0, window}
+end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('PEXPIRE', KEYS[1], window)
+return {1, 0}
+"""
+
+_script = None
+
+
+def get_script(client):
+    global _script
+    if _script is None:
+        _script = client.register_script(SLIDING_WINDOW_SCRIPT)
+    return _script
+
+
+def get_rejected_counts():
+    """Rejected requests per throttle scope, since the last reset."""
+    client = get_redis_connection()
+    return {
+        scope.decode(): int(count)
+        for scope, count in client.hgetall(REJECTED_KEY).items()
+    }
+
+
+def get_client_address(request):
+    """
+    The client address of `request`: the X-Forwarded-For entry added by the
+    outermost of NUM_PROXIES trusted proxies, or REMOTE_ADDR. Unlike
+    rest_framework, an unset NUM_PROXIES doesn't trust the header, since
+    clients control it.
+    """
+    if api_settings.NUM_PROXIES is None:
+        return request.META.get('REMOTE_ADDR')
+    return BaseThrottle().get_ident(request)
+
+
+def reset_throttles():
+    """Drops all throttle windows and counters, e.g. between tests."""
+    client = get_redis_connection()
+    keys = list(client.scan_iter(match=KEY_PREFIX + "*"))
+    if keys:
+        client.delete(*keys)
+
+
+class RedisSlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Base class of the throttles. Subclasses set `ident_type` and implement
+    `get_ident_value`. Redis errors let the request pass (fail open), an
+    outage of the cache shouldn't lock everybody out.
+    """
+    scope_attr = 'throttle_scope'
+    ident_type = None
+    cache_format = KEY_PREFIX + '%(scope)s:%(ident)s'
+
+    def __init__(self):
+        # The rate depends on the view's scope, see allow_request.
+        self.wait_seconds = None
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_ident_value(self, request):
+        raise NotImplementedError('.get_ident_value() must be overridden')
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_value(request)
+        if not ident:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def allow_request(self, request, view):
+        view_scope = getattr(view, self.scope_attr, None)
+        if not view_scope:
+            return True
+        self.scope = '{}_{}'.format(view_scope, self.ident_type)
+        self.rate = self.get_rate()
+        if not self.rate:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        now = int(time.time() * 1000)
+        try:
+            client = get_redis_connection()
+            allowed, wait = get_script(client)(
+                keys=[key, REJECTED_KEY],
+                args=[
+                    now,
+                    self.duration * 1000,
+                    self.num_requests,
+                    '{}-{}'.format(now, uuid.uuid4().hex),
+                    self.scope,
+                ],
+                client=client,
+            )
+        except RedisError:
+            logger.warning("Throttle %s unavailable, request allowed.",
+                           self.scope, exc_info=True)
+            return True
+
+        if allowed:
+            return True
+        self.wait_seconds = int(wait) / 1000
+        current = metrics.get_current()
+        if current is not None:
+            current.increment("throttled")
+        return False
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPThrottle(RedisSlidingWindowThrottle):
+    """
+    Throttles by the client address, see get_client_address(). A spoofable
+    address would give clients a fresh window per request.
+    """
+    ident_type = 'ip'
+
+    def get_ident_value(self, request):
+        return get_client_address(request)
+
+
+class EmailThrottle(RedisSlidingWindowThrottle):
+    """
+    Throttles by the posted e-mail address, which catches credential
+    stuffing spread across many IPs. The address is hashed, so it doesn't
+    end up in plain text in Redis.
+    """
+    ident_type = 'email'
+
+    def get_ident_value(self, request):
+        data = request.data
+        email = data.get('email') if hasattr(data, 'get') else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return hashlib.sha1(email.strip().lower().encode()).hexdigest()
+
+
+class ThrottleFirstMixin(object):
+    """
+    Checks the throttles before authenticating the request instead of after
+    it. Otherwise e.g. a Basic auth header would still be hashed on every
+    rejected request.
+    """
+
+    def perform_authentication(self, request):
+        super(ThrottleFirstMixin, self).check_throttles(request)
+        super(ThrottleFirstMixin, self).perform_authentication(request)
+
+    def check_throttles(self, request):
+        # Already checked in perform_authentication.
+        pass
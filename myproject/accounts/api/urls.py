@@ -1,6 +1,5 @@
 from django.conf.urls import url
 from rest_auth import views as rest_auth_views
-from rest_auth.registration import views as rest_auth_registration_views
 
 from . import views
 
@@ -8,17 +7,17 @@ urlpatterns = [
     # URLs that do not require a session or valid token
     url(
         regex=r'^login/$',
-        view=rest_auth_views.LoginView.as_view(),
+        view=views.LoginView.as_view(),
         name='login'
     ),
     url(
         regex=r'^password/reset/$',
-        view=rest_auth_views.PasswordResetView.as_view(),
+        view=views.PasswordResetView.as_view(),
         name='password_reset'
     ),
     url(
         regex=r'^registration/$',
-        view=rest_auth_registration_views.RegisterView.as_view(),
+        view=views.RegisterView.as_view(),
         name='register'
     ),
     url(
@@ -39,7 +38,7 @@ urlpatterns = [
     ),
     url(
         regex=r'^user/$',
-        view=rest_auth_views.UserDetailsView.as_view(),
+        view=views.UserDetailsView.as_view(),
         name='user_details'
     ),
     url(
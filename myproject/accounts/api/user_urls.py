@@ -0,0 +1,22 @@
+from django.conf.urls import url
+
+from . import views
+
+urlpatterns = [
+    # URLs that require a staff member.
+    url(
+        regex=r'^export\.(?P<export_format>csv|jsonl)$',
+        view=views.UserExportView.as_view(),
+        name='export'
+    ),
+    url(
+        regex=r'^changes/$',
+        view=views.UserChangesView.as_view(),
+        name='changes'
+    ),
+    url(
+        regex=r'^lookup/$',
+        view=views.UserLookupView.as_view(),
+        name='lookup'
+    ),
+]
@@ -0,0 +1,17 @@
+from ..tokens import is_expired
+
+
+def create_token(token_model, user, serializer):
+    """
+    rest_auth's default_create_token, but hands the already loaded user to
+    the token, so serializing the token doesn't fetch the user again, and
+    replaces an expired token with a new one.
+    """
+    token, created = token_model.objects.select_related(
+        'activity'
+    ).get_or_create(user=user)
+    if not created and is_expired(token):
+        token.delete()
+        token, created = token_model.objects.get_or_create(user=user)
+    token.user = user
+    return token
@@ -1,6 +1,39 @@
-from allauth.socialaccount.providers.facebook.views import \
-    FacebookOAuth2Adapter
+import hashlib
+from calendar import timegm
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import (get_conditional_response, patch_cache_control,
+                                patch_vary_headers)
+from django.utils.http import http_date
+from rest_auth import views as rest_auth_views
+from rest_auth.registration import views as rest_auth_registration_views
 from rest_auth.registration.views import SocialConnectView, SocialLoginView
+from rest_framework.generics import GenericAPIView, ListAPIView
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..exports import CONTENT_TYPES, export_lines
+from .facebook import FacebookOAuth2Adapter
+from .lookup import lookup_users
+from .pagination import ModifiedKeysetPagination
+from .serializers import UserChangeSerializer, UserLookupSerializer
+from .throttling import EmailThrottle, IPThrottle, ThrottleFirstMixin
+
+User = get_user_model()
+
+
+def get_user_validators(user):
+    """The ETag and Last-Modified timestamp of the user's details."""
+    etag = '"{}"'.format(hashlib.md5("{}:{}".format(
+        user.uuid, user.modified.isoformat()
+    ).encode()).hexdigest())
+    return etag, timegm(user.modified.utctimetuple())
 
 
 class FacebookLogin(SocialLoginView):
@@ -9,3 +42,160 @@ class FacebookLogin(SocialLoginView):
 
 class FacebookConnect(SocialConnectView):
     adapter_class = FacebookOAuth2Adapter
+
+
+class LoginView(ThrottleFirstMixin, rest_auth_views.LoginView):
+    throttle_classes = (IPThrottle, EmailThrottle)
+    throttle_scope = 'login'
+
+
+class RegisterView(ThrottleFirstMixin,
+                   rest_auth_registration_views.RegisterView):
+    throttle_classes = (IPThrottle, EmailThrottle)
+    throttle_scope = 'register'
+
+
+class PasswordResetView(ThrottleFirstMixin,
+                        rest_auth_views.PasswordResetView):
+    throttle_classes = (IPThrottle, EmailThrottle)
+    throttle_scope = 'password_reset'
+
+
+class UserDetailsView(rest_auth_views.UserDetailsView):
+    """
+    UserDetailsView with conditional requests, validated by the user's
+    `modified` timestamp:
+
+    - GET/HEAD answer If-None-Match / If-Modified-Since with 304.
+    - PUT/PATCH honor If-Match / If-Unmodified-Since and answer 412 if the
+      user changed in the meantime, to prevent lost updates. The row is
+      re-read with SELECT ... FOR UPDATE before the preconditions are
+      evaluated, so concurrent updates can't both pass them, and the update
+      doesn't write back a stale cached user.
+
+    With token authentication the user comes from the token cache, so a 304
+    doesn't need a single query.
+    """
+    locked_user = None
+
+    def get_object(self):
+        if self.locked_user is not None:
+            return self.locked_user
+        return super().get_object()
+
+    def get_validators(self):
+        return get_user_validators(self.get_object())
+
+    def set_validators(self, response):
+        # A 304 has to carry the validators a 200 would have (RFC 7232,
+        # section 4.1).
+        if 200 <= response.status_code < 300 or response.status_code == 304:
+            etag, last_modified = self.get_validators()
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ('Authorization',))
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        response = get_conditional_response(request, etag, last_modified)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        return self.set_validators(response)
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic(savepoint=False):
+            self.locked_user = User.objects.select_for_update().get(
+                pk=request.user.pk
+            )
+            etag, last_modified = self.get_validators()
+            response = get_conditional_response(request, etag, last_modified)
+            if response is None:
+                response = super().update(request, *args, **kwargs)
+        return self.set_validators(response)
+
+
+class UserExportView(APIView):
+    """
+    Streams all users as CSV or JSONL to staff members, with constant
+    memory regardless of the number of users.
+    """
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, export_format, *args, **kwargs):
+        response = StreamingHttpResponse(
+            export_lines(export_format),
+            content_type=CONTENT_TYPES[export_format]
+        )
+        response['Content-Disposition'] = \
+            'attachment; filename="users.{}"'.format(export_format)
+        return response
+
+
+def get_oldest_transaction_start(using=DEFAULT_DB_ALIAS):
+    """
+    When the oldest transaction open on the database (other than our own)
+    started, or None.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT min(xact_start) FROM pg_stat_activity "
+            "WHERE datname = current_database() "
+            "AND pid <> pg_backend_pid() AND xact_start IS NOT NULL"
+        )
+        return cursor.fetchone()[0]
+
+
+class UserChangesView(ListAPIView):
+    """
+    Lists the users changed since the given cursor, oldest change first,
+    for staff services mirroring users into other stores. Soft-deleted
+    users are included as tombstones (until they are archived).
+
+    A transaction can set `modified` long before it commits (e.g. batches
+    of import_users or archive_removed_users), so rows modified after the
+    oldest open transaction started are held back until it ends, or they
+    could slip behind a cursor. ACCOUNTS_USER_CHANGES_SETTLE_TIME on top
+    covers clock skew between the app servers and the database. A
+    transaction left open (idle in transaction) holds back the whole feed.
+
+    Reads go to the primary, rows still on their way to a replica would be
+    skipped as well.
+    """
+    permission_classes = (IsAdminUser,)
+    serializer_class = UserChangeSerializer
+    pagination_class = ModifiedKeysetPagination
+
+    def get_cutoff(self):
+        cutoff = timezone.now()
+        oldest = get_oldest_transaction_start()
+        if oldest is not None:
+            cutoff = min(cutoff, oldest)
+        return cutoff - timedelta(
+            seconds=settings.ACCOUNTS_USER_CHANGES_SETTLE_TIME
+        )
+
+    def get_queryset(self):
+        return User.objects.using(DEFAULT_DB_ALIAS).filter(
+            modified__lt=self.get_cutoff()
+        )
+
+
+class UserLookupView(GenericAPIView):
+    """
+    Resolves a batch of user uuids to their details in one request.
+
+    Accepts the following POST parameters: uuids (a list of up to
+    ACCOUNTS_USER_LOOKUP_MAX_UUIDS uuids)
+    Returns the found users in the requested order.
+    """
+    permission_classes = (IsAdminUser,)
+    serializer_class = UserLookupSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response({
+            "results": lookup_users(serializer.validated_data["uuids"])
+        })
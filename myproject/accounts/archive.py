@@ -0,0 +1,74 @@
+"""
+Archival of long soft-deleted users, see manage.py archive_removed_users.
+"""
+from collections import defaultdict
+
+from allauth.account.models import EmailAddress
+from allauth.socialaccount.models import SocialAccount
+from django.contrib.admin.models import LogEntry
+from django.core import serializers
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+from .models import ArchivedUser, User
+
+
+def archivable_users(cutoff):
+    """Users removed before `cutoff`."""
+    return User.objects.filter(is_removed=True, removed__lt=cutoff)
+
+
+def serialize_by_user(queryset):
+    rows = defaultdict(list)
+    for obj, row in zip(queryset, serializers.serialize("python", queryset)):
+        rows[obj.user_id].append(row)
+    return rows
+
+
+def archive_batch(cutoff, batch_size):
+    """
+    Copies up to `batch_size` archivable users and their related rows into
+    ArchivedUser and deletes them, in one short transaction. That includes
+    the admin log entries of their actions, which the delete cascades to
+    (entries about them aren't tied to them). Rows locked by other
+    transactions are skipped rather than waited for. Returns the number of
+    archived users.
+    """
+    with transaction.atomic():
+        users = list(
+            archivable_users(cutoff)
+            .select_for_update(skip_locked=True)
+            .order_by("pk")[:batch_size]
+        )
+        if not users:
+            return 0
+        ids = [user.pk for user in users]
+        related = {
+            "tokens": serialize_by_user(Token.objects.filter(user_id__in=ids)),
+            "email_addresses": serialize_by_user(
+                EmailAddress.objects.filter(user_id__in=ids)
+            ),
+            "social_accounts": serialize_by_user(
+                SocialAccount.objects.filter(user_id__in=ids)
+            ),
+            "admin_log_entries": serialize_by_user(
+                LogEntry.objects.filter(user_id__in=ids)
+            ),
+        }
+        archived = []
+        for user, row in zip(users, serializers.serialize("python", users)):
+            data = {"user": row}
+            for name, rows in related.items():
+                data[name] = rows[user.pk]
+            archived.append(ArchivedUser(
+                user_id=user.pk,
+                uuid=user.uuid,
+                email=user.email,
+                removed=user.removed,
+                data=data,
+            ))
+        ArchivedUser.objects.bulk_create(archived)
+        # Cascades to the tokens, e-mail addresses, social accounts and log
+        # entries.
+        User.objects.filter(pk__in=ids).delete()
+    return len(users)
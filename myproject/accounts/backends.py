@@ -0,0 +1,50 @@
+from allauth.account import auth_backends
+from allauth.account.models import EmailAddress
+from django.contrib.auth import backends, get_user_model
+
+from . import usercache
+
+User = get_user_model()
+
+
+class ModelBackend(backends.ModelBackend):
+    """
+    Django's ModelBackend, which also rejects soft-deleted users and loads
+    the users of authenticated sessions through accounts.usercache.
+    """
+
+    def get_user(self, user_id):
+        user = usercache.get_user(user_id)
+        if user is not None and self.user_can_authenticate(user):
+            return user
+        return None
+
+    def user_can_authenticate(self, user):
+        return (
+            super().user_can_authenticate(user) and
+            not getattr(user, "is_removed", False)
+        )
+
+
+class AuthenticationBackend(ModelBackend, auth_backends.AuthenticationBackend):
+    """
+    allauth's e-mail login, looking only at users which aren't soft-deleted
+    so the lookups can use the partial indexes on accounts_user.
+    """
+
+    def _authenticate_by_email(self, **credentials):
+        email = credentials.get("email", credentials.get("username"))
+        if not email:
+            return None
+        users = list(User.objects.not_removed().filter(email__iexact=email))
+        for address in (
+            EmailAddress.objects
+            .filter(email__iexact=email, user__is_removed=False)
+            .select_related("user")
+        ):
+            if address.user not in users:
+                users.append(address.user)
+        for user in users:
+            if self._check_password(user, credentials["password"]):
+                return user
+        return None
@@ -0,0 +1,397 @@
+"""
+Benchmark suites run by `manage.py benchmark`.
+
+A suite is a function taking the parsed command options and returning a
+dict of results (usually one core.benchmark.summarize() dict per
+scenario). Suites that need data run against a freshly created and seeded
+test database.
+"""
+import os
+import threading
+from collections import OrderedDict
+from time import perf_counter
+
+import requests
+from allauth.account.models import EmailAddress
+from allauth.socialaccount.models import SocialApp, SocialToken
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.sites.models import Site
+from django.db import connections
+from django.db.utils import load_backend
+from django.test.utils import override_settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.reverse import reverse as api_reverse
+from rest_framework.test import APIClient
+
+from core.benchmark import measure
+from core.db import pool
+from core.renderers import ORJSONRenderer
+
+from .api import facebook, serializers
+from .api.throttling import reset_throttles
+from .graphstub import GraphStub
+from .hashers import HashingPool
+
+User = get_user_model()
+
+SUITES = OrderedDict()
+
+PASSWORD = "test1234test"
+NEW_PASSWORD = "thisisanewpassword"
+
+
+def register_suite(name, needs_database=False):
+    def decorator(func):
+        func.needs_database = needs_database
+        SUITES[name] = func
+        return func
+    return decorator
+
+
+def seed_users(count):
+    """Creates `count` verified users with tokens, hashing only once."""
+    User.objects.all().delete()
+    Site.objects.update_or_create(
+        pk=settings.SITE_ID,
+        defaults={"domain": "testserver", "name": "testserver"}
+    )
+    password = make_password(PASSWORD)
+    users = User.objects.bulk_create(
+        User(
+            email="benchmark{}@test.com".format(i),
+            name="Benchmark User {}".format(i),
+            password=password,
+        )
+        for i in range(count)
+    )
+    EmailAddress.objects.bulk_create(
+        EmailAddress(user=user, email=user.email, verified=True, primary=True)
+        for user in users
+    )
+    Token.objects.bulk_create(
+        Token(key=Token().generate_key(), user=user) for user in users
+    )
+    return list(User.objects.filter(email__startswith="benchmark")
+                .select_related("auth_token").order_by("pk"))
+
+
+def _ok(response):
+    return 200 <= response.status_code < 300
+
+
+@register_suite("endpoints", needs_database=True)
+def endpoints(options):
+    """Latency and throughput of the accounts API endpoints."""
+    users = seed_users(options["users"])
+    client = APIClient()
+
+    def user_for(i):
+        return users[i % len(users)]
+
+    def authorized(user):
+        client.credentials(HTTP_AUTHORIZATION="Token " + user.auth_token.key)
+        return user
+
+    def identity(i):
+        return i
+
+    def address(i):
+        # One client address per request, so the IP throttles don't kick in.
+        return "10.{}.{}.{}".format(i // 65536 % 256, i // 256 % 256, i % 256)
+
+    def login(i):
+        user = user_for(i)
+        return _ok(client.post(
+            api_reverse("api:auth:login"),
+            {"email": user.email, "password": PASSWORD},
+            REMOTE_ADDR=address(i)
+        ))
+
+    def register(i):
+        return _ok(client.post(api_reverse("api:auth:register"), {
+            "email": "registered{}@test.com".format(i),
+            "password1": PASSWORD,
+            "password2": PASSWORD,
+        }, REMOTE_ADDR=address(i)))
+
+    def user_details_get(user):
+        return _ok(client.get(api_reverse("api:auth:user_details")))
+
+    def user_details_put(user):
+        return _ok(client.put(
+            api_reverse("api:auth:user_details"), {"name": "Renamed User"}
+        ))
+
+    passwords = {}
+
+    def password_change(user):
+        old = passwords.get(user.pk, PASSWORD)
+        new = NEW_PASSWORD if old == PASSWORD else PASSWORD
+        passwords[user.pk] = new
+        return _ok(client.post(api_reverse("api:auth:password_change"), {
+            "old_password": old,
+            "new_password1": new,
+            "new_password2": new,
+        }))
+
+    def fresh_token(i):
+        user = user_for(i)
+        Token.objects.filter(user=user).delete()
+        user.auth_token = Token.objects.create(user=user)
+        return authorized(user)
+
+    def logout(user):
+        return _ok(client.post(api_reverse("api:auth:logout")))
+
+    def existing_token(i):
+        return authorized(user_for(i))
+
+    scenarios = OrderedDict([
+        ("login", (login, identity)),
+        ("registration", (register, identity)),
+        ("user_details_get", (user_details_get, existing_token)),
+        ("user_details_put", (user_details_put, existing_token)),
+        ("password_change", (password_change, existing_token)),
+        ("logout", (logout, fresh_token)),
+    ])
+
+    results = OrderedDict()
+    for name, (func, setup) in scenarios.items():
+        if options["scenario"] and name not in options["scenario"]:
+            continue
+        client.credentials()
+        reset_throttles()
+        results[name] = measure(
+            func, options["iterations"], options["warmup"], setup=setup
+        )
+    return results
+
+
+def _concurrent_throughput(func, total, workers):
+    """Runs func `total` times from `workers` threads, returns calls/s."""
+    per_thread = max(total // workers, 1)
+    threads = [
+        threading.Thread(
+            target=lambda: [func() for _ in range(per_thread)]
+        )
+        for _ in range(workers)
+    ]
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return per_thread * workers / (perf_counter() - start)
+
+
+@register_suite("hashers")
+def password_hashers(options):
+    """
+    Password verifications (= logins) per second and per core, inline on
+    the calling thread and through the bounded hashing pool.
+    """
+    cores = os.cpu_count() or 1
+    workers = settings.ACCOUNTS_PASSWORD_HASHING_WORKERS or cores
+    hasher_paths = options["scenario"] or [
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        "accounts.hashers.TunableArgon2PasswordHasher",
+    ]
+
+    results = OrderedDict()
+    for path in hasher_paths:
+        hasher = import_string(path)()
+        encoded = hasher.encode(PASSWORD, hasher.salt())
+
+        def verify(argument=None):
+            return hasher.verify(PASSWORD, encoded)
+
+        inline = measure(verify, options["iterations"], options["warmup"])
+
+        hashing_pool = HashingPool(workers, queue_size=workers)
+        try:
+            pooled = _concurrent_throughput(
+                lambda: hashing_pool.run(verify),
+                options["iterations"], workers
+            )
+        finally:
+            hashing_pool.shutdown()
+
+        results[hasher.algorithm] = OrderedDict([
+            ("hasher", path),
+            ("inline", inline),
+            ("inline_logins_per_s_per_core", inline["throughput_per_s"]),
+            ("pool_workers", workers),
+            ("pooled_logins_per_s", round(pooled, 2)),
+            ("pooled_logins_per_s_per_core",
+                round(pooled / min(workers, cores), 2)),
+        ])
+    return results
+
+
+@register_suite("serializers")
+def serializer_paths(options):
+    """
+    Serialization of a token with its nested user (the login response) by
+    the regular DRF serializers and their precomputed counterparts.
+    """
+    user = User(name="Benchmark User", email="benchmark@test.com")
+    token = Token(key=Token().generate_key(), user=user)
+    pairs = OrderedDict([
+        ("token", (serializers.TokenSerializer,
+                   serializers.FastTokenSerializer, token)),
+        ("user_details", (serializers.UserDetailSerializer,
+                          serializers.FastUserDetailSerializer, user)),
+    ])
+
+    results = OrderedDict()
+    for name, (regular, fast, instance) in pairs.items():
+        if options["scenario"] and name not in options["scenario"]:
+            continue
+        results[name] = OrderedDict()
+        for label, serializer_class in (("regular", regular), ("fast", fast)):
+            results[name][label] = measure(
+                lambda i: serializer_class(instance).data,
+                options["iterations"], options["warmup"]
+            )
+        regular_rate = results[name]["regular"]["throughput_per_s"]
+        fast_rate = results[name]["fast"]["throughput_per_s"]
+        results[name]["speedup"] = (
+            round(fast_rate / regular_rate, 2)
+            if fast_rate and regular_rate else None
+        )
+    return results
+
+
+@register_suite("renderers")
+def renderer_paths(options):
+    """
+    Serialization cost per response of the accounts endpoints: rendering
+    their typical payloads with DRF's JSONRenderer and the orjson one.
+    """
+    now = timezone.now()
+    users = [
+        User(name="Benchmark User {}".format(i),
+             email="benchmark{}@test.com".format(i), modified=now)
+        for i in range(500)
+    ]
+    token = Token(key=Token().generate_key(), user=users[0])
+    payloads = OrderedDict([
+        ("login", serializers.FastTokenSerializer(token).data),
+        ("user_details", serializers.FastUserDetailSerializer(users[0]).data),
+        ("users_lookup", {"results": serializers.FastUserDetailSerializer(
+            users[:100], many=True).data}),
+        ("users_changes", {"cursor": "x" * 40, "has_more": True,
+                           "results": serializers.UserChangeSerializer(
+                               users, many=True).data}),
+    ])
+
+    results = OrderedDict()
+    for name, payload in payloads.items():
+        if options["scenario"] and name not in options["scenario"]:
+            continue
+        results[name] = OrderedDict()
+        for label, renderer in (("stdlib", JSONRenderer()),
+                                ("orjson", ORJSONRenderer())):
+            results[name][label] = measure(
+                lambda i: renderer.render(payload),
+                options["iterations"], options["warmup"]
+            )
+        results[name]["bytes"] = len(ORJSONRenderer().render(payload))
+    return results
+
+
+@register_suite("dbconnect", needs_database=True)
+def database_connections(options):
+    """
+    Getting a connection, running one query and closing it again, as every
+    request does with CONN_MAX_AGE = 0: with a fresh psycopg2 connection
+    (TCP and auth handshake included) and with one from the pool.
+    """
+    settings_dict = connections["default"].settings_dict
+    engines = OrderedDict([
+        ("direct", "django.db.backends.postgresql"),
+        ("pooled", "core.db.backends.postgresql_pooled"),
+    ])
+
+    results = OrderedDict()
+    try:
+        for name, engine in engines.items():
+            if options["scenario"] and name not in options["scenario"]:
+                continue
+            wrapper = load_backend(engine).DatabaseWrapper(
+                dict(settings_dict, ENGINE=engine), "benchmark_" + name
+            )
+
+            def query(i):
+                with wrapper.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                wrapper.close()
+
+            results[name] = measure(
+                query, options["iterations"], options["warmup"]
+            )
+        results["pools"] = pool.get_stats()
+    finally:
+        # Idle pooled connections would keep the test database from being
+        # dropped.
+        pool.close_pools()
+    return results
+
+
+@register_suite("facebook")
+def facebook_profile(options):
+    """
+    Fetching the /me profile of the Facebook login from the Graph API stub
+    with 20ms latency: with a new connection per request (as allauth's
+    adapter does), over the pooled keep-alive session and from the profile
+    cache. Every request uses another access token, except for "cached".
+    """
+    app = SocialApp(provider="facebook", secret="benchmark")
+    fields = ["id", "email", "name"]
+
+    def unpooled(i):
+        token = SocialToken(token="benchmark-unpooled-{}".format(i))
+        response = requests.get(
+            facebook.get_graph_url() + "/me",
+            params={"fields": ",".join(fields), "access_token": token.token},
+            timeout=settings.ACCOUNTS_FACEBOOK_TIMEOUT,
+        )
+        return response.ok
+
+    def pooled(i):
+        token = SocialToken(token="benchmark-pooled-{}".format(i))
+        facebook.fetch_profile(app, token, fields)
+
+    def cached(i):
+        facebook.fetch_profile(app, SocialToken(token="benchmark"), fields)
+
+    scenarios = OrderedDict([
+        ("unpooled", unpooled),
+        ("pooled", pooled),
+        ("cached", cached),
+    ])
+
+    results = OrderedDict()
+    with GraphStub(latency=0.02) as stub, \
+            override_settings(ACCOUNTS_FACEBOOK_GRAPH_URL=stub.url):
+        try:
+            for name, func in scenarios.items():
+                if options["scenario"] and name not in options["scenario"]:
+                    continue
+                connections_before = stub.connections
+                requests_before = stub.requests
+                results[name] = measure(
+                    func, options["iterations"], options["warmup"]
+                )
+                results[name]["connections"] = (
+                    stub.connections - connections_before
+                )
+                results[name]["requests"] = stub.requests - requests_before
+        finally:
+            facebook.close_session()
+    return results
@@ -0,0 +1,103 @@
+"""
+Removal of expired e-mail confirmations and of accounts which never
+verified their e-mail address, see manage.py cleanup_unverified.
+"""
+from allauth.account.models import EmailAddress, EmailConfirmation
+from allauth.socialaccount.models import SocialAccount
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from .api.authentication import invalidate_cached_tokens
+from .api.lookup import invalidate_user_lookups
+from .models import User
+from .usercache import invalidate_users
+
+
+def delete_expired_confirmations(batch_size):
+    """
+    Deletes up to `batch_size` of the oldest confirmations which expired
+    after ACCOUNT_EMAIL_CONFIRMATION_EXPIRE_DAYS and returns how many were
+    deleted. Uses the index on `sent` from migration 0009.
+    """
+    with transaction.atomic():
+        pks = list(
+            EmailConfirmation.objects.all_expired()
+            .order_by("sent")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if pks:
+            EmailConfirmation.objects.filter(pk__in=pks).delete()
+    return len(pks)
+
+
+def unverified_users(cutoff):
+    """
+    Users which signed up before `cutoff` with an e-mail address they never
+    verified and never logged in. Staff and users signed up through a
+    social account are left alone.
+    """
+    return (
+        User.objects.not_removed()
+        .filter(
+            date_joined__lt=cutoff,
+            last_login__isnull=True,
+            is_staff=False,
+            is_superuser=False,
+        )
+        .with_email_verified()
+        .annotate(
+            has_email=Exists(EmailAddress.objects.filter(user=OuterRef("pk"))),
+            has_social_account=Exists(
+                SocialAccount.objects.filter(user=OuterRef("pk"))
+            ),
+        )
+        .filter(email_verified=False, has_email=True, has_social_account=False)
+    )
+
+
+def remove_unverified_batch(cutoff, batch_size, after=0, delete=False):
+    """
+    Removes up to `batch_size` unverified users with a primary key above
+    `after`, walking the primary key index instead of rescanning the users
+    already looked at. Soft-deletes them (archived later by manage.py
+    archive_removed_users) unless `delete` is given.
+
+    Returns the number of removed users and the last primary key seen, to
+    pass as `after` to the next batch.
+    """
+    with transaction.atomic():
+        users = list(
+            unverified_users(cutoff)
+            .filter(pk__gt=after)
+            .select_for_update(skip_locked=True)
+            .order_by("pk")
+            .values_list("pk", "uuid")[:batch_size]
+        )
+        if not users:
+            return 0, after
+        pks = [pk for pk, uuid in users]
+        if delete:
+            # Cascades to the tokens, e-mail addresses and confirmations,
+            # the post_delete receivers invalidate the caches.
+            User.objects.filter(pk__in=pks).delete()
+        else:
+            keys = list(
+                Token.objects.filter(user_id__in=pks)
+                .values_list("key", flat=True)
+            )
+            now = timezone.now()
+            User.objects.filter(pk__in=pks).update(
+                is_removed=True, removed=now, modified=now
+            )
+            EmailConfirmation.objects.filter(
+                email_address__user_id__in=pks
+            ).delete()
+
+    if not delete:
+        # update() doesn't send post_save.
+        invalidate_cached_tokens(*keys)
+        invalidate_user_lookups(*[uuid for pk, uuid in users])
+        invalidate_users(*pks)
+    return len(users), pks[-1]
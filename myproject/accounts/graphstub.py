@@ -0,0 +1,107 @@
+"""
+A local stand-in for the parts of the Facebook Graph API the social login
+uses, for tests and benchmarks:
+
+    with GraphStub(latency=0.05) as stub:
+        with override_settings(ACCOUNTS_FACEBOOK_GRAPH_URL=stub.url):
+            ...
+
+Any access token is accepted and maps to its own user, except "invalid"
+(answered with 400) and "error" (answered with 500). `connections` counts
+the TCP connections the server accepted.
+"""
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlsplit
+
+
+class GraphStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        parts = urlsplit(self.path)
+        params = parse_qs(parts.query)
+        token = params.get("access_token", [""])[0]
+        with self.server.lock:
+            self.server.requests += 1
+
+        if not parts.path.endswith("/me"):
+            self.send_json(404, {"error": {"message": "Unknown path."}})
+        elif token == "error":
+            self.send_json(500, {"error": {"message": "Unexpected error."}})
+        elif not token or token == "invalid":
+            self.send_json(400, {"error": {
+                "message": "Invalid OAuth access token.",
+                "type": "OAuthException",
+                "code": 190,
+            }})
+        else:
+            uid = str(int(hashlib.sha1(token.encode()).hexdigest()[:12], 16))
+            self.send_json(200, {
+                "id": uid,
+                "email": "fb{}@test.com".format(uid),
+                "name": "Stub User",
+                "first_name": "Stub",
+                "last_name": "User",
+                "verified": True,
+            })
+
+
+class GraphStubServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class GraphStub:
+
+    def __init__(self, latency=0, host="127.0.0.1", port=0):
+        self.server = GraphStubServer((host, port), GraphStubHandler)
+        self.server.latency = latency
+        self.server.lock = threading.Lock()
+        self.server.connections = 0
+        self.server.requests = 0
+        self.url = "http://{}:{}".format(*self.server.server_address[:2])
+
+    @property
+    def connections(self):
+        return self.server.connections
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+    def start(self):
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,150 @@
+"""
+Password hashing for accounts.User.
+
+Hashing is CPU bound and dominates login and registration. Verification
+and hashing therefore run on a bounded, process wide thread pool, while
+anything touching the database, like the rehash-on-login setter, stays on
+the request thread. The request thread waits for the result, so the pool
+doesn't offload any work: it limits how many hashes run at once, so a
+burst of logins waits for a slot (or is rejected) instead of starving all
+other requests of CPU.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers as django_hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.translation import ugettext_lazy as _
+
+
+class TunableArgon2PasswordHasher(django_hashers.Argon2PasswordHasher):
+    """
+    Argon2 hasher whose costs are read from the ACCOUNTS_ARGON2_* settings.
+    Changing them makes must_update() true for existing hashes, so they get
+    rehashed transparently on the next successful login.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.ACCOUNTS_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ACCOUNTS_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ACCOUNTS_ARGON2_PARALLELISM
+
+
+class PasswordHashingUnavailable(Exception):
+    """
+    Raised when no hashing slot became free in time. The API answers it
+    with 503 (accounts.api.exceptions), as does
+    accounts.middleware.PasswordHashingMiddleware everywhere else, e.g. for
+    the admin and allauth's forms.
+    """
+
+    def __init__(self, message=None):
+        if message is None:
+            message = _('Too many concurrent logins, please try again later.')
+        super().__init__(message)
+
+
+class HashingPool:
+    """
+    Thread pool which accepts at most `workers + queue_size` jobs at once.
+    Callers wait up to `timeout` seconds for a free slot and get a
+    PasswordHashingUnavailable after that, instead of piling up. run()
+    blocks the caller until the job is done, the pool bounds concurrency
+    rather than freeing up the calling thread.
+    """
+
+    def __init__(self, workers, queue_size=0, timeout=None):
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='password-hashing'
+        )
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.timeout = timeout
+
+    def run(self, func, *args):
+        if not self.slots.acquire(timeout=self.timeout):
+            raise PasswordHashingUnavailable()
+        try:
+            future = self.executor.submit(func, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda future: self.slots.release())
+        return future.result()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Returns the process wide pool, or None if hashing runs inline."""
+    global _pool
+    if not settings.ACCOUNTS_PASSWORD_HASHING_WORKERS:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HashingPool(
+                    settings.ACCOUNTS_PASSWORD_HASHING_WORKERS,
+                    settings.ACCOUNTS_PASSWORD_HASHING_QUEUE_SIZE,
+                    settings.ACCOUNTS_PASSWORD_HASHING_TIMEOUT,
+                )
+    return _pool
+
+
+@receiver(setting_changed)
+def reset_pool(setting, **kwargs):
+    global _pool
+    if setting.startswith('ACCOUNTS_PASSWORD_HASHING_') and _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+def run_hashing(func, *args):
+    pool = get_pool()
+    if pool is None:
+        return func(*args)
+    return pool.run(func, *args)
+
+
+def make_password(raw_password):
+    if raw_password is None:
+        return django_hashers.make_password(None)
+    return run_hashing(django_hashers.make_password, raw_password)
+
+
+def check_password(raw_password, encoded, setter=None):
+    """
+    Same semantics as django.contrib.auth.hashers.check_password, but the
+    verification runs on the hashing pool. The setter (which saves the
+    upgraded hash) is called on the calling thread.
+    """
+    if raw_password is None or not django_hashers.is_password_usable(encoded):
+        return False
+
+    preferred = django_hashers.get_hasher('default')
+    hasher = django_hashers.identify_hasher(encoded)
+
+    hasher_changed = hasher.algorithm != preferred.algorithm
+    must_update = hasher_changed or preferred.must_update(encoded)
+    is_correct = run_hashing(hasher.verify, raw_password, encoded)
+
+    if not is_correct and not hasher_changed and must_update:
+        run_hashing(hasher.harden_runtime, raw_password, encoded)
+
+    if setter and is_correct and must_update:
+        setter(raw_password)
+    return is_correct
@@ -0,0 +1,55 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...archive import archivable_users, archive_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves users which were soft-deleted more than --days ago, together "
+        "with their tokens, e-mail addresses, social accounts and admin log "
+        "entries, into the archive table. Works in small transactions so no "
+        "long locks are held on the user table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=30,
+            help="Only archive users removed at least this many days ago."
+        )
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument(
+            "--sleep", type=float, default=0.5,
+            help="Seconds to pause between batches."
+        )
+        parser.add_argument(
+            "--max-batches", type=int,
+            help="Stop after this many batches."
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Only report how many users would be archived."
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        if options["dry_run"]:
+            self.stdout.write("{} user(s) would be archived.".format(
+                archivable_users(cutoff).count()
+            ))
+            return
+
+        total = batches = 0
+        while options["max_batches"] is None or \
+                batches < options["max_batches"]:
+            archived = archive_batch(cutoff, options["batch_size"])
+            if not archived:
+                break
+            total += archived
+            batches += 1
+            if archived == options["batch_size"]:
+                time.sleep(options["sleep"])
+        self.stdout.write("Archived {} user(s).".format(total))
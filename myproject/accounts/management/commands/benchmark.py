@@ -0,0 +1,90 @@
+import json
+from collections import OrderedDict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (setup_test_environment,
+                               teardown_test_environment)
+
+from core.benchmark import environment
+
+from ...benchmarks import SUITES
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs benchmark suites against a freshly created and seeded test "
+        "database and prints the results as JSON, so runs can be diffed "
+        "between commits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "suites", nargs="*", default=["endpoints"],
+            help="Suites to run: {}".format(", ".join(SUITES))
+        )
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument(
+            "--users", type=int, default=100,
+            help="Number of users to seed the database with."
+        )
+        parser.add_argument(
+            "--scenario", action="append", default=[],
+            help="Only run this scenario of a suite (may be repeated)."
+        )
+        parser.add_argument(
+            "--output", help="Write the JSON results to this file."
+        )
+        parser.add_argument(
+            "--keepdb", action="store_true",
+            help="Preserve the benchmark database between runs."
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options["suites"]) - set(SUITES)
+        if unknown:
+            raise CommandError(
+                "Unknown suite(s): {}".format(", ".join(sorted(unknown)))
+            )
+        suites = [SUITES[name] for name in options["suites"]]
+        needs_database = any(suite.needs_database for suite in suites)
+
+        results = OrderedDict()
+        setup_test_environment(debug=False)
+        try:
+            if needs_database:
+                old_name = connection.settings_dict["NAME"]
+                connection.creation.create_test_db(
+                    verbosity=0, autoclobber=True, serialize=False,
+                    keepdb=options["keepdb"]
+                )
+            try:
+                for name in options["suites"]:
+                    self.stderr.write("Running {} ...".format(name))
+                    results[name] = SUITES[name](options)
+            finally:
+                if needs_database:
+                    connection.creation.destroy_test_db(
+                        old_name, verbosity=0, keepdb=options["keepdb"]
+                    )
+        finally:
+            teardown_test_environment()
+
+        output = json.dumps(
+            OrderedDict([
+                ("environment", environment()),
+                ("options", {
+                    "iterations": options["iterations"],
+                    "warmup": options["warmup"],
+                    "users": options["users"],
+                }),
+                ("results", results),
+            ]),
+            indent=2
+        )
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,87 @@
+import time
+from datetime import timedelta
+
+from allauth.account.models import EmailConfirmation
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...cleanup import (
+    delete_expired_confirmations, remove_unverified_batch, unverified_users
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes expired e-mail confirmations and removes users which never "
+        "verified their e-mail address within --days. Users are soft-deleted "
+        "(and archived later by archive_removed_users) unless --delete is "
+        "given. Works in small batches, at most --max-rate rows per second."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=7,
+            help="Only remove users which signed up at least this many days "
+                 "ago."
+        )
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument(
+            "--max-rate", type=float, default=500,
+            help="Rows per second to process at most, 0 for no limit."
+        )
+        parser.add_argument(
+            "--delete", action="store_true",
+            help="Delete the users instead of soft-deleting them, which "
+                 "frees their e-mail addresses right away."
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Only report how many rows would be removed."
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        if options["dry_run"]:
+            self.stdout.write(
+                "{} confirmation(s) and {} user(s) would be removed.".format(
+                    EmailConfirmation.objects.all_expired().count(),
+                    unverified_users(cutoff).count(),
+                )
+            )
+            return
+
+        self.started = time.monotonic()
+        self.processed = 0
+
+        confirmations = 0
+        while True:
+            deleted = delete_expired_confirmations(options["batch_size"])
+            confirmations += deleted
+            self.throttle(deleted, options["max_rate"])
+            if deleted < options["batch_size"]:
+                break
+
+        users = last = 0
+        while True:
+            removed, last = remove_unverified_batch(
+                cutoff, options["batch_size"], after=last,
+                delete=options["delete"]
+            )
+            users += removed
+            self.throttle(removed, options["max_rate"])
+            if removed < options["batch_size"]:
+                break
+
+        self.stdout.write(
+            "Removed {} expired confirmation(s) and {} unverified "
+            "user(s).".format(confirmations, users)
+        )
+
+    def throttle(self, count, max_rate):
+        """Sleeps until the rows processed so far fit within `max_rate`."""
+        self.processed += count
+        if not max_rate:
+            return
+        ahead = self.processed / max_rate - (time.monotonic() - self.started)
+        if ahead > 0:
+            time.sleep(ahead)
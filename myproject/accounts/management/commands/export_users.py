@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from ...exports import CONTENT_TYPES, export_lines
+
+
+class Command(BaseCommand):
+    help = (
+        "Exports all users (uuid, name, email, date_joined, modified and "
+        "e-mail verification state) as CSV or JSONL, streaming the rows "
+        "through a server-side cursor."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format", choices=sorted(CONTENT_TYPES), default="csv"
+        )
+        parser.add_argument(
+            "--output", help="File to write to, defaults to stdout."
+        )
+
+    def handle(self, *args, **options):
+        lines = export_lines(options["format"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8",
+                      newline="") as f:
+                f.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
@@ -0,0 +1,219 @@
+import csv
+import io
+import json
+import sys
+from itertools import islice
+
+from allauth.account.models import EmailAddress
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Upper
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.authtoken.models import Token
+
+User = get_user_model()
+
+TRUE_VALUES = ("1", "true", "yes", "y", "t")
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports users from a CSV (with header) or JSONL file with the keys "
+        "email, name, password, verified and date_joined. Passwords must "
+        "already be hashed in Django's format (e.g. pbkdf2_sha256$...), an "
+        "empty password results in an unusable one. Users, their e-mail "
+        "addresses and tokens are created with bulk inserts per batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, - for stdin.")
+        parser.add_argument(
+            "--format", choices=("csv", "jsonl"),
+            help="Defaults to the file extension."
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--verified", action="store_true",
+            help="Mark e-mail addresses as verified if the row doesn't say."
+        )
+        parser.add_argument(
+            "--no-tokens", action="store_true",
+            help="Don't create API tokens for the imported users."
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Validate the input without writing anything."
+        )
+
+    def handle(self, *args, **options):
+        fmt = options["format"]
+        if fmt is None:
+            if options["path"].endswith(".csv"):
+                fmt = "csv"
+            elif options["path"].endswith((".jsonl", ".json")):
+                fmt = "jsonl"
+            else:
+                raise CommandError("Can't guess the format, pass --format.")
+
+        if options["path"] == "-":
+            stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+        else:
+            stream = open(options["path"], encoding="utf-8", newline="")
+
+        totals = {"imported": 0, "skipped": 0, "invalid": 0}
+        with stream:
+            rows = self.read_csv(stream) if fmt == "csv" \
+                else self.read_jsonl(stream)
+            while True:
+                chunk = list(islice(rows, options["batch_size"]))
+                if not chunk:
+                    break
+                counts = self.import_chunk(chunk, options)
+                for key, value in counts.items():
+                    totals[key] += value
+                if options["verbosity"] > 1:
+                    self.stdout.write(
+                        "Imported {imported}, skipped {skipped}, "
+                        "invalid {invalid}.".format(**totals)
+                    )
+
+        self.stdout.write(
+            "{}Imported {imported} user(s), skipped {skipped} existing, "
+            "{invalid} invalid.".format(
+                "[dry run] " if options["dry_run"] else "", **totals
+            )
+        )
+
+    def read_csv(self, stream):
+        for line, row in enumerate(csv.DictReader(stream), start=2):
+            yield line, row
+
+    def read_jsonl(self, stream):
+        for line, text in enumerate(stream, start=1):
+            text = text.strip()
+            if not text:
+                continue
+            try:
+                row = json.loads(text)
+            except ValueError as e:
+                yield line, {"_error": str(e)}
+            else:
+                if not isinstance(row, dict):
+                    row = {"_error": "Not a JSON object."}
+                yield line, row
+
+    def get_string(self, row, key):
+        value = row.get(key)
+        if value is None:
+            return ""
+        if not isinstance(value, str):
+            raise ValidationError("{} is not a string.".format(key))
+        return value
+
+    def clean_row(self, row, options):
+        """Returns a User and its verified flag, or raises ValidationError."""
+        if "_error" in row:
+            raise ValidationError(row["_error"])
+
+        email = User.objects.normalize_email(
+            self.get_string(row, "email").strip()
+        )
+        validate_email(email)
+
+        name = self.get_string(row, "name").strip()
+        if len(name) > 255:
+            raise ValidationError("Name is longer than 255 characters.")
+
+        password = self.get_string(row, "password") or make_password(None)
+        if not password.startswith("!"):
+            try:
+                identify_hasher(password)
+            except ValueError:
+                raise ValidationError("Password is not a known hash format.")
+
+        date_joined = timezone.now()
+        if row.get("date_joined"):
+            try:
+                # None if malformed, ValueError if out of range.
+                date_joined = parse_datetime(
+                    self.get_string(row, "date_joined")
+                )
+            except ValueError:
+                date_joined = None
+            if date_joined is None:
+                raise ValidationError("Invalid date_joined.")
+            if timezone.is_naive(date_joined):
+                date_joined = timezone.make_aware(date_joined)
+
+        verified = row.get("verified")
+        if verified in (None, ""):
+            verified = options["verified"]
+        elif not isinstance(verified, bool):
+            verified = str(verified).strip().lower() in TRUE_VALUES
+
+        user = User(
+            email=email,
+            name=name,
+            password=password,
+            date_joined=date_joined,
+        )
+        return user, verified
+
+    def import_chunk(self, chunk, options):
+        counts = {"imported": 0, "skipped": 0, "invalid": 0}
+
+        candidates = {}
+        for line, row in chunk:
+            try:
+                user, verified = self.clean_row(row, options)
+            except ValidationError as e:
+                self.stderr.write("Line {}: {}".format(line, "; ".join(e.messages)))
+                counts["invalid"] += 1
+                continue
+            key = user.email.upper()
+            if key in candidates:
+                counts["skipped"] += 1
+                continue
+            candidates[key] = (user, verified)
+
+        existing = set(
+            User.objects.annotate(email_upper=Upper("email"))
+            .filter(email_upper__in=candidates)
+            .values_list("email_upper", flat=True)
+        )
+        existing.update(
+            EmailAddress.objects.annotate(email_upper=Upper("email"))
+            .filter(email_upper__in=candidates)
+            .values_list("email_upper", flat=True)
+        )
+        for key in existing:
+            del candidates[key]
+        counts["skipped"] += len(existing)
+
+        if options["dry_run"] or not candidates:
+            counts["imported"] = len(candidates)
+            return counts
+
+        with transaction.atomic():
+            users = User.objects.bulk_create(
+                [user for user, verified in candidates.values()]
+            )
+            verified_flags = [verified for user, verified in candidates.values()]
+            EmailAddress.objects.bulk_create(
+                EmailAddress(
+                    user=user, email=user.email, verified=verified, primary=True
+                )
+                for user, verified in zip(users, verified_flags)
+            )
+            if not options["no_tokens"]:
+                Token.objects.bulk_create(
+                    Token(key=Token().generate_key(), user=user)
+                    for user in users
+                )
+        counts["imported"] = len(users)
+        return counts
@@ -0,0 +1,110 @@
+import asyncio
+import json
+from collections import OrderedDict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import environment
+from core.loadtest import build_request, run
+
+
+class Command(BaseCommand):
+    help = (
+        "Opens increasing numbers of concurrent keep-alive connections to "
+        "running deployments and reports the latencies, throughput and the "
+        "highest number of connections each sustained, as JSON. E.g. "
+        "`loadtest wsgi=http://127.0.0.1:8000/health/ "
+        "asgi=http://127.0.0.1:8001/health/` against gunicorn with "
+        "config.wsgi and daphne with config.asgi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "targets", nargs="+", metavar="name=url",
+            help="Deployments to compare."
+        )
+        parser.add_argument(
+            "--connections", type=int, nargs="+", default=[10, 100, 500, 1000],
+            help="Levels of concurrent connections to try, in order."
+        )
+        parser.add_argument(
+            "--duration", type=float, default=10,
+            help="Seconds to hold each level."
+        )
+        parser.add_argument(
+            "--timeout", type=float, default=5,
+            help="Seconds to wait for a connection or response."
+        )
+        parser.add_argument("--method", default="GET")
+        parser.add_argument(
+            "--header", action="append", default=[],
+            help='Request header, e.g. "Authorization: Token <key>" '
+                 '(may be repeated).'
+        )
+        parser.add_argument(
+            "--data", default="",
+            help="JSON request body, e.g. for the lookup endpoint."
+        )
+        parser.add_argument(
+            "--max-error-rate", type=float, default=0.01,
+            help="Share of failed requests a sustained level may have."
+        )
+        parser.add_argument(
+            "--output", help="Write the JSON results to this file."
+        )
+
+    def handle(self, *args, **options):
+        targets = OrderedDict()
+        for target in options["targets"]:
+            name, sep, url = target.partition("=")
+            if not sep or not url.startswith(("http://", "https://")):
+                raise CommandError("Expected name=url, got {}".format(target))
+            targets[name] = url
+
+        headers = list(options["header"])
+        body = options["data"].encode()
+        if body:
+            headers.append("Content-Type: application/json")
+
+        loop = asyncio.get_event_loop()
+        results = OrderedDict()
+        for name, url in targets.items():
+            request = build_request(url, options["method"], headers, body)
+            levels = []
+            sustained = 0
+            for connections in options["connections"]:
+                self.stderr.write(
+                    "{}: {} connection(s) ...".format(name, connections)
+                )
+                stats = loop.run_until_complete(run(
+                    url, request, connections, options["duration"],
+                    options["timeout"]
+                ))
+                levels.append(stats.as_dict(connections, options["duration"]))
+                if not stats.sustained(
+                        connections, options["max_error_rate"]):
+                    break
+                sustained = connections
+            results[name] = OrderedDict([
+                ("url", url),
+                ("max_sustained_connections", sustained),
+                ("levels", levels),
+            ])
+
+        output = json.dumps(
+            OrderedDict([
+                ("environment", environment()),
+                ("options", {
+                    "duration": options["duration"],
+                    "timeout": options["timeout"],
+                    "method": options["method"],
+                }),
+                ("results", results),
+            ]),
+            indent=2
+        )
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,207 @@
+import json
+import os
+import subprocess
+import sys
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter, so nothing is imported yet. Prints the
+# durations of the startup phases as JSON.
+SCRIPT = """
+import json
+from time import perf_counter
+
+start = perf_counter()
+import django
+django.setup()
+timings = {"setup": perf_counter() - start}
+
+start = perf_counter()
+from django.core.handlers.wsgi import WSGIHandler
+WSGIHandler()
+timings["wsgi_handler"] = perf_counter() - start
+
+if %(warmup)r:
+    from config.warmup import warm_up
+    for name, duration in warm_up().items():
+        timings["warmup." + name] = duration
+
+print(json.dumps(timings))
+"""
+
+# Prepended to SCRIPT where `-X importtime` isn't available (before Python
+# 3.7): times the execution of every module imported from then on and
+# writes the same report to stderr.
+IMPORT_TIMER = """
+import sys
+from time import perf_counter
+
+
+class TimedLoader:
+
+    def __init__(self, loader, name, stack):
+        self.loader = loader
+        self.name = name
+        self.stack = stack
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        self.stack.append(0)
+        start = perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            cumulative = perf_counter() - start
+            children = self.stack.pop()
+            if self.stack:
+                self.stack[-1] += cumulative
+            sys.stderr.write("import time: %9d | %10d | %s%s\\n" % (
+                (cumulative - children) * 1e6, cumulative * 1e6,
+                "  " * len(self.stack), self.name
+            ))
+
+
+class ImportTimer:
+
+    def __init__(self):
+        self.stack = []
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            if not hasattr(finder, "find_spec"):
+                # A legacy finder, leave the lookup to the import system.
+                return None
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if hasattr(spec.loader, "exec_module"):
+            spec.loader = TimedLoader(spec.loader, name, self.stack)
+        return spec
+
+
+sys.stderr.write("import time: self [us] | cumulative | imported package\\n")
+sys.meta_path.insert(0, ImportTimer())
+"""
+
+
+def parse_import_times(output):
+    """
+    Parses the `-X importtime` report into a list of (module, self,
+    cumulative) tuples, times in seconds.
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        try:
+            own, cumulative = int(fields[0]), int(fields[1])
+        except (IndexError, ValueError):
+            # The header line.
+            continue
+        modules.append((fields[2].strip(), own / 1e6, cumulative / 1e6))
+    return modules
+
+
+def by_package(modules):
+    totals = defaultdict(float)
+    for module, own, cumulative in modules:
+        totals[module.split(".")[0]] += own
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+class Command(BaseCommand):
+    help = (
+        "Starts the application in a fresh interpreter with "
+        "`python -X importtime` (or an equivalent import hook before "
+        "Python 3.7) and reports where the startup time goes: "
+        "django.setup(), the WSGI handler, each step of config.warmup and "
+        "the import time per package and module."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top", type=int, default=20,
+            help="Number of packages and modules to list."
+        )
+        parser.add_argument(
+            "--no-warmup", action="store_false", dest="warmup",
+            help="Only profile what the first request would import."
+        )
+        parser.add_argument(
+            "--import-timer", action="store_true",
+            help=(
+                "Time the imports in Python instead of with "
+                "`-X importtime`, which is what happens before Python 3.7."
+            )
+        )
+        parser.add_argument(
+            "--json", action="store_true",
+            help="Print the full report as JSON."
+        )
+
+    def handle(self, *args, **options):
+        script = SCRIPT % {"warmup": options["warmup"]}
+        if options["import_timer"] or sys.version_info < (3, 7):
+            command = [sys.executable, "-c", IMPORT_TIMER + script]
+        else:
+            command = [sys.executable, "-X", "importtime", "-c", script]
+
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        process = subprocess.run(
+            command,
+            cwd=str(settings.BASE_DIR.parent),
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        if process.returncode:
+            raise CommandError(
+                "Startup failed:\n{}".format(process.stderr[-5000:])
+            )
+        timings = json.loads(process.stdout.strip().splitlines()[-1])
+        modules = parse_import_times(process.stderr)
+        packages = by_package(modules)
+        slowest = sorted(modules, key=lambda module: module[2], reverse=True)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(OrderedDict([
+                ("timings", timings),
+                ("import_time", sum(own for _, own, _ in modules)),
+                ("packages", OrderedDict(packages)),
+                ("modules", [
+                    {"module": module, "self": own, "cumulative": cumulative}
+                    for module, own, cumulative in slowest
+                ]),
+            ]), indent=2))
+            return
+
+        def ms(seconds):
+            if seconds is None:
+                return "  failed"
+            return "{:8.1f}ms".format(seconds * 1000)
+
+        self.stdout.write("Startup phases:")
+        for name, duration in timings.items():
+            self.stdout.write("  {}  {}".format(ms(duration), name))
+        self.stdout.write("Imported {} module(s) in {}".format(
+            len(modules), ms(sum(own for _, own, _ in modules)).strip()
+        ))
+        self.stdout.write("Import time by package (self):")
+        for package, own in packages[:options["top"]]:
+            self.stdout.write("  {}  {}".format(ms(own), package))
+        self.stdout.write("Slowest modules (cumulative):")
+        for module, own, cumulative in slowest[:options["top"]]:
+            self.stdout.write("  {}  {}".format(ms(cumulative), module))
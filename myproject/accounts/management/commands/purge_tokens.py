@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...tokens import expired_tokens, get_expiry_cutoff, purge_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes API tokens which weren't used for ACCOUNTS_TOKEN_EXPIRY "
+        "seconds, oldest first and in small transactions, so no long locks "
+        "are held on the token table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--sleep", type=float, default=0.5,
+            help="Seconds to pause between batches."
+        )
+        parser.add_argument(
+            "--max-batches", type=int,
+            help="Stop after this many batches."
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Only report how many tokens would be deleted."
+        )
+
+    def handle(self, *args, **options):
+        cutoff = get_expiry_cutoff()
+        if options["dry_run"]:
+            self.stdout.write("{} token(s) would be deleted.".format(
+                expired_tokens(cutoff).count()
+            ))
+            return
+
+        total = batches = 0
+        while options["max_batches"] is None or \
+                batches < options["max_batches"]:
+            deleted = purge_batch(cutoff, options["batch_size"])
+            if not deleted:
+                break
+            total += deleted
+            batches += 1
+            if deleted == options["batch_size"]:
+                time.sleep(options["sleep"])
+        self.stdout.write("Deleted {} expired token(s).".format(total))
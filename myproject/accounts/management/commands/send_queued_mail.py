@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...outbox import deliver_queued_mail
+
+
+class Command(BaseCommand):
+    help = (
+        "Delivers the e-mails queued by the account adapter and the password "
+        "reset form in batches over a reused connection. Runs until stopped "
+        "unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument(
+            "--max-attempts", type=int, default=5,
+            help="Give up on an e-mail after this many failed attempts."
+        )
+        parser.add_argument(
+            "--retry-delay", type=int, default=60,
+            help="Seconds before the first retry, doubled on every failure."
+        )
+        parser.add_argument(
+            "--interval", type=float, default=5,
+            help="Seconds to sleep when the outbox is empty."
+        )
+        parser.add_argument(
+            "--backend",
+            help="E-mail backend to deliver with, defaults to EMAIL_BACKEND. "
+                 "E.g. django.core.mail.backends.console.EmailBackend."
+        )
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Drain the outbox once and exit."
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver_queued_mail(
+                batch_size=options["batch_size"],
+                max_attempts=options["max_attempts"],
+                retry_delay=options["retry_delay"],
+                backend=options["backend"],
+            )
+            if sent or failed:
+                self.stdout.write(
+                    "Sent {} e-mail(s), {} failed.".format(sent, failed)
+                )
+            elif options["once"]:
+                return
+            else:
+                time.sleep(options["interval"])
@@ -0,0 +1,24 @@
+from django.http import HttpResponse
+
+from .hashers import PasswordHashingUnavailable
+
+
+class PasswordHashingMiddleware:
+    """
+    Answers PasswordHashingUnavailable with 503 instead of a server error
+    outside of the API, e.g. on the admin login and allauth's forms.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, PasswordHashingUnavailable):
+            return HttpResponse(
+                str(exception), status=503,
+                content_type="text/plain; charset=utf-8"
+            )
+        return None
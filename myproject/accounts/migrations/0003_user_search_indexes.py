@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Indexes matching the expressions the admin search compiles to:
+    `UPPER("email"::text) LIKE UPPER(...)` for icontains/istartswith and
+    `UPPER("email"::text) = UPPER(...)` for iexact. Built CONCURRENTLY so
+    the user table isn't locked against writes, which requires running
+    outside of a transaction.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0002_queuedemail'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+                'accounts_user_email_upper_trgm '
+                'ON accounts_user USING gin '
+                '(UPPER(email::text) gin_trgm_ops);'
+            ),
+            reverse_sql=(
+                'DROP INDEX CONCURRENTLY IF EXISTS '
+                'accounts_user_email_upper_trgm;'
+            ),
+        ),
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+                'accounts_user_name_upper_trgm '
+                'ON accounts_user USING gin '
+                '(UPPER(name::text) gin_trgm_ops);'
+            ),
+            reverse_sql=(
+                'DROP INDEX CONCURRENTLY IF EXISTS '
+                'accounts_user_name_upper_trgm;'
+            ),
+        ),
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+                'accounts_user_email_upper_like '
+                'ON accounts_user '
+                '(UPPER(email::text) text_pattern_ops);'
+            ),
+            reverse_sql=(
+                'DROP INDEX CONCURRENTLY IF EXISTS '
+                'accounts_user_email_upper_like;'
+            ),
+        ),
+    ]
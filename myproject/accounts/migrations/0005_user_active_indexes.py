@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Partial indexes covering only users which aren't soft-deleted, used by
+    UserQuerySet.not_removed() lookups. Built CONCURRENTLY so the user table
+    isn't locked against writes, which requires running outside of a
+    transaction.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0004_archiveduser'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+                'accounts_user_email_upper_active '
+                'ON accounts_user (UPPER(email::text)) '
+                'WHERE is_removed = false;'
+            ),
+            reverse_sql=(
+                'DROP INDEX CONCURRENTLY IF EXISTS '
+                'accounts_user_email_upper_active;'
+            ),
+        ),
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+                'accounts_user_uuid_active '
+                'ON accounts_user (uuid) '
+                'WHERE is_removed = false;'
+            ),
+            reverse_sql=(
+                'DROP INDEX CONCURRENTLY IF EXISTS accounts_user_uuid_active;'
+            ),
+        ),
+    ]
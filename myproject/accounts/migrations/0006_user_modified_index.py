@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.13 on 2026-10-18 13:27
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    The (modified, id) index of User.Meta.indexes, for the keyset
+    pagination of the changes API. Built CONCURRENTLY so the user table
+    isn't locked against writes, which requires running outside of a
+    transaction, hence the raw SQL next to the state operation.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0005_user_active_indexes'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql=(
+                        'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+                        'accounts_us_modifie_21bc6c_idx '
+                        'ON accounts_user (modified, id);'
+                    ),
+                    reverse_sql=(
+                        'DROP INDEX CONCURRENTLY IF EXISTS '
+                        'accounts_us_modifie_21bc6c_idx;'
+                    ),
+                ),
+            ],
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='user',
+                    index=models.Index(fields=['modified', 'id'], name='accounts_us_modifie_21bc6c_idx'),
+                ),
+            ],
+        ),
+    ]
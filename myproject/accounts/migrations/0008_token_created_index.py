@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Index on the creation time of rest_framework's tokens, which
+    manage.py purge_tokens scans for expired tokens. rest_framework doesn't
+    define it and the table isn't ours, hence the raw SQL. Built
+    CONCURRENTLY so logins aren't blocked, which requires running outside
+    of a transaction.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ('authtoken', '0002_auto_20160226_1747'),
+        ('accounts', '0007_tokenactivity'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+                'accounts_authtoken_token_created '
+                'ON authtoken_token (created);'
+            ),
+            reverse_sql=(
+                'DROP INDEX CONCURRENTLY IF EXISTS '
+                'accounts_authtoken_token_created;'
+            ),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Indexes on allauth's tables, which allauth doesn't define itself:
+
+    - UPPER(email) of e-mail addresses, for the case-insensitive uniqueness
+      check on registration (`email__iexact`).
+    - `sent` of e-mail confirmations, which manage.py cleanup_unverified
+      deletes oldest first.
+
+    Built CONCURRENTLY so registrations aren't blocked, which requires
+    running outside of a transaction.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ('account', '0002_email_max_length'),
+        ('accounts', '0008_token_created_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+                'accounts_account_emailaddress_email_upper '
+                'ON account_emailaddress (UPPER(email::text));'
+            ),
+            reverse_sql=(
+                'DROP INDEX CONCURRENTLY IF EXISTS '
+                'accounts_account_emailaddress_email_upper;'
+            ),
+        ),
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+                'accounts_account_emailconfirmation_sent '
+                'ON account_emailconfirmation (sent);'
+            ),
+            reverse_sql=(
+                'DROP INDEX CONCURRENTLY IF EXISTS '
+                'accounts_account_emailconfirmation_sent;'
+            ),
+        ),
+    ]
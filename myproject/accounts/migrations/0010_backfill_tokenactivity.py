@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+
+def backfill_token_activity(apps, schema_editor):
+    """
+    Records every existing token as used now. Their actual last use is
+    unknown, and falling back to their creation would expire (and purge)
+    all tokens older than ACCOUNTS_TOKEN_EXPIRY on deploy.
+    """
+    Token = apps.get_model('authtoken', 'Token')
+    TokenActivity = apps.get_model('accounts', 'TokenActivity')
+    db = schema_editor.connection.alias
+    now = timezone.now()
+    last_key = ''
+    while True:
+        keys = list(
+            Token.objects.using(db)
+            .filter(key__gt=last_key, activity__isnull=True)
+            .order_by('key')
+            .values_list('key', flat=True)[:BATCH_SIZE]
+        )
+        if not keys:
+            break
+        TokenActivity.objects.using(db).bulk_create([
+            TokenActivity(token_id=key, last_used=now) for key in keys
+        ])
+        last_key = keys[-1]
+
+
+class Migration(migrations.Migration):
+    """Backfilled in batches, each committed on its own."""
+
+    atomic = False
+
+    dependencies = [
+        ('authtoken', '0002_auto_20160226_1747'),
+        ('accounts', '0009_account_cleanup_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_token_activity, migrations.RunPython.noop
+        ),
+    ]
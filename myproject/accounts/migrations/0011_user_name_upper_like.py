@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    The prefix index on names next to the one on e-mails from 0003, for the
+    `UPPER("name"::text) LIKE UPPER(...)` of short admin search terms,
+    which the trigram index can't serve. Built CONCURRENTLY, outside of a
+    transaction.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0010_backfill_tokenactivity'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+                'accounts_user_name_upper_like '
+                'ON accounts_user '
+                '(UPPER(name::text) text_pattern_ops);'
+            ),
+            reverse_sql=(
+                'DROP INDEX CONCURRENTLY IF EXISTS '
+                'accounts_user_name_upper_like;'
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    When a user was soft-deleted, for archive_removed_users. The time isn't
+    known for users removed before, their last modification is the closest
+    guess.
+    """
+
+    dependencies = [
+        ('accounts', '0011_user_name_upper_like'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='removed',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='removed'),
+        ),
+        migrations.RunSQL(
+            sql=(
+                'UPDATE accounts_user SET removed = modified '
+                'WHERE is_removed AND removed IS NULL;'
+            ),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Partial index on the removal time of soft-deleted users, for
+    archivable_users(). Built CONCURRENTLY so the user table isn't locked
+    against writes, which requires running outside of a transaction.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0012_user_removed'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+                'accounts_user_removed '
+                'ON accounts_user (removed) '
+                'WHERE is_removed = true;'
+            ),
+            reverse_sql=(
+                'DROP INDEX CONCURRENTLY IF EXISTS accounts_user_removed;'
+            ),
+        ),
+    ]
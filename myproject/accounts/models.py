@@ -1,11 +1,95 @@
+import hashlib
+
+from allauth.account.models import EmailAddress
 from authtools.models import AbstractEmailUser, UserManager
+from django.contrib.postgres.fields import ArrayField, JSONField
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.mail import EmailMultiAlternatives
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
-from model_utils.fields import AutoLastModifiedField
-from model_utils.models import SoftDeletableModel
+from model_utils.fields import AutoCreatedField, AutoLastModifiedField
+from model_utils.models import SoftDeletableModel, TimeStampedModel
 
 from core.behaviors import UniversallyUniqueIdentifiable
 
+from . import hashers
+
+
+class UserQuerySet(models.QuerySet):
+    _date_cache_timeout = None
+
+    def _clone(self, **kwargs):
+        clone = super()._clone(**kwargs)
+        clone._date_cache_timeout = self._date_cache_timeout
+        return clone
+
+    def cache_dates(self, timeout):
+        """
+        Caches the results of `datetimes()` and `aggregate()` (what the admin
+        date_hierarchy runs) for `timeout` seconds, keyed by the SQL.
+        """
+        clone = self._clone()
+        clone._date_cache_timeout = timeout
+        return clone
+
+    def _cached(self, query, extra, compute):
+        try:
+            sql, params = query.sql_with_params()
+        except EmptyResultSet:
+            return compute()
+        digest = hashlib.md5(
+            repr((self.db, sql, params, extra)).encode()
+        ).hexdigest()
+        key = "accounts:users:dates:{}".format(digest)
+        result = cache.get(key)
+        if result is None:
+            result = compute()
+            cache.set(key, result, self._date_cache_timeout)
+        return result
+
+    def datetimes(self, field_name, kind, order='ASC', tzinfo=None):
+        queryset = super().datetimes(field_name, kind, order, tzinfo)
+        if self._date_cache_timeout is None:
+            return queryset
+        return self._cached(
+            queryset.query, (field_name, kind, order, str(tzinfo)),
+            lambda: list(queryset)
+        )
+
+    def aggregate(self, *args, **kwargs):
+        if self._date_cache_timeout is None:
+            return super().aggregate(*args, **kwargs)
+        return self._cached(
+            self.query, repr((args, sorted(kwargs.items()))),
+            lambda: super(UserQuerySet, self).aggregate(*args, **kwargs)
+        )
+
+    def not_removed(self):
+        """
+        Users which aren't soft-deleted. Lookups through this queryset can
+        use the partial indexes from migration 0005.
+        """
+        return self.filter(is_removed=False)
+
+    def with_email_verified(self):
+        """
+        Annotates `email_verified`, the verification state of the primary
+        e-mail address, as a single EXISTS subquery.
+        """
+        return self.annotate(
+            email_verified=Exists(
+                EmailAddress.objects.filter(
+                    user=OuterRef('pk'),
+                    primary=True,
+                    verified=True,
+                )
+            )
+        )
+
 
 class User(
     UniversallyUniqueIdentifiable,
@@ -15,11 +99,153 @@ class User(
     """
     User should generally not be deleted, but rather is_removed should just
     be set to true. The delete() method is overwritten in the
-    SoftDeletableModel.
+    SoftDeletableModel, save() records when that happened in `removed`.
     Also add a uuid field to avoid displaying the sequential primary key.
     """
 
     name = models.CharField(_('name'), max_length=255, blank=True)
     modified = AutoLastModifiedField(_('modified'))
+    removed = models.DateTimeField(
+        _('removed'), null=True, blank=True, editable=False
+    )
+
+    objects = UserManager.from_queryset(UserQuerySet)()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of the changes API.
+            models.Index(fields=["modified", "id"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self.is_removed:
+            self.removed = None
+        elif self.removed is None:
+            self.removed = timezone.now()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "is_removed" in update_fields:
+            kwargs["update_fields"] = set(update_fields) | {"removed"}
+        super().save(*args, **kwargs)
+
+    def set_password(self, raw_password):
+        self.password = hashers.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        """
+        Verifies the password on the hashing pool and upgrades the stored
+        hash (e.g. PBKDF2 to Argon2) if the preferred hasher changed.
+        """
+        def setter(raw_password):
+            self.set_password(raw_password)
+            # Password hash upgrades shouldn't be considered password changes.
+            self._password = None
+            self.save(update_fields=["password"])
+        return hashers.check_password(raw_password, self.password, setter)
+
+
+class ArchivedUser(models.Model):
+    """
+    Snapshot of a long-removed user and its tokens, e-mail addresses, social
+    accounts and admin log entries, written by manage.py
+    archive_removed_users before the rows are deleted from the live tables.
+    """
+
+    user_id = models.IntegerField(unique=True)
+    uuid = models.UUIDField(unique=True)
+    email = models.EmailField(_('email address'), max_length=255)
+    removed = models.DateTimeField(_('removed'))
+    archived = AutoCreatedField(_('archived'))
+    data = JSONField(encoder=DjangoJSONEncoder)
+
+    def __str__(self):
+        return self.email
+
+
+class TokenActivity(models.Model):
+    """
+    When an API token was last used, kept next to rest_framework's Token to
+    expire tokens which weren't used for ACCOUNTS_TOKEN_EXPIRY seconds. A
+    token without activity counts as last used when it was created.
+    """
+
+    token = models.OneToOneField(
+        "authtoken.Token",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="activity",
+    )
+    last_used = models.DateTimeField(_('last used'), db_index=True)
+
+    def __str__(self):
+        return self.token_id
+
+
+class QueuedEmailQuerySet(models.QuerySet):
+
+    def pending(self, max_attempts):
+        """E-mails which are due for a (re)try."""
+        return self.filter(
+            sent__isnull=True,
+            attempts__lt=max_attempts,
+            next_attempt__lte=timezone.now(),
+        )
+
+
+class QueuedEmailManager(models.Manager.from_queryset(QueuedEmailQuerySet)):
+
+    def enqueue(self, message):
+        """
+        Stores an EmailMessage instead of sending it. Being written in the
+        request's transaction, it only becomes visible to the delivery
+        worker (manage.py send_queued_mail) once that transaction commits.
+        """
+        html_body = ""
+        for content, mimetype in getattr(message, "alternatives", []):
+            if mimetype == "text/html":
+                html_body = content
+        return self.create(
+            subject=message.subject,
+            body=message.body,
+            html_body=html_body,
+            from_email=message.from_email,
+            to=list(message.to),
+        )
+
+
+class QueuedEmail(TimeStampedModel):
+    """
+    Outbox for e-mails, so SMTP latency stays out of the request cycle.
+    """
+
+    subject = models.TextField()
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254)
+    to = ArrayField(models.CharField(max_length=254))
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt = models.DateTimeField(default=timezone.now)
+    sent = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    objects = QueuedEmailManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["sent", "next_attempt"]),
+        ]
+
+    def __str__(self):
+        return "{} to {}".format(self.subject, ", ".join(self.to))
 
-    objects = UserManager()
+    def as_message(self, connection=None):
+        message = EmailMultiAlternatives(
+            self.subject,
+            self.body,
+            self.from_email,
+            self.to,
+            connection=connection,
+        )
+        if self.html_body:
+            message.attach_alternative(self.html_body, "text/html")
+        return message
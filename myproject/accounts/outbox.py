@@ -0,0 +1,76 @@
+"""
+Delivery of the e-mails queued in accounts.models.QueuedEmail.
+"""
+from datetime import timedelta
+
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import QueuedEmail
+
+# Seconds a claimed batch is hidden from other workers. If a worker dies
+# mid-batch, its e-mails become due again afterwards.
+CLAIM_TIMEOUT = 5 * 60
+
+
+def claim_batch(batch_size, max_attempts):
+    """
+    Locks a batch of due e-mails, pushes their next attempt into the future
+    so concurrent workers skip them, and commits right away, so no
+    transaction is held open while talking to the SMTP server.
+    """
+    with transaction.atomic():
+        batch = list(
+            QueuedEmail.objects
+            .pending(max_attempts)
+            .select_for_update(skip_locked=True)
+            .order_by("next_attempt")[:batch_size]
+        )
+        if batch:
+            QueuedEmail.objects.filter(
+                pk__in=[email.pk for email in batch]
+            ).update(
+                next_attempt=timezone.now() + timedelta(seconds=CLAIM_TIMEOUT)
+            )
+    return batch
+
+
+def deliver_queued_mail(batch_size=50, max_attempts=5, retry_delay=60,
+                        backend=None):
+    """
+    Sends one batch over a single connection and returns the number of
+    (sent, failed) e-mails. Failed e-mails are retried with exponential
+    backoff starting at `retry_delay` seconds.
+    """
+    batch = claim_batch(batch_size, max_attempts)
+    if not batch:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection(backend)
+    connection.open()
+    try:
+        for email in batch:
+            try:
+                connection.send_messages([email.as_message(connection)])
+            except Exception as e:
+                email.attempts += 1
+                email.last_error = repr(e)
+                email.next_attempt = timezone.now() + timedelta(
+                    seconds=retry_delay * 2 ** (email.attempts - 1)
+                )
+                email.save(
+                    update_fields=[
+                        "attempts", "last_error", "next_attempt", "modified"
+                    ]
+                )
+                failed += 1
+            else:
+                email.attempts += 1
+                email.sent = timezone.now()
+                email.save(update_fields=["attempts", "sent", "modified"])
+                sent += 1
+    finally:
+        connection.close()
+    return sent, failed
@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .api.authentication import invalidate_cached_tokens
+from .api.lookup import invalidate_user_lookups
+from .usercache import invalidate_users
+
+
+def invalidate(func, *args):
+    """
+    Runs the invalidation `func(*args)` now and again once the transaction
+    commits: a concurrent request may still read the old row until then
+    (e.g. with ATOMIC_REQUESTS) and cache it again.
+    """
+    func(*args)
+    transaction.on_commit(lambda: func(*args))
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Logging out deletes the token, so drop it from the cache too."""
+    invalidate(invalidate_cached_tokens, instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_tokens(sender, instance, created, **kwargs):
+    """
+    Password changes, deactivation and soft-deletes all save the user, so
+    any cached token still carrying the old user has to go.
+    """
+    if created:
+        return
+    keys = Token.objects.filter(user=instance).values_list('key', flat=True)
+    invalidate(invalidate_cached_tokens, *keys)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_lookup(sender, instance, **kwargs):
+    """Drops the user from the cache of the batch lookup API."""
+    invalidate(invalidate_user_lookups, instance.uuid)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user(sender, instance, created=False, **kwargs):
+    """
+    Drops the user from the two-tier user cache of all processes, this
+    includes soft-deletes, which save the user.
+    """
+    if created:
+        return
+    invalidate(invalidate_users, instance.pk)
@@ -1,9 +1,14 @@
+from allauth.account.models import EmailAddress
 from authtools.admin import BASE_FIELDS, SIMPLE_PERMISSION_FIELDS
 from django.contrib import admin
 from django.contrib.admin.options import ModelAdmin
 from django.contrib.admin.sites import AdminSite
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
 User = get_user_model()
 
@@ -113,3 +118,84 @@ class AccountsAdminTestCase(TestCase):
                 'name'
             ]})]
         )
+
+
+class AccountsAdminChangelistTestCase(TestCase):
+
+    def setUp(self):
+        admin_user = User.objects.create_superuser(
+            email="admin@test.com",
+            password="test1234test"
+        )
+        self.client.force_login(admin_user)
+        self.url = reverse("admin:accounts_user_changelist")
+        self.clear_date_cache()
+
+    def clear_date_cache(self):
+        # Only the cached date_hierarchy buckets: the session lives in the
+        # same cache.
+        cache.delete_pattern("accounts:users:dates:*")
+
+    def create_users(self, start, count, verified):
+        for i in range(start, start + count):
+            user = User.objects.create_user(email="user{}@test.com".format(i))
+            EmailAddress.objects.create(
+                user=user, email=user.email, primary=True, verified=verified
+            )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelist_constant_number_of_queries(self):
+        """Test if the verified column doesn't cause a query per row."""
+        self.create_users(0, 1, verified=True)
+        # Loads the session user into accounts.usercache, as it would be
+        # for the second request.
+        self.client.get(self.url)
+        self.clear_date_cache()
+        baseline = self.count_queries(self.url)
+        self.create_users(1, 10, verified=False)
+        self.clear_date_cache()
+        self.assertEqual(self.count_queries(self.url), baseline)
+
+    def test_changelist_verified_filter(self):
+        self.create_users(0, 2, verified=True)
+        self.create_users(2, 3, verified=False)
+        response = self.client.get(self.url, {"verified": "1"})
+        self.assertEqual(response.context["cl"].result_count, 2)
+        response = self.client.get(self.url, {"verified": "0"})
+        # The superuser has no e-mail address at all.
+        self.assertEqual(response.context["cl"].result_count, 4)
+
+    def test_search_full_email_exact(self):
+        """Test if a full e-mail address only matches that user."""
+        self.create_users(0, 12, verified=True)
+        response = self.client.get(self.url, {"q": "USER1@test.com"})
+        results = list(response.context["cl"].result_list)
+        self.assertEqual([u.email for u in results], ["user1@test.com"])
+
+    def test_search_short_term_prefix(self):
+        """Test if terms too short for trigrams are prefix matches."""
+        self.create_users(0, 2, verified=True)
+        response = self.client.get(self.url, {"q": "us"})
+        self.assertEqual(response.context["cl"].result_count, 2)
+        response = self.client.get(self.url, {"q": "er"})
+        self.assertEqual(response.context["cl"].result_count, 0)
+
+    def test_search_substring(self):
+        self.create_users(0, 2, verified=True)
+        response = self.client.get(self.url, {"q": "ser1"})
+        self.assertEqual(response.context["cl"].result_count, 1)
+
+    def test_changelist_caches_date_hierarchy(self):
+        """Test if the date_hierarchy buckets are served from the cache."""
+        self.create_users(0, 2, verified=True)
+        first = self.count_queries(self.url)
+        self.assertLess(self.count_queries(self.url), first)
+
+    def test_changelist_verified_ordering(self):
+        response = self.client.get(self.url, {"o": "3"})
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,104 @@
+from datetime import timedelta
+from io import StringIO
+
+from allauth.account.models import EmailAddress
+from django.contrib.admin.models import ADDITION, LogEntry
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from ..archive import archive_batch
+from ..models import ArchivedUser
+
+User = get_user_model()
+
+
+class ArchiveRemovedUsersTestCase(TestCase):
+
+    def create_user(self, email, removed_days_ago=None):
+        user = User.objects.create_user(email=email, password="test1234test")
+        EmailAddress.objects.create(user=user, email=email, primary=True)
+        Token.objects.create(user=user)
+        if removed_days_ago is not None:
+            user.delete()
+            User.objects.filter(pk=user.pk).update(
+                removed=timezone.now() - timedelta(days=removed_days_ago)
+            )
+            user.refresh_from_db()
+        return user
+
+    def setUp(self):
+        self.active = self.create_user("active@test.com")
+        self.recent = self.create_user("recent@test.com", removed_days_ago=1)
+        self.old = self.create_user("old@test.com", removed_days_ago=60)
+
+    def test_archive_batch(self):
+        """Test if only long-removed users are moved to the archive."""
+        cutoff = timezone.now() - timedelta(days=30)
+        self.assertEqual(archive_batch(cutoff, 10), 1)
+        self.assertEqual(archive_batch(cutoff, 10), 0)
+
+        self.assertFalse(User.objects.filter(pk=self.old.pk).exists())
+        self.assertFalse(Token.objects.filter(user_id=self.old.pk).exists())
+        self.assertFalse(
+            EmailAddress.objects.filter(user_id=self.old.pk).exists()
+        )
+        self.assertEqual(User.objects.count(), 2)
+
+        archived = ArchivedUser.objects.get()
+        self.assertEqual(archived.user_id, self.old.pk)
+        self.assertEqual(archived.uuid, self.old.uuid)
+        self.assertEqual(archived.data["user"]["fields"]["email"],
+                         "old@test.com")
+        self.assertEqual(len(archived.data["tokens"]), 1)
+        self.assertEqual(len(archived.data["email_addresses"]), 1)
+        self.assertEqual(archived.data["social_accounts"], [])
+        self.assertEqual(archived.data["admin_log_entries"], [])
+        self.assertEqual(archived.removed, self.old.removed)
+
+    def test_archive_batch_by_removal_time(self):
+        """
+        Test if users are archived by their removal time, not their last
+        modification.
+        """
+        User.objects.filter(pk=self.old.pk).update(modified=timezone.now())
+        User.objects.filter(pk=self.recent.pk).update(
+            modified=timezone.now() - timedelta(days=60)
+        )
+        cutoff = timezone.now() - timedelta(days=30)
+        self.assertEqual(archive_batch(cutoff, 10), 1)
+        self.assertEqual(ArchivedUser.objects.get().user_id, self.old.pk)
+
+    def test_archive_batch_keeps_admin_log(self):
+        """Test if the admin log entries of archived users are kept."""
+        LogEntry.objects.log_action(
+            user_id=self.old.pk,
+            content_type_id=None,
+            object_id=None,
+            object_repr="Test entry",
+            action_flag=ADDITION,
+        )
+        cutoff = timezone.now() - timedelta(days=30)
+        archive_batch(cutoff, 10)
+        self.assertFalse(LogEntry.objects.exists())
+        entries = ArchivedUser.objects.get().data["admin_log_entries"]
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["fields"]["object_repr"], "Test entry")
+
+    def test_command_batches(self):
+        self.create_user("old2@test.com", removed_days_ago=60)
+        self.create_user("old3@test.com", removed_days_ago=60)
+        out = StringIO()
+        call_command("archive_removed_users", "--batch-size=2", "--sleep=0",
+                     stdout=out)
+        self.assertIn("Archived 3 user(s).", out.getvalue())
+        self.assertEqual(ArchivedUser.objects.count(), 3)
+
+    def test_command_dry_run(self):
+        out = StringIO()
+        call_command("archive_removed_users", "--days=0", "--dry-run",
+                     stdout=out)
+        self.assertIn("2 user(s) would be archived.", out.getvalue())
+        self.assertEqual(ArchivedUser.objects.count(), 0)
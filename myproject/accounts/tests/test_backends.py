@@ -0,0 +1,33 @@
+from allauth.account.models import EmailAddress
+from django.contrib.auth import authenticate, get_user_model
+from django.test import TestCase
+
+User = get_user_model()
+
+
+class AuthenticationBackendTestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="testuser@test.com",
+            password="test1234test"
+        )
+
+    def test_authenticate_by_email(self):
+        user = authenticate(email="TESTUSER@test.com", password="test1234test")
+        self.assertEqual(user, self.user)
+
+    def test_authenticate_by_secondary_email(self):
+        EmailAddress.objects.create(user=self.user, email="other@test.com")
+        user = authenticate(email="other@test.com", password="test1234test")
+        self.assertEqual(user, self.user)
+
+    def test_removed_user_fail(self):
+        """Test if soft-deleted users can't log in anymore."""
+        self.user.delete()
+        self.assertIsNone(
+            authenticate(email="testuser@test.com", password="test1234test")
+        )
+        self.assertIsNone(
+            authenticate(username="testuser@test.com", password="test1234test")
+        )
@@ -0,0 +1,127 @@
+from datetime import timedelta
+from io import StringIO
+
+from allauth.account.models import EmailAddress, EmailConfirmation
+from allauth.socialaccount.models import SocialAccount
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from ..api.authentication import get_token_cache_key
+from ..api.lookup import get_user_lookup_cache_key
+from ..cleanup import (
+    delete_expired_confirmations, remove_unverified_batch, unverified_users
+)
+
+User = get_user_model()
+
+
+class CleanupUnverifiedTestCase(TestCase):
+
+    def create_user(self, email, days_ago=10, verified=False):
+        user = User.objects.create_user(email=email, password="test1234test")
+        User.objects.filter(pk=user.pk).update(
+            date_joined=timezone.now() - timedelta(days=days_ago)
+        )
+        address = EmailAddress.objects.create(
+            user=user, email=email, primary=True, verified=verified
+        )
+        Token.objects.create(user=user)
+        return User.objects.get(pk=user.pk), address
+
+    def setUp(self):
+        self.unverified, address = self.create_user("unverified@test.com")
+        self.confirmation = EmailConfirmation.create(address)
+        self.confirmation.sent = timezone.now() - timedelta(days=10)
+        self.confirmation.save()
+        self.other, address = self.create_user("other@test.com")
+        self.verified, address = self.create_user(
+            "verified@test.com", verified=True
+        )
+        self.recent, address = self.create_user(
+            "recent@test.com", days_ago=1
+        )
+        self.social, address = self.create_user("social@test.com")
+        SocialAccount.objects.create(
+            user=self.social, provider="facebook", uid="1"
+        )
+        self.cutoff = timezone.now() - timedelta(days=7)
+
+    def test_unverified_users(self):
+        """Test if only old, unverified, non-social users are selected."""
+        self.assertEqual(
+            set(unverified_users(self.cutoff)),
+            {self.unverified, self.other}
+        )
+
+    def test_delete_expired_confirmations(self):
+        """Test if expired confirmations are deleted."""
+        pending = EmailConfirmation.create(
+            EmailAddress.objects.get(user=self.recent)
+        )
+        pending.sent = timezone.now()
+        pending.save()
+        self.assertEqual(delete_expired_confirmations(10), 1)
+        self.assertEqual(delete_expired_confirmations(10), 0)
+        self.assertEqual(
+            list(EmailConfirmation.objects.all()), [pending]
+        )
+
+    def test_soft_delete_batches(self):
+        """
+        Test if batches walk the primary key, soft-delete the users and
+        invalidate their cached tokens and lookups.
+        """
+        token = Token.objects.get(user=self.unverified)
+        cache.set(get_token_cache_key(token.key), token)
+        cache.set(get_user_lookup_cache_key(self.unverified.uuid), {})
+
+        removed, last = remove_unverified_batch(self.cutoff, 1)
+        self.assertEqual((removed, last), (1, self.unverified.pk))
+        removed, last = remove_unverified_batch(self.cutoff, 1, after=last)
+        self.assertEqual((removed, last), (1, self.other.pk))
+        self.assertEqual(
+            remove_unverified_batch(self.cutoff, 1, after=last), (0, last)
+        )
+
+        self.unverified.refresh_from_db()
+        self.assertTrue(self.unverified.is_removed)
+        self.assertIsNotNone(self.unverified.removed)
+        self.assertFalse(User.objects.get(pk=self.verified.pk).is_removed)
+        self.assertFalse(
+            EmailConfirmation.objects.filter(pk=self.confirmation.pk).exists()
+        )
+        self.assertIsNone(cache.get(get_token_cache_key(token.key)))
+        self.assertIsNone(
+            cache.get(get_user_lookup_cache_key(self.unverified.uuid))
+        )
+
+    def test_command_delete(self):
+        """Test if --delete removes the users and their rows."""
+        out = StringIO()
+        call_command("cleanup_unverified", "--batch-size", "1",
+                     "--max-rate", "0", "--delete", stdout=out)
+        self.assertIn(
+            "Removed 1 expired confirmation(s) and 2 unverified user(s)",
+            out.getvalue()
+        )
+        self.assertFalse(
+            User.objects.filter(
+                pk__in=[self.unverified.pk, self.other.pk]
+            ).exists()
+        )
+        self.assertFalse(
+            EmailAddress.objects.filter(email="unverified@test.com").exists()
+        )
+        self.assertEqual(User.objects.count(), 3)
+
+    def test_dry_run(self):
+        out = StringIO()
+        call_command("cleanup_unverified", "--dry-run", stdout=out)
+        self.assertIn(
+            "1 confirmation(s) and 2 user(s) would be removed", out.getvalue()
+        )
+        self.assertFalse(User.objects.filter(is_removed=True).exists())
@@ -0,0 +1,217 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from allauth.account.models import EmailAddress
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from ..models import TokenActivity
+
+User = get_user_model()
+
+
+class ImportUsersCommandTestCase(TestCase):
+
+    def setUp(self):
+        self.password = make_password("test1234test", hasher="pbkdf2_sha256")
+        User.objects.create_user(
+            email="existing@test.com",
+            password="test1234test"
+        )
+
+    def write(self, suffix, content):
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_import_csv(self):
+        path = self.write(".csv", (
+            "email,name,password,verified\n"
+            "first@test.com,First User,{0},true\n"
+            "second@test.com,Second User,,false\n"
+            "EXISTING@test.com,Existing User,{0},true\n"
+            "not-an-email,Invalid User,{0},true\n"
+        ).format(self.password))
+        out = StringIO()
+        call_command("import_users", path, stdout=out, stderr=StringIO())
+        self.assertIn("Imported 2 user(s), skipped 1 existing, 1 invalid", out.getvalue())
+
+        first = User.objects.get(email="first@test.com")
+        self.assertEqual(first.name, "First User")
+        self.assertTrue(first.check_password("test1234test"))
+        self.assertTrue(EmailAddress.objects.get(user=first).verified)
+        self.assertTrue(Token.objects.filter(user=first).exists())
+
+        second = User.objects.get(email="second@test.com")
+        self.assertFalse(second.has_usable_password())
+        self.assertFalse(EmailAddress.objects.get(user=second).verified)
+
+    def test_import_jsonl_in_batches(self):
+        lines = [
+            '{{"email": "user{}@test.com", "password": "{}"}}'.format(
+                i, self.password
+            )
+            for i in range(5)
+        ]
+        path = self.write(".jsonl", "\n".join(lines) + "\n")
+        call_command("import_users", path, "--batch-size", "2",
+                     "--verified", stdout=StringIO())
+        self.assertEqual(
+            User.objects.filter(email__startswith="user").count(), 5
+        )
+        self.assertEqual(
+            EmailAddress.objects.filter(verified=True).count(), 5
+        )
+
+    def test_import_rejects_plain_passwords(self):
+        path = self.write(".csv", "email,password\nplain@test.com,secret\n")
+        err = StringIO()
+        call_command("import_users", path, stdout=StringIO(), stderr=err)
+        self.assertIn("not a known hash format", err.getvalue())
+        self.assertFalse(User.objects.filter(email="plain@test.com").exists())
+
+    def test_import_reports_malformed_rows(self):
+        """Test if malformed JSONL rows are counted invalid, not fatal."""
+        path = self.write(".jsonl", "\n".join([
+            '["not", "an", "object"]',
+            '{"email": 42}',
+            '{"email": "password@test.com", "password": 1}',
+            '{"email": "date@test.com", "date_joined": "2018-13-45T10:00:00"}',
+            '{{"email": "valid@test.com", "password": "{}"}}'.format(
+                self.password
+            ),
+        ]) + "\n")
+        out, err = StringIO(), StringIO()
+        call_command("import_users", path, stdout=out, stderr=err)
+        self.assertIn("Imported 1 user(s), skipped 0 existing, 4 invalid",
+                      out.getvalue())
+        self.assertIn("Line 1: Not a JSON object.", err.getvalue())
+        self.assertIn("Line 4: Invalid date_joined.", err.getvalue())
+        self.assertTrue(User.objects.filter(email="valid@test.com").exists())
+
+    def test_dry_run(self):
+        path = self.write(
+            ".csv", "email,password\nnew@test.com,{}\n".format(self.password)
+        )
+        call_command("import_users", path, "--dry-run", stdout=StringIO())
+        self.assertFalse(User.objects.filter(email="new@test.com").exists())
+
+
+class ExportUsersCommandTestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="testuser@test.com",
+            name="Test User",
+            password="test1234test"
+        )
+
+    def test_export_csv(self):
+        out = StringIO()
+        call_command("export_users", stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(
+            lines[0], "uuid,name,email,date_joined,modified,email_verified"
+        )
+        self.assertTrue(lines[1].startswith(
+            "{},Test User,testuser@test.com,".format(self.user.uuid)
+        ))
+        self.assertTrue(lines[1].endswith(",False"))
+
+    def test_export_jsonl_to_file(self):
+        fd, path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        call_command("export_users", "--format", "jsonl", "--output", path)
+        with open(path) as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(rows[0]["uuid"], str(self.user.uuid))
+        self.assertFalse(rows[0]["email_verified"])
+
+
+@override_settings(ACCOUNTS_TOKEN_EXPIRY=60 * 60 * 24)
+class PurgeTokensCommandTestCase(TestCase):
+
+    def setUp(self):
+        old = timezone.now() - timedelta(days=2)
+        self.tokens = []
+        for i in range(5):
+            user = User.objects.create_user(
+                email="user{}@test.com".format(i),
+                password="test1234test"
+            )
+            self.tokens.append(Token.objects.create(user=user))
+        # Two expired, one old but recently used, two new.
+        Token.objects.filter(
+            pk__in=[token.pk for token in self.tokens[:3]]
+        ).update(created=old)
+        TokenActivity.objects.create(token=self.tokens[1], last_used=old)
+        TokenActivity.objects.create(
+            token=self.tokens[2], last_used=timezone.now()
+        )
+
+    def test_purge_in_batches(self):
+        out = StringIO()
+        call_command("purge_tokens", "--batch-size", "1", "--sleep", "0",
+                     stdout=out)
+        self.assertIn("Deleted 2 expired token(s)", out.getvalue())
+        self.assertEqual(
+            set(Token.objects.values_list("pk", flat=True)),
+            {token.pk for token in self.tokens[2:]}
+        )
+        self.assertEqual(TokenActivity.objects.count(), 1)
+
+    def test_dry_run(self):
+        out = StringIO()
+        call_command("purge_tokens", "--dry-run", stdout=out)
+        self.assertIn("2 token(s) would be deleted", out.getvalue())
+        self.assertEqual(Token.objects.count(), 5)
+
+
+class ProfileStartupCommandTestCase(TestCase):
+
+    def test_parse_import_times(self):
+        from ..management.commands.profile_startup import (
+            by_package, parse_import_times
+        )
+        modules = parse_import_times(
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       300 |        300 |     rest_framework.compat\n"
+            "import time:      1200 |       1500 |   rest_framework\n"
+            "import time:       500 |        500 | allauth\n"
+        )
+        self.assertEqual(modules[1], ("rest_framework", 0.0012, 0.0015))
+        self.assertEqual(
+            [package for package, own in by_package(modules)],
+            ["rest_framework", "allauth"]
+        )
+
+    def test_profile_startup(self):
+        out = StringIO()
+        call_command("profile_startup", "--no-warmup", "--json", stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(list(report["timings"]), ["setup", "wsgi_handler"])
+        self.assertIn("django", report["packages"])
+
+    def test_profile_startup_import_timer(self):
+        """Test if imports are reported without -X importtime."""
+        out = StringIO()
+        call_command(
+            "profile_startup", "--no-warmup", "--import-timer", "--json",
+            stdout=out
+        )
+        report = json.loads(out.getvalue())
+        self.assertIn("django", report["packages"])
+        self.assertIn(
+            "django.core.handlers.wsgi",
+            [module["module"] for module in report["modules"]]
+        )
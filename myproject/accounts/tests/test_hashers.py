@@ -0,0 +1,115 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.reverse import reverse as api_reverse
+
+from ..api.throttling import reset_throttles
+from ..hashers import (HashingPool, PasswordHashingUnavailable,
+                       TunableArgon2PasswordHasher)
+
+User = get_user_model()
+
+
+class AccountsHashersTestCase(TestCase):
+
+    def test_new_passwords_use_argon2(self):
+        user = User.objects.create_user(
+            email="testuser@test.com",
+            password="test1234test"
+        )
+        self.assertTrue(user.password.startswith("argon2$"))
+        self.assertTrue(user.check_password("test1234test"))
+        self.assertFalse(user.check_password("wrongpassword"))
+
+    def test_pbkdf2_hash_is_upgraded_on_login(self):
+        """Test if a valid login rehashes an old PBKDF2 hash."""
+        user = User.objects.create_user(email="testuser@test.com")
+        user.password = make_password(
+            "test1234test",
+            hasher="pbkdf2_sha256"
+        )
+        user.save()
+        self.assertTrue(user.check_password("test1234test"))
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("argon2$"))
+
+    def test_changed_costs_require_update(self):
+        hasher = TunableArgon2PasswordHasher()
+        encoded = hasher.encode("test1234test", hasher.salt())
+        self.assertFalse(hasher.must_update(encoded))
+        with self.settings(ACCOUNTS_ARGON2_TIME_COST=3):
+            self.assertTrue(hasher.must_update(encoded))
+
+    @override_settings(ACCOUNTS_PASSWORD_HASHING_WORKERS=0)
+    def test_inline_hashing(self):
+        user = User.objects.create_user(
+            email="testuser@test.com",
+            password="test1234test"
+        )
+        self.assertTrue(user.check_password("test1234test"))
+
+
+class HashingPoolTestCase(TestCase):
+
+    def test_run_returns_result(self):
+        pool = HashingPool(2)
+        self.assertEqual(pool.run(sum, [1, 2, 3]), 6)
+        pool.shutdown()
+
+    def test_full_pool_raises_unavailable(self):
+        """Test if a saturated pool rejects instead of queueing forever."""
+        pool = HashingPool(1, queue_size=0, timeout=0.01)
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait()
+
+        thread = threading.Thread(target=pool.run, args=(block,))
+        thread.start()
+        started.wait()
+        try:
+            with self.assertRaises(PasswordHashingUnavailable):
+                pool.run(sum, [1])
+        finally:
+            release.set()
+            thread.join()
+            pool.shutdown()
+
+
+@mock.patch(
+    "accounts.hashers.run_hashing", side_effect=PasswordHashingUnavailable
+)
+class PasswordHashingUnavailableTestCase(TestCase):
+
+    def setUp(self):
+        reset_throttles()
+        User.objects.create_superuser(
+            email="admin@test.com",
+            password="test1234test"
+        )
+
+    def test_api_login(self, run_hashing):
+        """Test if the API answers a saturated pool with 503."""
+        response = self.client.post(
+            api_reverse("api:auth:login"),
+            {"email": "admin@test.com", "password": "test1234test"}
+        )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(
+            response.json()["detail"],
+            "Too many concurrent logins, please try again later."
+        )
+
+    def test_admin_login(self, run_hashing):
+        """Test if a form login answers a saturated pool with 503."""
+        response = self.client.post(
+            reverse("admin:login"),
+            {"username": "admin@test.com", "password": "test1234test"}
+        )
+        self.assertEqual(response.status_code, 503)
@@ -8,3 +8,16 @@ class AccountsModelsTestCase(TestCase):
 
     def test_user_is_auth_user_model(self):
         self.assertEqual(get_user_model(), User)
+
+    def test_user_delete_records_removal_time(self):
+        """Test if soft-deleting records the time, restoring clears it."""
+        user = User.objects.create_user(email="testuser@test.com")
+        self.assertIsNone(user.removed)
+        user.delete()
+        user.refresh_from_db()
+        self.assertTrue(user.is_removed)
+        self.assertIsNotNone(user.removed)
+        user.is_removed = False
+        user.save(update_fields=["is_removed"])
+        user.refresh_from_db()
+        self.assertIsNone(user.removed)
@@ -0,0 +1,50 @@
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase
+
+from ..models import QueuedEmail
+from ..outbox import deliver_queued_mail
+
+
+class AccountsOutboxTestCase(TestCase):
+
+    def setUp(self):
+        message = mail.EmailMultiAlternatives(
+            "Subject", "Body", "from@test.com", ["testuser@test.com"]
+        )
+        message.attach_alternative("<p>Body</p>", "text/html")
+        self.email = QueuedEmail.objects.enqueue(message)
+
+    def test_enqueue_does_not_send(self):
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(self.email.to, ["testuser@test.com"])
+        self.assertEqual(self.email.html_body, "<p>Body</p>")
+
+    def test_deliver_sends_and_marks_sent(self):
+        sent, failed = deliver_queued_mail()
+        self.assertEqual((sent, failed), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, "Subject")
+        self.assertEqual(mail.outbox[0].alternatives[0][0], "<p>Body</p>")
+        self.email.refresh_from_db()
+        self.assertIsNotNone(self.email.sent)
+        self.assertEqual(deliver_queued_mail(), (0, 0))
+
+    def test_deliver_failure_is_retried_later(self):
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=OSError("SMTP down")
+        ):
+            sent, failed = deliver_queued_mail()
+        self.assertEqual((sent, failed), (0, 1))
+        self.email.refresh_from_db()
+        self.assertIsNone(self.email.sent)
+        self.assertEqual(self.email.attempts, 1)
+        self.assertIn("SMTP down", self.email.last_error)
+        # Backed off, so not due right away.
+        self.assertEqual(deliver_queued_mail(), (0, 0))
+
+    def test_deliver_gives_up_after_max_attempts(self):
+        QueuedEmail.objects.filter(pk=self.email.pk).update(attempts=5)
+        self.assertEqual(deliver_queued_mail(max_attempts=5), (0, 0))
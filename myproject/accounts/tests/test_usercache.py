@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from .. import usercache
+from ..backends import ModelBackend
+
+User = get_user_model()
+
+
+class UserCacheTestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="testuser@test.com",
+            name="Test User",
+            password="test1234test"
+        )
+        usercache.local_cache.clear()
+        cache.delete(usercache.get_user_cache_key(self.user.pk))
+
+    def test_get_user_cached(self):
+        """Test if a cached user is returned without any query."""
+        self.assertEqual(usercache.get_user(self.user.pk), self.user)
+        with self.assertNumQueries(0):
+            user = usercache.get_user(str(self.user.pk))
+        self.assertEqual(user.name, "Test User")
+
+    def test_get_user_redis_tier(self):
+        """Test if another process' entries are served from Redis."""
+        usercache.get_user(self.user.pk)
+        usercache.local_cache.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(usercache.get_user(self.user.pk), self.user)
+
+    def test_get_user_returns_copies(self):
+        first = usercache.get_user(self.user.pk)
+        first.name = "Changed"
+        self.assertEqual(usercache.get_user(self.user.pk).name, "Test User")
+
+    def test_get_unknown_user(self):
+        self.assertIsNone(usercache.get_user(self.user.pk + 1))
+
+    def test_save_invalidates(self):
+        """Test if saving and soft-deleting the user drops it."""
+        usercache.get_user(self.user.pk)
+        self.user.name = "New Name"
+        self.user.save()
+        self.assertEqual(usercache.get_user(self.user.pk).name, "New Name")
+        self.user.delete()
+        self.assertTrue(usercache.get_user(self.user.pk).is_removed)
+
+    def test_invalidation_message(self):
+        """Test if a published invalidation drops the local entry."""
+        usercache.get_user(self.user.pk)
+        usercache.handle_message({
+            "type": "message",
+            "data": "{},12345".format(self.user.pk).encode(),
+        })
+        self.assertIsNone(usercache.local_cache.get(str(self.user.pk)))
+
+    def test_backend_get_user(self):
+        backend = ModelBackend()
+        self.assertEqual(backend.get_user(self.user.pk), self.user)
+        self.user.delete()
+        self.assertIsNone(backend.get_user(self.user.pk))
@@ -0,0 +1,92 @@
+"""
+Sliding expiry of API tokens: a token expires ACCOUNTS_TOKEN_EXPIRY seconds
+after it was last used, see accounts.models.TokenActivity. Expired tokens
+are deleted by manage.py purge_tokens.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from .models import TokenActivity
+
+
+def get_token_touch_key(key):
+    return "accounts:token:touch:{}".format(key)
+
+
+def get_expiry_cutoff(now=None):
+    """Tokens last used before the returned time are expired."""
+    if now is None:
+        now = timezone.now()
+    return now - timedelta(seconds=settings.ACCOUNTS_TOKEN_EXPIRY)
+
+
+def get_last_used(token):
+    try:
+        return token.activity.last_used
+    except TokenActivity.DoesNotExist:
+        # Not used since it was created: tokens older than TokenActivity got
+        # their row from migration 0010.
+        return token.created
+
+
+def is_expired(token, now=None):
+    return get_last_used(token) < get_expiry_cutoff(now)
+
+
+def touch(token, now=None):
+    """
+    Records the use of `token`, at most once per
+    ACCOUNTS_TOKEN_LAST_USED_INTERVAL seconds across all processes, and
+    returns whether it was written.
+    """
+    if now is None:
+        now = timezone.now()
+    interval = settings.ACCOUNTS_TOKEN_LAST_USED_INTERVAL
+    if now - get_last_used(token) < timedelta(seconds=interval):
+        return False
+    if not cache.add(get_token_touch_key(token.key), 1, interval):
+        return False
+
+    updated = TokenActivity.objects.filter(token=token).update(last_used=now)
+    if not updated:
+        try:
+            with transaction.atomic():
+                TokenActivity.objects.create(token=token, last_used=now)
+        except IntegrityError:
+            # Written concurrently, e.g. after the touch key was evicted.
+            pass
+    token.activity = TokenActivity(token=token, last_used=now)
+    return True
+
+
+def expired_tokens(cutoff):
+    """
+    Tokens created and last used before `cutoff`. A token can't have been
+    used before it was created, so the created index narrows the scan.
+    """
+    return Token.objects.filter(created__lt=cutoff).filter(
+        Q(activity__isnull=True) | Q(activity__last_used__lt=cutoff)
+    )
+
+
+def purge_batch(cutoff, batch_size):
+    """
+    Deletes up to `batch_size` of the oldest expired tokens (and their
+    activity) in one short transaction and returns how many were deleted.
+    The post_delete receiver drops them from the token cache.
+    """
+    with transaction.atomic():
+        keys = list(
+            expired_tokens(cutoff)
+            .order_by("created")
+            .values_list("key", flat=True)[:batch_size]
+        )
+        if keys:
+            Token.objects.filter(key__in=keys).delete()
+    return len(keys)
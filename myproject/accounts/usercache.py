@@ -0,0 +1,130 @@
+"""
+Two-tier cache of User instances for request authentication (sessions and
+the admin), see accounts.backends.
+
+Users are looked up in a small in-process LRU first, then in Redis, then
+in the database. Saving or deleting a user drops it from Redis and
+publishes its pk on INVALIDATION_CHANNEL; every process runs a listener
+thread dropping the published users from its LRU. Should a process miss
+messages (e.g. while Redis is down), its entries still expire after
+ACCOUNTS_USER_CACHE_LOCAL_TIMEOUT seconds.
+"""
+import logging
+import os
+import pickle
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+from core.cache import LocalLRUCache
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+INVALIDATION_CHANNEL = "accounts:user:invalidate"
+# Seconds to wait before resubscribing after the connection was lost.
+RECONNECT_DELAY = 1
+
+local_cache = LocalLRUCache(
+    maxsize=settings.ACCOUNTS_USER_CACHE_SIZE,
+    timeout=settings.ACCOUNTS_USER_CACHE_LOCAL_TIMEOUT,
+)
+
+_listener_pid = None
+_listener_lock = threading.Lock()
+
+
+def get_user_cache_key(pk):
+    return "accounts:user:pk:{}".format(pk)
+
+
+def get_user(pk):
+    """
+    Returns the user with the given pk, or None if there is none. Every
+    call returns a new instance, so callers may modify it freely.
+    """
+    ensure_listener()
+    key = str(pk)
+    data = local_cache.get(key)
+    if data is None:
+        user = cache.get(get_user_cache_key(key))
+        if user is None:
+            try:
+                user = User.objects.get(pk=pk)
+            except User.DoesNotExist:
+                return None
+            cache.set(
+                get_user_cache_key(key), user,
+                settings.ACCOUNTS_USER_CACHE_TIMEOUT
+            )
+        data = pickle.dumps(user, pickle.HIGHEST_PROTOCOL)
+        local_cache.set(key, data)
+    return pickle.loads(data)
+
+
+def invalidate_users(*pks):
+    """
+    Drops the users from both tiers, in this and (through the pub/sub
+    channel) all other processes. Call it after changing users with
+    `QuerySet.update()`, which doesn't send signals.
+    """
+    if not pks:
+        return
+    keys = [str(pk) for pk in pks]
+    for key in keys:
+        local_cache.delete(key)
+    cache.delete_many([get_user_cache_key(key) for key in keys])
+    try:
+        get_redis_connection().publish(INVALIDATION_CHANNEL, ",".join(keys))
+    except RedisError:
+        logger.warning("Couldn't publish the invalidation of users %s.",
+                       keys, exc_info=True)
+
+
+def handle_message(message):
+    if message["type"] != "message":
+        return
+    for key in message["data"].decode().split(","):
+        local_cache.delete(key)
+
+
+def listen():
+    while True:
+        try:
+            pubsub = get_redis_connection().pubsub(
+                ignore_subscribe_messages=True
+            )
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            # Invalidations published while not subscribed are lost.
+            local_cache.clear()
+            for message in pubsub.listen():
+                handle_message(message)
+        except Exception:
+            logger.warning("User cache invalidation listener failed, "
+                           "resubscribing.", exc_info=True)
+            time.sleep(RECONNECT_DELAY)
+
+
+def ensure_listener():
+    """
+    Starts the listener thread once per process. Checking the pid keeps
+    it working in workers forked after the first lookup.
+    """
+    global _listener_pid
+    if _listener_pid == os.getpid():
+        return
+    with _listener_lock:
+        if _listener_pid == os.getpid():
+            return
+        local_cache.clear()
+        thread = threading.Thread(
+            target=listen, name="user-cache-invalidation", daemon=True
+        )
+        thread.start()
+        _listener_pid = os.getpid()
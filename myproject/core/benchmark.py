@@ -0,0 +1,77 @@
+"""
+Small helpers shared by the benchmark suites (see accounts.benchmarks).
+"""
+import math
+import platform
+import subprocess
+from time import perf_counter
+
+import django
+
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = int(math.ceil(percent / 100.0 * len(sorted_values)))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def summarize(durations, errors=0):
+    """Turns a list of durations (in seconds) into a JSON friendly dict."""
+    values = sorted(durations)
+    total = sum(values)
+
+    def ms(value):
+        return None if value is None else round(value * 1000, 3)
+
+    return {
+        "iterations": len(values),
+        "errors": errors,
+        "total_s": round(total, 6),
+        "throughput_per_s": round(len(values) / total, 2) if total else None,
+        "mean_ms": ms(total / len(values)) if values else None,
+        "min_ms": ms(values[0]) if values else None,
+        "p50_ms": ms(percentile(values, 50)),
+        "p95_ms": ms(percentile(values, 95)),
+        "p99_ms": ms(percentile(values, 99)),
+        "max_ms": ms(values[-1]) if values else None,
+    }
+
+
+def measure(func, iterations, warmup=0, setup=None):
+    """
+    Calls func `warmup` + `iterations` times and returns the summary of the
+    timed calls. `setup(i)` runs untimed before each call and its return
+    value is passed to func. func may return False to count an error.
+    """
+    for i in range(warmup):
+        func(setup(i) if setup else None)
+
+    durations = []
+    errors = 0
+    for i in range(iterations):
+        argument = setup(warmup + i) if setup else None
+        start = perf_counter()
+        ok = func(argument)
+        durations.append(perf_counter() - start)
+        if ok is False:
+            errors += 1
+    return summarize(durations, errors)
+
+
+def environment():
+    """Describes where the numbers were taken, to make diffs meaningful."""
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "machine": platform.machine(),
+    }
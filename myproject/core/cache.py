@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django_redis.cache import RedisCache
+
+from . import metrics
+
+_missing = object()
+
+
+class InstrumentedRedisCache(RedisCache):
+    """
+    RedisCache which reports hits and misses to the metrics of the
+    running request.
+    """
+
+    def get(self, key, default=None, version=None, client=None):
+        value = super(InstrumentedRedisCache, self).get(
+            key, default=_missing, version=version, client=client
+        )
+        current = metrics.get_current()
+        if value is _missing:
+            if current is not None:
+                current.record_cache(misses=1)
+            return default
+        if current is not None:
+            current.record_cache(hits=1)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = super(InstrumentedRedisCache, self).get_many(
+            keys, version=version
+        )
+        current = metrics.get_current()
+        if current is not None:
+            current.record_cache(
+                hits=len(values), misses=len(keys) - len(values)
+            )
+        return values
+
+
+class LocalLRUCache:
+    """
+    Thread-safe, bounded in-process cache. The least recently used entry
+    is evicted once `maxsize` is reached and entries expire `timeout`
+    seconds after they were set.
+    """
+
+    def __init__(self, maxsize, timeout, timer=time.monotonic):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.timer = timer
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires = item
+            if expires <= self.timer():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, self.timer() + self.timeout)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,142 @@
+import asyncio
+import functools
+
+from channels.db import database_sync_to_async
+from channels.generic.http import AsyncHttpConsumer
+from channels.http import AsgiRequest
+from django.conf import settings
+from rest_framework import exceptions
+
+from config import routers
+
+from . import health as checks
+from . import metrics
+from .middleware import (get_metrics_headers, instrument_connections,
+                         log_request, restore_connections)
+from .renderers import ORJSONRenderer
+from .routing import get_header
+
+
+class APIConsumer(AsyncHttpConsumer):
+    """
+    Base of the async variants of API endpoints, which config.routing serves
+    next to the Django views. Blocking work (the ORM, Redis) runs on the
+    thread pool through `self.database_sync_to_async`, so a connection
+    waiting for it or for the client doesn't occupy a thread.
+
+    Django's middleware doesn't run for consumers, so they take over what
+    it does for the views: the read-your-writes routing of
+    config.routers, the request metrics of RequestMetricsMiddleware and
+    the headers of SecurityMiddleware and XFrameOptionsMiddleware.
+
+    Subclasses set `url_name` (the one of the view they stand in for),
+    implement `respond(body)` and may raise rest_framework's
+    APIExceptions, which are answered like DRF's exception handler does.
+    """
+
+    renderer = ORJSONRenderer()
+    url_name = None
+
+    def get_header(self, name):
+        return get_header(self.scope, name)
+
+    def database_sync_to_async(self, func):
+        """
+        channels' database_sync_to_async, but the worker thread gets the
+        router state and the metrics collector of this request, and the
+        client is pinned to the primary if `func` wrote. Threads are picked
+        from a pool per call, so the state is set up and torn down around
+        every call.
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            routers.start_request(self.request)
+            metrics.set_current(self.metrics)
+            instrumented = instrument_connections(self.metrics)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                restore_connections(instrumented)
+                metrics.set_current(None)
+                routers.finish_request()
+        return database_sync_to_async(wrapper)
+
+    def get_security_headers(self):
+        """The headers SecurityMiddleware and XFrameOptionsMiddleware add."""
+        headers = []
+        if settings.SECURE_HSTS_SECONDS and self.request.is_secure():
+            value = "max-age={}".format(settings.SECURE_HSTS_SECONDS)
+            if settings.SECURE_HSTS_INCLUDE_SUBDOMAINS:
+                value += "; includeSubDomains"
+            if settings.SECURE_HSTS_PRELOAD:
+                value += "; preload"
+            headers.append(("Strict-Transport-Security", value))
+        if settings.SECURE_CONTENT_TYPE_NOSNIFF:
+            headers.append(("X-Content-Type-Options", "nosniff"))
+        if settings.SECURE_BROWSER_XSS_FILTER:
+            headers.append(("X-XSS-Protection", "1; mode=block"))
+        headers.append((
+            "X-Frame-Options",
+            getattr(settings, "X_FRAME_OPTIONS", "SAMEORIGIN").upper()
+        ))
+        return headers
+
+    async def send_json(self, status, data=None, headers=()):
+        body = self.renderer.render(data)
+        headers = list(headers) + self.get_security_headers()
+        self.metrics.stop()
+        if settings.REQUEST_METRICS_HEADERS:
+            headers.extend(get_metrics_headers(self.metrics))
+        log_request(self.request.method, self.metrics, status)
+
+        response_headers = [
+            (b"Content-Type", b"application/json"),
+            (b"Content-Length", str(len(body)).encode()),
+        ]
+        response_headers.extend(
+            (key.encode(), value.encode()) for key, value in headers
+        )
+        if self.scope["method"] == "HEAD":
+            body = b""
+        await self.send_response(status, body, headers=response_headers)
+
+    async def handle(self, body):
+        self.request = AsgiRequest(self.scope, body)
+        self.metrics = metrics.RequestMetrics()
+        self.metrics.url_name = self.url_name
+        try:
+            await self.respond(body)
+        except exceptions.APIException as exc:
+            headers = []
+            if isinstance(exc, (exceptions.NotAuthenticated,
+                                exceptions.AuthenticationFailed)):
+                headers.append(("WWW-Authenticate", "Token"))
+            if isinstance(exc.detail, (list, dict)):
+                data = exc.detail
+            else:
+                data = {"detail": exc.detail}
+            await self.send_json(exc.status_code, data, headers)
+
+    async def respond(self, body):
+        raise NotImplementedError(
+            "Subclasses of APIConsumer must provide a respond() method."
+        )
+
+
+class HealthConsumer(APIConsumer):
+    """Async variant of core.views.health, running both checks at once."""
+
+    url_name = "health"
+
+    async def respond(self, body):
+        database, cache = await asyncio.gather(
+            self.database_sync_to_async(checks.check_database)(),
+            self.database_sync_to_async(checks.check_cache)(),
+        )
+        status, data = checks.get_status({
+            "database": database,
+            "cache": cache,
+        })
+        await self.send_json(
+            status, data, [("Cache-Control", "max-age=0, no-cache, no-store")]
+        )
@@ -0,0 +1,82 @@
+"""
+PostgreSQL backend drawing its connections from a per-process
+core.db.pool.ConnectionPool instead of opening one per request.
+
+Configure the pool with the "POOL" key of the database settings:
+
+    'POOL': {
+        'MAX_SIZE': 10,                 # connections per process
+        'MAX_LIFETIME': 30 * 60,        # seconds
+        'TIMEOUT': 10,                  # seconds to wait for a connection
+        'HEALTH_CHECK_INTERVAL': 30,    # idle seconds before a SELECT 1
+    }
+
+Keep CONN_MAX_AGE at 0: closing the connection at the end of a request
+returns it to the pool.
+"""
+from functools import partial
+
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base
+
+from ...pool import ConnectionPool, get_pool
+from .creation import DatabaseCreation
+
+Database = base.Database
+
+POOL_DEFAULTS = {
+    'MAX_SIZE': 10,
+    'MAX_LIFETIME': 30 * 60,
+    'TIMEOUT': 10,
+    'HEALTH_CHECK_INTERVAL': 30,
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    pool = None
+
+    def get_pool(self, conn_params):
+        options = dict(POOL_DEFAULTS, **self.settings_dict.get('POOL', {}))
+        key = (
+            self.alias,
+            conn_params.get('database'),
+            tuple(sorted((k, str(v)) for k, v in conn_params.items())),
+        )
+        return get_pool(key, lambda: ConnectionPool(
+            partial(Database.connect, **conn_params),
+            max_size=options['MAX_SIZE'],
+            max_lifetime=options['MAX_LIFETIME'],
+            timeout=options['TIMEOUT'],
+            health_check_interval=options['HEALTH_CHECK_INTERVAL'],
+        ))
+
+    def get_new_connection(self, conn_params):
+        # Maintenance connections (e.g. to create the test database) aren't
+        # pooled, so they can't keep the database they dropped open.
+        if self.alias == NO_DB_ALIAS:
+            return super(DatabaseWrapper, self).get_new_connection(conn_params)
+
+        self.pool = self.get_pool(conn_params)
+        connection = self.pool.acquire()
+
+        # See postgresql.base.DatabaseWrapper.get_new_connection.
+        options = self.settings_dict['OPTIONS']
+        try:
+            self.isolation_level = options['isolation_level']
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        if self.pool is None:
+            return super(DatabaseWrapper, self)._close()
+        with self.wrap_database_errors:
+            self.pool.release(self.connection)
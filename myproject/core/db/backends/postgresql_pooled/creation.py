@@ -0,0 +1,13 @@
+from django.db.backends.postgresql import creation
+
+from ...pool import close_pools
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Postgres refuses to drop a database with open connections.
+        close_pools(test_database_name)
+        super(DatabaseCreation, self)._destroy_test_db(
+            test_database_name, verbosity
+        )
@@ -0,0 +1,204 @@
+"""
+A bounded, thread-safe pool of psycopg2 connections, used by the
+core.db.backends.postgresql_pooled database backend.
+"""
+import os
+import threading
+import time
+from time import perf_counter
+
+from psycopg2 import Error, OperationalError
+from psycopg2.extensions import (TRANSACTION_STATUS_IDLE,
+                                 TRANSACTION_STATUS_INERROR,
+                                 TRANSACTION_STATUS_INTRANS)
+
+from .. import metrics
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """
+    Keeps up to `max_size` connections per process, opened by `connect`.
+
+    - `acquire()` waits up to `timeout` seconds for a free connection and
+      raises OperationalError if there is none.
+    - Connections idle for `health_check_interval` seconds or longer are
+      checked with `SELECT 1` on checkout, broken ones are replaced.
+    - Connections older than `max_lifetime` seconds are closed instead of
+      reused, so e.g. a failover of the database is picked up.
+    - `release()` rolls back open transactions before reusing a connection.
+      Session state (SET ...) isn't reset, don't change it on pooled
+      connections.
+    """
+
+    def __init__(self, connect, max_size=10, max_lifetime=30 * 60, timeout=10,
+                 health_check_interval=30, timer=time.monotonic):
+        self.pid = os.getpid()
+        self.connect = connect
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.timer = timer
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        # (connection, created, last used), the most recently used last.
+        self._idle = []
+        # connection -> created
+        self._in_use = {}
+        self.counters = {
+            "connects": 0,
+            "checkouts": 0,
+            "timeouts": 0,
+            "health_check_failures": 0,
+            "expired": 0,
+            "discarded": 0,
+        }
+
+    def acquire(self):
+        start = perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            self.counters["timeouts"] += 1
+            raise OperationalError(
+                "No database connection available within {}s (pool size "
+                "{}).".format(self.timeout, self.max_size)
+            )
+        try:
+            connection, created = self._checkout()
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._in_use[connection] = created
+            self.counters["checkouts"] += 1
+        current = metrics.get_current()
+        if current is not None:
+            current.increment(
+                "db_checkout_ms", round((perf_counter() - start) * 1000, 3)
+            )
+        return connection
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                item = self._idle.pop() if self._idle else None
+            if item is None:
+                connection = self.connect()
+                with self._lock:
+                    self.counters["connects"] += 1
+                current = metrics.get_current()
+                if current is not None:
+                    current.increment("db_connects")
+                return connection, self.timer()
+            connection, created, last_used = item
+            if self._is_usable(connection, created, last_used):
+                return connection, created
+            self._close(connection)
+
+    def _is_usable(self, connection, created, last_used):
+        now = self.timer()
+        if connection.closed:
+            return False
+        if self.max_lifetime and now - created >= self.max_lifetime:
+            self.counters["expired"] += 1
+            return False
+        if now - last_used >= self.health_check_interval:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                if connection.get_transaction_status() != \
+                        TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except Error:
+                self.counters["health_check_failures"] += 1
+                return False
+        return True
+
+    def _reset(self, connection):
+        if connection.closed:
+            return False
+        status = connection.get_transaction_status()
+        if status == TRANSACTION_STATUS_IDLE:
+            return True
+        if status in (TRANSACTION_STATUS_INTRANS, TRANSACTION_STATUS_INERROR):
+            try:
+                connection.rollback()
+            except Error:
+                return False
+            return True
+        # Active or unknown, i.e. busy or broken.
+        return False
+
+    def release(self, connection):
+        with self._lock:
+            created = self._in_use.pop(connection)
+        try:
+            reusable = (
+                self._reset(connection) and
+                (not self.max_lifetime or
+                 self.timer() - created < self.max_lifetime)
+            )
+            if reusable:
+                with self._lock:
+                    self._idle.append((connection, created, self.timer()))
+            else:
+                self.counters["discarded"] += 1
+                self._close(connection)
+        finally:
+            self._slots.release()
+
+    def _close(self, connection):
+        try:
+            connection.close()
+        except Error:
+            pass
+
+    def close(self):
+        """Closes the idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, created, last_used in idle:
+            self._close(connection)
+
+    def get_stats(self):
+        with self._lock:
+            stats = {
+                "max_size": self.max_size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+            }
+        stats.update(self.counters)
+        return stats
+
+
+def get_pool(key, factory):
+    """
+    Returns the pool registered under `key`, creating it with `factory()`
+    first. Pools inherited through fork() are replaced (but not closed,
+    their sockets belong to the parent).
+    """
+    pool = _pools.get(key)
+    if pool is not None and pool.pid == os.getpid():
+        return pool
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool.pid != os.getpid():
+            pool = _pools[key] = factory()
+        return pool
+
+
+def close_pools(database=None):
+    """Closes the idle connections of all pools (to `database`)."""
+    for (alias, name, params), pool in list(_pools.items()):
+        if database is None or name == database:
+            pool.close()
+
+
+def get_stats():
+    """Stats of this process' pools, keyed by "<alias>:<database>"."""
+    return {
+        "{}:{}".format(alias, name): pool.get_stats()
+        for (alias, name, params), pool in list(_pools.items())
+    }
@@ -0,0 +1,40 @@
+"""
+Health checks of the backing services, served by core.views.health (WSGI)
+and core.consumers.HealthConsumer (ASGI).
+"""
+import logging
+
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+
+logger = logging.getLogger(__name__)
+
+
+def check_database():
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError:
+        logger.warning("Database health check failed.", exc_info=True)
+        return False
+    return True
+
+
+def check_cache():
+    try:
+        cache.get("core:health")
+    except Exception:
+        logger.warning("Cache health check failed.", exc_info=True)
+        return False
+    return True
+
+
+def get_status(checks):
+    """
+    Turns the results of the checks, e.g. {"database": True}, into the
+    response status and body.
+    """
+    ok = all(checks.values())
+    data = {"status": "ok" if ok else "unavailable"}
+    data.update(checks)
+    return (200 if ok else 503), data
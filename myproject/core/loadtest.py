@@ -0,0 +1,134 @@
+"""
+A minimal asyncio HTTP/1.1 load generator holding many concurrent
+keep-alive connections, used by manage.py loadtest to compare how many
+connections the WSGI and the ASGI deployment sustain.
+"""
+import asyncio
+import ssl
+from time import perf_counter
+from urllib.parse import urlsplit
+
+from .benchmark import summarize
+
+
+class LoadStats:
+
+    def __init__(self):
+        self.connected = 0
+        self.failed = 0
+        self.errors = 0
+        self.durations = []
+
+    def as_dict(self, connections, duration):
+        summary = summarize(self.durations, self.errors)
+        summary["throughput_per_s"] = round(len(self.durations) / duration, 2)
+        summary.update({
+            "connections": connections,
+            "connected": self.connected,
+            "failed": self.failed,
+        })
+        return summary
+
+    def sustained(self, connections, max_error_rate):
+        """
+        Whether all `connections` stayed up and answered (almost) every
+        request successfully.
+        """
+        if self.failed or self.connected < connections:
+            return False
+        requests = len(self.durations)
+        return bool(requests) and self.errors / requests <= max_error_rate
+
+
+def build_request(url, method="GET", headers=(), body=b""):
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    lines = ["{} {} HTTP/1.1".format(method, path), "Host: " + parts.netloc]
+    lines.extend(headers)
+    if body:
+        lines.append("Content-Length: {}".format(len(body)))
+    return "\r\n".join(lines).encode("latin1") + b"\r\n\r\n" + body
+
+
+async def read_response(reader):
+    """
+    Reads one response and returns its status and whether the server keeps
+    the connection open.
+    """
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin1").split("\r\n")
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            key, value = line.split(":", 1)
+            headers[key.strip().lower()] = value.strip().lower()
+
+    if headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            # The chunk and its CRLF, or the CRLF ending the body.
+            await reader.readexactly(size + 2)
+            if not size:
+                break
+    elif "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("connection") == "close":
+        await reader.read()
+    return status, headers.get("connection") != "close"
+
+
+async def run_client(url, request, deadline, timeout, stats):
+    """
+    Sends requests over one keep-alive connection until `deadline`,
+    reconnecting when the server closes it.
+    """
+    loop = asyncio.get_event_loop()
+    parts = urlsplit(url)
+    secure = parts.scheme == "https"
+    port = parts.port or (443 if secure else 80)
+    writer = None
+    connected = False
+    try:
+        while loop.time() < deadline:
+            if writer is None:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(
+                        parts.hostname, port,
+                        ssl=ssl.create_default_context() if secure else None
+                    ),
+                    timeout
+                )
+            start = perf_counter()
+            writer.write(request)
+            status, keep_alive = await asyncio.wait_for(
+                read_response(reader), timeout
+            )
+            stats.durations.append(perf_counter() - start)
+            if not connected:
+                connected = True
+                stats.connected += 1
+            if status >= 400:
+                stats.errors += 1
+            if not keep_alive:
+                writer.close()
+                writer = None
+    except (OSError, ValueError, asyncio.TimeoutError,
+            asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+        stats.failed += 1
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def run(url, request, connections, duration, timeout):
+    """Holds `connections` concurrent clients for `duration` seconds."""
+    stats = LoadStats()
+    deadline = asyncio.get_event_loop().time() + duration
+    await asyncio.gather(*[
+        run_client(url, request, deadline, timeout, stats)
+        for i in range(connections)
+    ])
+    return stats
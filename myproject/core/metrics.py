@@ -0,0 +1,78 @@
+"""
+Per-request metrics collected by core.middleware.RequestMetricsMiddleware.
+
+The collector lives in a thread local, so code deep inside a request (the
+cache backend, cursor wrappers, throttles, ...) can record into it without
+having the request object at hand.
+"""
+import threading
+from time import perf_counter
+
+_local = threading.local()
+
+
+class RequestMetrics:
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.duration = None
+        self.url_name = None
+        self.query_count = 0
+        self.query_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.counters = {}
+
+    def record_query(self, duration, count=1):
+        self.query_count += count
+        self.query_time += duration
+
+    def record_cache(self, hits=0, misses=0):
+        self.cache_hits += hits
+        self.cache_misses += misses
+
+    def increment(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def stop(self):
+        self.duration = perf_counter() - self.started
+
+    def as_dict(self):
+        data = {
+            "url_name": self.url_name,
+            "query_count": self.query_count,
+            "query_time_ms": round(self.query_time * 1000, 3),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "duration_ms": round((self.duration or 0) * 1000, 3),
+        }
+        data.update(self.counters)
+        return data
+
+
+def start():
+    """Starts collecting metrics for the current thread's request."""
+    _local.metrics = RequestMetrics()
+    return _local.metrics
+
+
+def set_current(metrics):
+    """
+    Makes `metrics` the collector of the current thread, e.g. of a worker
+    thread running blocking calls of an async request, or removes it (None).
+    """
+    _local.metrics = metrics
+
+
+def finish():
+    """Stops collecting and returns the collected metrics."""
+    metrics = getattr(_local, 'metrics', None)
+    _local.metrics = None
+    if metrics is not None:
+        metrics.stop()
+    return metrics
+
+
+def get_current():
+    """Returns the collector of the running request or None."""
+    return getattr(_local, 'metrics', None)
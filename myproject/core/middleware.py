@@ -0,0 +1,119 @@
+import logging
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.utils import CursorDebugWrapper, CursorWrapper
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedCursorMixin:
+
+    def execute(self, sql, params=None):
+        start = perf_counter()
+        try:
+            return super(InstrumentedCursorMixin, self).execute(sql, params)
+        finally:
+            self.metrics.record_query(perf_counter() - start)
+
+    def executemany(self, sql, param_list):
+        start = perf_counter()
+        try:
+            return super(InstrumentedCursorMixin, self).executemany(
+                sql, param_list
+            )
+        finally:
+            self.metrics.record_query(perf_counter() - start)
+
+
+class InstrumentedCursorWrapper(InstrumentedCursorMixin, CursorWrapper):
+
+    def __init__(self, cursor, db, metrics):
+        super(InstrumentedCursorWrapper, self).__init__(cursor, db)
+        self.metrics = metrics
+
+
+class InstrumentedCursorDebugWrapper(InstrumentedCursorMixin,
+                                     CursorDebugWrapper):
+
+    def __init__(self, cursor, db, metrics):
+        super(InstrumentedCursorDebugWrapper, self).__init__(cursor, db)
+        self.metrics = metrics
+
+
+def instrument_connections(current):
+    """
+    Makes the current thread's connections record their queries into
+    `current`. Returns them for restore_connections().
+    """
+    instrumented = []
+    for connection in connections.all():
+        connection.make_cursor = (
+            lambda cursor, db=connection:
+                InstrumentedCursorWrapper(cursor, db, current)
+        )
+        connection.make_debug_cursor = (
+            lambda cursor, db=connection:
+                InstrumentedCursorDebugWrapper(cursor, db, current)
+        )
+        instrumented.append(connection)
+    return instrumented
+
+
+def restore_connections(instrumented):
+    for connection in instrumented:
+        del connection.make_cursor
+        del connection.make_debug_cursor
+
+
+def get_metrics_headers(current):
+    return [
+        ('X-Query-Count', str(current.query_count)),
+        ('X-Query-Time', "%.3f" % (current.query_time * 1000)),
+        ('X-Cache-Hits', str(current.cache_hits)),
+        ('X-Cache-Misses', str(current.cache_misses)),
+        ('X-Response-Time', "%.3f" % (current.duration * 1000)),
+    ]
+
+
+def log_request(method, current, status_code):
+    logger.info(
+        "%s %s %s", method, current.url_name, status_code,
+        extra={"metrics": current.as_dict()}
+    )
+
+
+class RequestMetricsMiddleware:
+    """
+    Records query count, database time, cache hits/misses and wall time of
+    every request, keyed by the resolved URL name (e.g. api:auth:login).
+
+    The numbers are always logged to the "core.middleware" logger and are
+    added as X-* response headers when REQUEST_METRICS_HEADERS is set.
+    core.consumers.APIConsumer does the same for the async endpoints.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        current = metrics.start()
+        instrumented = instrument_connections(current)
+        try:
+            response = self.get_response(request)
+        finally:
+            restore_connections(instrumented)
+            metrics.finish()
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        if resolver_match is not None:
+            current.url_name = resolver_match.view_name
+
+        log_request(request.method, current, response.status_code)
+        if settings.REQUEST_METRICS_HEADERS:
+            for name, value in get_metrics_headers(current):
+                response[name] = value
+        return response
@@ -0,0 +1,62 @@
+import json
+
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator which trusts the Postgres planner instead of running
+    `SELECT COUNT(*)` on big tables.
+
+    Unfiltered querysets use the table's `reltuples` statistic, filtered ones
+    the row estimate of `EXPLAIN`. Estimates below `estimate_threshold` are
+    replaced by an exact count, so small tables and narrow filters still
+    show exact numbers.
+    """
+
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        estimate = self.estimate()
+        if estimate is None or estimate < self.estimate_threshold:
+            return super().count
+        return estimate
+
+    def estimate(self):
+        queryset = self.object_list
+        if not hasattr(queryset, "query"):
+            return None
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        if not queryset.query.where:
+            return self.estimate_table(connection, queryset.model._meta.db_table)
+        return self.estimate_query(connection, queryset)
+
+    def estimate_table(self, connection, table):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [connection.ops.quote_name(table)]
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        # reltuples is -1 (or 0) for tables which were never analyzed.
+        return max(int(row[0]), 0)
+
+    def estimate_query(self, connection, queryset):
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,28 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson. UUIDs and datetimes are serialized
+    natively, everything else orjson doesn't know (lazy translations,
+    querysets, decimals, ...) falls back to DRF's JSONEncoder.
+
+    orjson only knows one indentation width, so any requested indent
+    (e.g. by the browsable API) pretty prints with two spaces.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        options = self.options
+        if self.get_indent(accepted_media_type, renderer_context):
+            options |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(
+            data, default=self.encoder_class().default, option=options
+        )
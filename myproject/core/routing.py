@@ -0,0 +1,40 @@
+from channels.http import AsgiHandler
+
+
+def get_header(scope, name):
+    name = name.lower().encode()
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin1")
+    return None
+
+
+class AsyncRouter:
+    """
+    ASGI application sending the requests an async consumer can answer to
+    it and all others (e.g. other methods, or session authentication which
+    needs the middleware) to `fallback`, by default the Django views.
+
+    `authorization` restricts the consumer to requests with this
+    Authorization keyword, e.g. "Token".
+    """
+
+    def __init__(self, consumer, methods=("GET", "HEAD"), authorization=None,
+                 fallback=AsgiHandler):
+        self.consumer = consumer
+        self.methods = methods
+        self.authorization = authorization
+        self.fallback = fallback
+
+    def matches(self, scope):
+        if scope["method"] not in self.methods:
+            return False
+        if self.authorization is None:
+            return True
+        header = get_header(scope, "Authorization") or ""
+        return header.split(" ", 1)[0] == self.authorization
+
+    def __call__(self, scope):
+        if self.matches(scope):
+            return self.consumer(scope)
+        return self.fallback(scope)
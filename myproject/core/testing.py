@@ -0,0 +1,67 @@
+import asyncio
+
+from channels.testing import HttpCommunicator
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class _AssertMaxNumQueriesContext(CaptureQueriesContext):
+
+    def __init__(self, test_case, budget, connection):
+        self.test_case = test_case
+        self.budget = budget
+        super(_AssertMaxNumQueriesContext, self).__init__(connection)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super(_AssertMaxNumQueriesContext, self).__exit__(
+            exc_type, exc_value, traceback
+        )
+        if exc_type is not None:
+            return
+        executed = len(self)
+        self.test_case.assertLessEqual(
+            executed, self.budget,
+            "%d queries executed, the budget is %d\n%s" % (
+                executed, self.budget,
+                '\n'.join(
+                    '%d. %s' % (i, query['sql'])
+                    for i, query in enumerate(self.captured_queries, start=1)
+                )
+            )
+        )
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin to guard endpoints against N+1 regressions.
+
+    Usage:
+        with self.assertMaxNumQueries(self.query_budgets['api:auth:login']):
+            self.client.post(...)
+    """
+
+    query_budgets = {}
+
+    def assertMaxNumQueries(self, budget, using=DEFAULT_DB_ALIAS):
+        return _AssertMaxNumQueriesContext(self, budget, connections[using])
+
+    def assertQueryBudget(self, url_name, using=DEFAULT_DB_ALIAS):
+        return self.assertMaxNumQueries(self.query_budgets[url_name], using)
+
+
+def asgi_request(application, method, path, body=b"", headers=()):
+    """
+    Runs a single request through an ASGI application and returns the
+    response dict (status, headers and body) of HttpCommunicator. Use it in
+    TransactionTestCases, consumers query on other threads.
+    """
+    async def request():
+        communicator = HttpCommunicator(
+            application, method, path, body=body,
+            headers=[
+                (key.lower().encode(), value.encode())
+                for key, value in headers
+            ]
+        )
+        return await communicator.get_response(timeout=5)
+    return asyncio.get_event_loop().run_until_complete(request())
@@ -0,0 +1,34 @@
+from django.test import SimpleTestCase
+
+from ..benchmark import measure, percentile, summarize
+
+
+class BenchmarkHelpersTestCase(SimpleTestCase):
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertIsNone(percentile([], 50))
+
+    def test_summarize(self):
+        summary = summarize([0.001, 0.002, 0.003, 0.004], errors=1)
+        self.assertEqual(summary['iterations'], 4)
+        self.assertEqual(summary['errors'], 1)
+        self.assertEqual(summary['p50_ms'], 2.0)
+        self.assertEqual(summary['max_ms'], 4.0)
+        self.assertEqual(summary['throughput_per_s'], 400.0)
+
+    def test_measure_counts_errors_and_runs_setup(self):
+        calls = []
+
+        def func(i):
+            calls.append(i)
+            return i % 2 == 0
+
+        summary = measure(func, iterations=4, warmup=2, setup=lambda i: i)
+        self.assertEqual(calls, [0, 1, 2, 3, 4, 5])
+        self.assertEqual(summary['iterations'], 4)
+        self.assertEqual(summary['errors'], 2)
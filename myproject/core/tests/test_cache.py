@@ -0,0 +1,45 @@
+from django.test import SimpleTestCase
+
+from ..cache import LocalLRUCache
+
+
+class FakeTimer:
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class LocalLRUCacheTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.cache = LocalLRUCache(maxsize=2, timeout=10, timer=self.timer)
+
+    def test_get_set_delete(self):
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.set("a", 1)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.cache.delete("a")
+        self.assertEqual(self.cache.get("a", "default"), "default")
+
+    def test_evicts_least_recently_used(self):
+        """Test if the entry used longest ago is evicted first."""
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.get("c"), 3)
+
+    def test_expires(self):
+        self.cache.set("a", 1)
+        self.timer.now = 9
+        self.assertEqual(self.cache.get("a"), 1)
+        self.timer.now = 10
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(len(self.cache), 0)
@@ -0,0 +1,38 @@
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from ..consumers import HealthConsumer
+from ..testing import asgi_request
+
+
+class HealthViewTestCase(TestCase):
+
+    def test_health(self):
+        """Test if the health check reports the database and the cache."""
+        response = self.client.get(reverse('health'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {"status": "ok", "database": True, "cache": True}
+        )
+
+    def test_health_cache_down(self):
+        """Test if a failing check answers 503."""
+        with mock.patch('core.health.check_cache', return_value=False):
+            response = self.client.get(reverse('health'))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["status"], "unavailable")
+
+
+class HealthConsumerTestCase(TransactionTestCase):
+
+    def test_health(self):
+        """Test if the async health check answers like the view."""
+        response = asgi_request(HealthConsumer, "GET", "/health/")
+        self.assertEqual(response["status"], 200)
+        self.assertEqual(
+            response["body"],
+            b'{"status":"ok","database":true,"cache":true}'
+        )
@@ -0,0 +1,75 @@
+import asyncio
+
+from django.test import SimpleTestCase
+
+from ..loadtest import build_request, run
+
+
+class LoadTestTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.loop = asyncio.get_event_loop()
+
+    def serve(self, response):
+        async def handle(reader, writer):
+            try:
+                while True:
+                    await reader.readuntil(b"\r\n\r\n")
+                    writer.write(response)
+                    await writer.drain()
+            except (OSError, asyncio.IncompleteReadError):
+                writer.close()
+
+        server = self.loop.run_until_complete(
+            asyncio.start_server(handle, "127.0.0.1", 0)
+        )
+
+        def close():
+            server.close()
+            self.loop.run_until_complete(server.wait_closed())
+        self.addCleanup(close)
+        return "http://127.0.0.1:{}/health/".format(
+            server.sockets[0].getsockname()[1]
+        )
+
+    def load(self, url, connections=5):
+        return self.loop.run_until_complete(
+            run(url, build_request(url), connections, 0.2, 1)
+        )
+
+    def test_build_request(self):
+        request = build_request(
+            "http://localhost:8000/api/users/lookup/?a=1", "POST",
+            ["Content-Type: application/json"], b"{}"
+        )
+        self.assertEqual(
+            request,
+            b"POST /api/users/lookup/?a=1 HTTP/1.1\r\n"
+            b"Host: localhost:8000\r\n"
+            b"Content-Type: application/json\r\n"
+            b"Content-Length: 2\r\n\r\n{}"
+        )
+
+    def test_keep_alive_connections(self):
+        """Test if every client keeps its connection for many requests."""
+        url = self.serve(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+        stats = self.load(url)
+        self.assertEqual(stats.connected, 5)
+        self.assertEqual(stats.failed, 0)
+        self.assertGreater(len(stats.durations), 5)
+        self.assertTrue(stats.sustained(5, 0.01))
+
+    def test_errors_not_sustained(self):
+        """Test if error responses fail the level."""
+        url = self.serve(
+            b"HTTP/1.1 503 Service Unavailable\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n2\r\nno\r\n0\r\n\r\n"
+        )
+        stats = self.load(url)
+        self.assertEqual(stats.errors, len(stats.durations))
+        self.assertFalse(stats.sustained(5, 0.01))
+
+    def test_connection_refused(self):
+        """Test if clients which can't connect are counted as failed."""
+        stats = self.load("http://127.0.0.1:1/")
+        self.assertEqual((stats.connected, stats.failed), (0, 5))
@@ -0,0 +1,45 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .. import metrics
+
+
+class RequestMetricsMiddlewareTestCase(TestCase):
+
+    def setUp(self):
+        self.url = reverse('accounts:email_activation_done')
+
+    @override_settings(REQUEST_METRICS_HEADERS=True)
+    def test_metrics_headers(self):
+        """Test if the collected metrics are added as response headers."""
+        response = self.client.get(self.url)
+        for header in ('X-Query-Count', 'X-Query-Time', 'X-Cache-Hits',
+                       'X-Cache-Misses', 'X-Response-Time'):
+            self.assertTrue(response.has_header(header))
+        self.assertEqual(response['X-Query-Count'], '0')
+
+    @override_settings(REQUEST_METRICS_HEADERS=False)
+    def test_metrics_headers_disabled(self):
+        """Test if no headers are added when disabled."""
+        response = self.client.get(self.url)
+        self.assertFalse(response.has_header('X-Query-Count'))
+
+    def test_metrics_finished_after_request(self):
+        """Test if the collector is torn down after the response."""
+        self.client.get(self.url)
+        self.assertIsNone(metrics.get_current())
+
+
+class RequestMetricsTestCase(TestCase):
+
+    def test_as_dict(self):
+        current = metrics.start()
+        current.record_query(0.002)
+        current.record_cache(hits=2, misses=1)
+        current.increment('throttled')
+        metrics.finish()
+        data = current.as_dict()
+        self.assertEqual(data['query_count'], 1)
+        self.assertEqual(data['cache_hits'], 2)
+        self.assertEqual(data['cache_misses'], 1)
+        self.assertEqual(data['throttled'], 1)
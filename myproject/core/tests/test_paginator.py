@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from ..paginator import EstimatedCountPaginator
+
+User = get_user_model()
+
+
+class AlwaysEstimatingPaginator(EstimatedCountPaginator):
+    estimate_threshold = 0
+
+
+class EstimatedCountPaginatorTestCase(TestCase):
+
+    def setUp(self):
+        for i in range(3):
+            User.objects.create_user(email="user{}@test.com".format(i))
+
+    def test_exact_count_below_threshold(self):
+        """Test if small results are counted exactly."""
+        paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 2)
+        self.assertEqual(paginator.count, 3)
+        self.assertEqual(paginator.num_pages, 2)
+
+    def test_unfiltered_estimate_skips_count(self):
+        """Test if an unfiltered queryset only reads the planner statistics."""
+        paginator = AlwaysEstimatingPaginator(User.objects.order_by("pk"), 2)
+        with self.assertNumQueries(1) as context:
+            count = paginator.count
+        self.assertGreaterEqual(count, 0)
+        self.assertIn("reltuples", context.captured_queries[0]["sql"])
+
+    def test_filtered_estimate_uses_explain(self):
+        queryset = User.objects.filter(is_active=True).order_by("pk")
+        paginator = AlwaysEstimatingPaginator(queryset, 2)
+        with self.assertNumQueries(1) as context:
+            count = paginator.count
+        self.assertGreaterEqual(count, 0)
+        self.assertTrue(context.captured_queries[0]["sql"].startswith("EXPLAIN"))
+
+    def test_empty_result_set(self):
+        paginator = AlwaysEstimatingPaginator(User.objects.filter(pk__in=[]), 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(paginator.count, 0)
+
+    def test_plain_list(self):
+        paginator = EstimatedCountPaginator([1, 2, 3], 2)
+        self.assertEqual(paginator.count, 3)
@@ -0,0 +1,135 @@
+from django.test import SimpleTestCase
+from psycopg2 import OperationalError
+from psycopg2.extensions import (TRANSACTION_STATUS_IDLE,
+                                 TRANSACTION_STATUS_INTRANS,
+                                 TRANSACTION_STATUS_UNKNOWN)
+
+from ..db.pool import ConnectionPool
+
+
+class FakeCursor:
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def execute(self, sql):
+        if self.connection.broken:
+            raise OperationalError("server closed the connection")
+        self.connection.queries.append(sql)
+
+
+class FakeConnection:
+    """Stands in for a psycopg2 connection, no server needed."""
+
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.status = TRANSACTION_STATUS_IDLE
+        self.queries = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.status = TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+class FakeTimer:
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class ConnectionPoolTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.connections = []
+        self.pool = ConnectionPool(
+            self.connect, max_size=2, max_lifetime=100, timeout=0.01,
+            health_check_interval=10, timer=self.timer
+        )
+
+    def connect(self):
+        connection = FakeConnection()
+        self.connections.append(connection)
+        return connection
+
+    def test_reuses_connections(self):
+        """Test if a released connection is handed out again."""
+        connection = self.pool.acquire()
+        self.pool.release(connection)
+        self.assertIs(self.pool.acquire(), connection)
+        stats = self.pool.get_stats()
+        self.assertEqual(stats["connects"], 1)
+        self.assertEqual(stats["checkouts"], 2)
+        self.assertEqual(stats["in_use"], 1)
+
+    def test_bounded(self):
+        """Test if acquiring beyond max_size times out."""
+        self.pool.acquire()
+        connection = self.pool.acquire()
+        with self.assertRaises(OperationalError):
+            self.pool.acquire()
+        self.assertEqual(self.pool.get_stats()["timeouts"], 1)
+        self.pool.release(connection)
+        self.assertIs(self.pool.acquire(), connection)
+
+    def test_health_check_after_idle(self):
+        """Test if a broken idle connection is replaced on checkout."""
+        connection = self.pool.acquire()
+        self.pool.release(connection)
+        self.timer.now = 5
+        self.assertIs(self.pool.acquire(), connection)
+        self.assertEqual(connection.queries, [])
+        self.pool.release(connection)
+
+        self.timer.now = 20
+        connection.broken = True
+        replacement = self.pool.acquire()
+        self.assertIsNot(replacement, connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(self.pool.get_stats()["health_check_failures"], 1)
+
+    def test_max_lifetime(self):
+        connection = self.pool.acquire()
+        self.pool.release(connection)
+        self.timer.now = 100
+        self.assertIsNot(self.pool.acquire(), connection)
+        self.assertTrue(connection.closed)
+
+    def test_release_rolls_back(self):
+        connection = self.pool.acquire()
+        connection.status = TRANSACTION_STATUS_INTRANS
+        self.pool.release(connection)
+        self.assertEqual(connection.status, TRANSACTION_STATUS_IDLE)
+        self.assertIs(self.pool.acquire(), connection)
+
+    def test_release_discards_broken(self):
+        connection = self.pool.acquire()
+        connection.status = TRANSACTION_STATUS_UNKNOWN
+        self.pool.release(connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(self.pool.get_stats()["idle"], 0)
+
+    def test_close(self):
+        connection = self.pool.acquire()
+        self.pool.release(connection)
+        self.pool.close()
+        self.assertTrue(connection.closed)
+        self.assertEqual(self.pool.get_stats()["idle"], 0)
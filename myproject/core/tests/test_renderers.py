@@ -0,0 +1,82 @@
+import datetime
+import json
+import uuid
+from decimal import Decimal
+from io import BytesIO
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from ..parsers import ORJSONParser
+from ..renderers import ORJSONRenderer
+
+
+class ORJSONRendererTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.renderer = ORJSONRenderer()
+
+    def test_render_matches_stdlib_renderer(self):
+        """Test if serializer output renders like DRF's JSONRenderer."""
+        data = ReturnDict([
+            ("key", "abc"),
+            ("user", {"name": "Test Üser", "uuid": str(uuid.uuid4())}),
+            ("list", [1, 2.5, None, True]),
+        ], serializer=None)
+        self.assertEqual(
+            json.loads(self.renderer.render(data).decode()),
+            json.loads(JSONRenderer().render(data).decode())
+        )
+
+    def test_render_native_types(self):
+        value = uuid.uuid4()
+        moment = datetime.datetime(2018, 5, 1, 12, 30, tzinfo=timezone.utc)
+        rendered = json.loads(self.renderer.render({
+            "uuid": value, "modified": moment, 1: "int key",
+        }).decode())
+        self.assertEqual(rendered, {
+            "uuid": str(value),
+            "modified": "2018-05-01T12:30:00Z",
+            "1": "int key",
+        })
+
+    def test_render_falls_back_to_drf_encoder(self):
+        rendered = json.loads(self.renderer.render({
+            "detail": _("Not found."), "amount": Decimal("1.5"),
+        }).decode())
+        self.assertEqual(rendered, {"detail": "Not found.", "amount": 1.5})
+
+    def test_render_none(self):
+        self.assertEqual(self.renderer.render(None), b"")
+
+    def test_render_indent(self):
+        rendered = self.renderer.render(
+            {"a": 1}, accepted_media_type="application/json; indent=4"
+        )
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+
+class ORJSONParserTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.parser = ORJSONParser()
+
+    def test_parse(self):
+        data = self.parser.parse(BytesIO('{"name": "Test Üser"}'.encode()))
+        self.assertEqual(data, {"name": "Test Üser"})
+
+    def test_parse_other_encoding(self):
+        data = self.parser.parse(
+            BytesIO('{"name": "Test Üser"}'.encode("latin-1")),
+            parser_context={"encoding": "latin-1"}
+        )
+        self.assertEqual(data, {"name": "Test Üser"})
+
+    def test_parse_error(self):
+        for body in (b"{invalid", b"NaN", b"\xff"):
+            with self.assertRaises(ParseError):
+                self.parser.parse(BytesIO(body))
@@ -0,0 +1,121 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+)
+
+from config import routers
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class PrimaryReplicaRouterTestCase(SimpleTestCase):
+
+    def setUp(self):
+        cache.delete_pattern(routers.PIN_KEY_PREFIX + '*')
+        self.router = routers.PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+        self.addCleanup(routers.finish_request)
+
+    def request(self, write=False, **extra):
+        """
+        Runs a request through the middleware and returns the database its
+        view read from.
+        """
+        def view(request):
+            if write:
+                self.router.db_for_write(User)
+            view.db = self.router.db_for_read(User)
+            return HttpResponse()
+
+        middleware = routers.ReplicaPinningMiddleware(view)
+        middleware(self.factory.get('/', **extra))
+        return view.db
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        """Test if reads are left to Django without replicas."""
+        self.assertIsNone(self.router.db_for_read(User))
+        self.assertEqual(self.router.db_for_write(User), 'default')
+
+    def test_reads_go_to_replica(self):
+        """Test if reads go to a replica and writes to the primary."""
+        self.assertEqual(self.request(), 'replica')
+        self.assertEqual(self.router.db_for_write(User), 'default')
+
+    def test_read_after_write_in_request(self):
+        """Test if a request reads from the primary once it wrote."""
+        self.assertEqual(self.request(write=True), 'default')
+
+    def test_client_pinned_after_write(self):
+        """Test if the client reads from the primary after a write."""
+        auth = {'HTTP_AUTHORIZATION': 'Token abc', 'REMOTE_ADDR': '10.0.0.1'}
+        self.request(write=True, **auth)
+        self.assertEqual(self.request(**auth), 'default')
+        self.assertEqual(
+            self.request(HTTP_AUTHORIZATION='Token xyz',
+                         REMOTE_ADDR='10.0.0.2'),
+            'replica'
+        )
+
+    def test_client_pinned_by_address_after_registration(self):
+        """Test if an anonymous write pins the client's address."""
+        self.request(write=True, REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(
+            self.request(HTTP_AUTHORIZATION='Token abc',
+                         REMOTE_ADDR='10.0.0.1'),
+            'default'
+        )
+
+    def test_forwarded_for_ignored_without_proxies(self):
+        """
+        Test if X-Forwarded-For doesn't pin other clients without trusted
+        proxies.
+        """
+        self.request(write=True, REMOTE_ADDR='10.0.0.1',
+                     HTTP_X_FORWARDED_FOR='10.0.0.2')
+        self.assertEqual(self.request(REMOTE_ADDR='10.0.0.2'), 'replica')
+        self.assertEqual(self.request(REMOTE_ADDR='10.0.0.1'), 'default')
+
+    @override_settings(DATABASE_REPLICA_PIN_SECONDS=1)
+    def test_pin_expires(self):
+        """Test if pins are stored for DATABASE_REPLICA_PIN_SECONDS."""
+        self.request(write=True, REMOTE_ADDR='10.0.0.1')
+        key = routers.get_pin_keys(
+            self.factory.get('/', REMOTE_ADDR='10.0.0.1')
+        )[0]
+        self.assertAlmostEqual(cache.ttl(key), 1, delta=1)
+
+    def test_allow_migrate(self):
+        """Test if migrations are only run on the primary."""
+        self.assertIsNone(self.router.allow_migrate('default', 'accounts'))
+        self.assertFalse(self.router.allow_migrate('replica', 'accounts'))
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class PrimaryReplicaRouterTransactionTestCase(TransactionTestCase):
+
+    def setUp(self):
+        self.router = routers.PrimaryReplicaRouter()
+        self.addCleanup(routers.finish_request)
+        routers.start_request(RequestFactory().get('/'))
+
+    def test_explicit_transaction(self):
+        """Test if reads in a transaction go to the primary."""
+        with transaction.atomic():
+            self.assertEqual(self.router.db_for_read(User), 'default')
+        self.assertEqual(self.router.db_for_read(User), 'replica')
+
+    def test_request_transaction(self):
+        """
+        Test if the transaction of ATOMIC_REQUESTS alone doesn't pin reads,
+        but nested ones do.
+        """
+        routers._state.request_atomic = True
+        with transaction.atomic():
+            self.assertEqual(self.router.db_for_read(User), 'replica')
+            with transaction.atomic():
+                self.assertEqual(self.router.db_for_read(User), 'default')
@@ -0,0 +1,27 @@
+from unittest import mock
+
+from django.test import TransactionTestCase
+
+from config import warmup
+
+
+class WarmUpTestCase(TransactionTestCase):
+
+    def test_warm_up(self):
+        """Test if all steps run and are timed."""
+        timings = warmup.warm_up()
+        self.assertEqual(list(timings), [name for name, step in warmup.STEPS])
+        for name, duration in timings.items():
+            self.assertIsNotNone(duration, name)
+
+    def test_failing_step(self):
+        """Test if a failing step is logged and doesn't stop the others."""
+        steps = [
+            ('broken', mock.Mock(side_effect=RuntimeError)),
+            ('caches', warmup.connect_caches),
+        ]
+        with mock.patch.object(warmup, 'STEPS', steps), \
+                self.assertLogs('config.warmup', 'ERROR'):
+            timings = warmup.warm_up()
+        self.assertIsNone(timings['broken'])
+        self.assertIsNotNone(timings['caches'])
@@ -1,3 +1,14 @@
-from django.shortcuts import render
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
 
-# Create your views here.
+from . import health as checks
+
+
+@never_cache
+def health(request):
+    """Reports whether the database and the cache are reachable."""
+    status, data = checks.get_status({
+        "database": checks.check_database(),
+        "cache": checks.check_cache(),
+    })
+    return JsonResponse(data, status=status)